@@ -24,6 +24,7 @@ import pickle
 #import income
 #import demographics
 import numpy.polynomial.polynomial as poly
+import sweep_funcs as sw
 
 
 
@@ -460,108 +461,118 @@ def Steady_State(guesses):
     return [error1, error2]
     
 
-init_guess_output = np.zeros((100*100,11))
-init_guess_iter = 0 
-# Make initial guesses for factor prices
-for ii in xrange(100):
-    r_guess_init = 0.01*ii + 0.001
-    for jj in xrange(100):
-        w_guess_init = 0.05*jj + 0.1
-        
-        guesses = [r_guess_init, w_guess_init]
-
-        solutions = opt.fsolve(Steady_State, guesses, xtol=1e-9, col_deriv=1)
-        rss = solutions[0]
-        wss = solutions[1]
-
-        p_c1_ss = get_p_c(rss,wss)
-        p_c2_ss = get_p_c(rss,wss)
-        p_tilde_ss = get_p_tilde(p_c1_ss,p_c2_ss)
-
-        K_guess_init = np.ones((S, J)) * 0.05
-        L_guess_init = np.ones((S, J)) * 0.3
-        kss = np.zeros((S, J))
-        nss = np.zeros((S, J))
-        css = np.zeros((S, J))
-        error1 = np.zeros((S-1,J)) # initialize foc k errors
-        error2 = np.zeros((S,J)) # initialize foc k errors
-        error3 = np.zeros((1,J)) # initialize foc k errors
-
-        for j in xrange(J):
-            if j == 0:
-                guesses = np.append(K_guess_init[:,j], L_guess_init[:,j])
-            else:
-                guesses = np.append(kss[:,(j-1)], nss[:,(j-1)])
-            #solutions = opt.fsolve(solve_hh, guesses, args=(rss, wss, j), xtol=1e-9, col_deriv=1)
-            out = opt.fsolve(solve_hh, guesses, args=(rss, wss, p_c1_ss, p_c2_ss, p_tilde_ss, j), xtol=1e-9, col_deriv=1, full_output=1)
-           # print'solution found flag', out[2], out[3]
-            #print 'fsovle output: ', out[1]
-            solutions = out[0]
-            kss[:,j] = solutions[:S].reshape(S)
-            nss[:,j] = solutions[S:].reshape(S)
-            BQss = get_BQ(rss, kss[:,j].reshape(S,1), j)
-            bqss = get_dist_bq(BQss, j).reshape(S,1)
-            k0ss = np.zeros((S,1))
-            k0ss[1:,0] = kss[:-1,j] # capital start period with
-            css[:,j] = get_cons(wss, rss, nss[:,j].reshape(S,1), k0ss[:,0].reshape(S,1), kss[:,j].reshape(S,1), bqss, p_c1_ss, p_c2_ss, p_tilde_ss, j).reshape(S)
-            # check Euler errors
-            error1[:,j] = foc_k(rss, css[:,j].reshape(S,1), j).reshape(S-1) 
-            error2[:,j] = foc_l(wss, nss[:,j].reshape(S,1), css[:,j].reshape(S,1), j).reshape(S) 
-            error3[:,j] = foc_bq(kss[:,j].reshape(S,1), css[:,j].reshape(S,1))
-
-        c1ss = (p_tilde_ss*css*alpha)/p_c1_ss + cbar1
-        c2ss = (p_tilde_ss*css*(1-alpha))/p_c2_ss + cbar2
-
-        # Find total consumption of each good
-        C1ss = get_C(c1ss)
-        C2ss = get_C(c2ss)
-
-        # Find total demand for output from each sector from consumption
-        X_c_1_ss = C1ss
-        X_c_2_ss = C2ss
-
-        guesses = [(X_c_1_ss+X_c_2_ss)/2, (X_c_1_ss+X_c_2_ss)/2]
-        x_sol_ss = opt.fsolve(solve_output, guesses, args=(wss, rss, X_c_1_ss, X_c_2_ss), xtol=1e-9, col_deriv=1)
-
-        X1_ss = x_sol_ss[0]
-        X2_ss = x_sol_ss[1]
-
-        # find aggregate savings and labor supply
-        K_s_ss, K_constr = get_K(kss)
-        L_s_ss = get_L(nss)
-
-        #### Need to solve for labor and capital demand from each industry
-        K1_d_ss = get_k_demand(wss, rss, X1_ss)
-        L1_d_ss = get_l_demand(wss, rss, K1_d_ss)
-        K2_d_ss = get_k_demand(wss, rss, X2_ss)
-        L2_d_ss = get_l_demand(wss, rss, K2_d_ss)
-
-        # Check labor and capital market clearing conditions
-        K_d_ss = K1_d_ss + K2_d_ss 
-        L_d_ss = L1_d_ss + L2_d_ss 
-
-        cap_diff = K_s_ss - K_d_ss
-        labor_diff = L_s_ss - L_d_ss
-
-        Y1ss = get_X(K1_d_ss,L1_d_ss)
-        Y2ss = get_X(K2_d_ss,L2_d_ss)
-
-        # 'RESOURCE CONSTRAINT DIFFERENCE:'
-        RC1 = X1_ss - Y1ss
-        RC2 = X2_ss - Y2ss
-        RC1_2 = X1_ss - C1ss- delta*K1_d_ss*xi[0,0] - delta*K2_d_ss*xi[1,0]
-        RC2_2 = X2_ss - C2ss- delta*K1_d_ss*xi[0,1] - delta*K2_d_ss*xi[1,1]
-
-        max_error1 = (np.absolute(error1)).max()
-        max_error2 = (np.absolute(error2)).max()
-        max_error3 = (np.absolute(error3)).max()
-        max_euler_error = max(max_error1,max_error2,max_error3)
-
-        init_guess_output[init_guess_iter,:] = np.array([r_guess_init, w_guess_init, rss, wss, cap_diff, labor_diff, RC1, RC2, RC1_2, RC2_2, max_euler_error]).reshape(11) 
-
-        init_guess_iter += 1
-
-np.savetxt('init_guess_output.csv', init_guess_output, delimiter=',')
+def solve_point(point):
+    '''
+    Parameters: Dictionary with initial guesses for r and w
+    Returns:    SS r and w found from the guesses, market clearing and
+                resource constraint differences, max Euler error
+    '''
+    r_guess_init = point['r_guess_init']
+    w_guess_init = point['w_guess_init']
+
+    guesses = [r_guess_init, w_guess_init]
+
+    solutions = opt.fsolve(Steady_State, guesses, xtol=1e-9, col_deriv=1)
+    rss = solutions[0]
+    wss = solutions[1]
+
+    p_c1_ss = get_p_c(rss,wss)
+    p_c2_ss = get_p_c(rss,wss)
+    p_tilde_ss = get_p_tilde(p_c1_ss,p_c2_ss)
+
+    K_guess_init = np.ones((S, J)) * 0.05
+    L_guess_init = np.ones((S, J)) * 0.3
+    kss = np.zeros((S, J))
+    nss = np.zeros((S, J))
+    css = np.zeros((S, J))
+    error1 = np.zeros((S-1,J)) # initialize foc k errors
+    error2 = np.zeros((S,J)) # initialize foc k errors
+    error3 = np.zeros((1,J)) # initialize foc k errors
+
+    for j in xrange(J):
+        if j == 0:
+            guesses = np.append(K_guess_init[:,j], L_guess_init[:,j])
+        else:
+            guesses = np.append(kss[:,(j-1)], nss[:,(j-1)])
+        #solutions = opt.fsolve(solve_hh, guesses, args=(rss, wss, j), xtol=1e-9, col_deriv=1)
+        out = opt.fsolve(solve_hh, guesses, args=(rss, wss, p_c1_ss, p_c2_ss, p_tilde_ss, j), xtol=1e-9, col_deriv=1, full_output=1)
+       # print'solution found flag', out[2], out[3]
+        #print 'fsovle output: ', out[1]
+        solutions = out[0]
+        kss[:,j] = solutions[:S].reshape(S)
+        nss[:,j] = solutions[S:].reshape(S)
+        BQss = get_BQ(rss, kss[:,j].reshape(S,1), j)
+        bqss = get_dist_bq(BQss, j).reshape(S,1)
+        k0ss = np.zeros((S,1))
+        k0ss[1:,0] = kss[:-1,j] # capital start period with
+        css[:,j] = get_cons(wss, rss, nss[:,j].reshape(S,1), k0ss[:,0].reshape(S,1), kss[:,j].reshape(S,1), bqss, p_c1_ss, p_c2_ss, p_tilde_ss, j).reshape(S)
+        # check Euler errors
+        error1[:,j] = foc_k(rss, css[:,j].reshape(S,1), j).reshape(S-1) 
+        error2[:,j] = foc_l(wss, nss[:,j].reshape(S,1), css[:,j].reshape(S,1), j).reshape(S) 
+        error3[:,j] = foc_bq(kss[:,j].reshape(S,1), css[:,j].reshape(S,1))
+
+    c1ss = (p_tilde_ss*css*alpha)/p_c1_ss + cbar1
+    c2ss = (p_tilde_ss*css*(1-alpha))/p_c2_ss + cbar2
+
+    # Find total consumption of each good
+    C1ss = get_C(c1ss)
+    C2ss = get_C(c2ss)
+
+    # Find total demand for output from each sector from consumption
+    X_c_1_ss = C1ss
+    X_c_2_ss = C2ss
+
+    guesses = [(X_c_1_ss+X_c_2_ss)/2, (X_c_1_ss+X_c_2_ss)/2]
+    x_sol_ss = opt.fsolve(solve_output, guesses, args=(wss, rss, X_c_1_ss, X_c_2_ss), xtol=1e-9, col_deriv=1)
+
+    X1_ss = x_sol_ss[0]
+    X2_ss = x_sol_ss[1]
+
+    # find aggregate savings and labor supply
+    K_s_ss, K_constr = get_K(kss)
+    L_s_ss = get_L(nss)
+
+    #### Need to solve for labor and capital demand from each industry
+    K1_d_ss = get_k_demand(wss, rss, X1_ss)
+    L1_d_ss = get_l_demand(wss, rss, K1_d_ss)
+    K2_d_ss = get_k_demand(wss, rss, X2_ss)
+    L2_d_ss = get_l_demand(wss, rss, K2_d_ss)
+
+    # Check labor and capital market clearing conditions
+    K_d_ss = K1_d_ss + K2_d_ss 
+    L_d_ss = L1_d_ss + L2_d_ss 
+
+    cap_diff = K_s_ss - K_d_ss
+    labor_diff = L_s_ss - L_d_ss
+
+    Y1ss = get_X(K1_d_ss,L1_d_ss)
+    Y2ss = get_X(K2_d_ss,L2_d_ss)
+
+    # 'RESOURCE CONSTRAINT DIFFERENCE:'
+    RC1 = X1_ss - Y1ss
+    RC2 = X2_ss - Y2ss
+    RC1_2 = X1_ss - C1ss- delta*K1_d_ss*xi[0,0] - delta*K2_d_ss*xi[1,0]
+    RC2_2 = X2_ss - C2ss- delta*K1_d_ss*xi[0,1] - delta*K2_d_ss*xi[1,1]
+
+    max_error1 = (np.absolute(error1)).max()
+    max_error2 = (np.absolute(error2)).max()
+    max_error3 = (np.absolute(error3)).max()
+    max_euler_error = max(max_error1,max_error2,max_error3)
+
+    return [rss, wss, cap_diff, labor_diff, RC1, RC2, RC1_2, RC2_2, max_euler_error]
+
+
+if __name__ == '__main__':
+    # Make initial guesses for factor prices
+    # each grid point is solved in parallel and streamed to init_guess_rows.csv,
+    # re-running picks up where a stopped run left off
+    names, points = sw.get_grid([('r_guess_init', 0.01*np.arange(100) + 0.001),
+                                 ('w_guess_init', 0.05*np.arange(100) + 0.1)])
+    sw.run_sweep(solve_point, names, points, 'init_guess_rows.csv',
+                 ['rss', 'wss', 'cap_diff', 'labor_diff', 'RC1', 'RC2', 'RC1_2', 'RC2_2', 'euler_error'])
+    init_guess_output = sw.load_sweep('init_guess_rows.csv', len(points))
+
+    np.savetxt('init_guess_output.csv', init_guess_output, delimiter=',')
 
 
 
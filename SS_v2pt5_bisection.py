@@ -24,6 +24,7 @@ import pickle
 #import income
 #import demographics
 import numpy.polynomial.polynomial as poly
+import bracket_funcs as bf
 
 
 
@@ -66,6 +67,8 @@ TPImindist   = Cut-off distance between iterations for TPI
 maxiter = 10
 mindist_SS = 1e-9
 mu = 0.005
+ss_method = 'bracket' # 'bracket' (nested Brent brackets on r and w, bracket_funcs.solve_pair) or 'bisection' (separate bisections)
+max_probes = 200 # largest number of market clearing evaluations for 'bracket'
 
 
 
@@ -448,7 +451,81 @@ def solve_l(guesses, p, L_s, X):
     #print 'L_m guess: ', L
     return error 
 
-def Steady_State(guesses, mu):
+def get_mkt_errors(guesses):
+    '''
+    Parameters: Guesses for SS interest rate and wage rate
+    Returns:    Capital and labor market clearing errors (demand less
+                supply)
+    '''
+    r = guesses[0]
+    w = guesses[1]
+
+    # find prices of consumption goods
+    p = get_p(r,w)
+    p_c = get_p_c(p)
+    p_tilde = get_p_tilde(p_c)
+
+    # Make initial guesses for capital and labor
+    K_guess_init = np.ones((S, J)) * 0.05
+    L_guess_init = np.ones((S, J)) * 0.3
+    k = np.zeros((S,J)) # initialize k matrix
+    n = np.zeros((S,J)) # initialize n matrix
+    c = np.zeros((S, J))
+    for j in xrange(J):
+        if j == 0:
+            guesses = np.append(K_guess_init[:,j], L_guess_init[:,j])
+        else:
+            guesses = np.append(k[:,(j-1)], n[:,(j-1)])
+        solutions = opt.fsolve(solve_hh, guesses, args=(r, w, p_c, p_tilde, j), xtol=1e-9, col_deriv=1)
+        k[:,j] = solutions[:S].reshape(S)
+        n[:,j] = solutions[S:].reshape(S)
+        BQ = get_BQ(r, k[:,j].reshape(S,1), j)
+        bq = get_dist_bq(BQ, j).reshape(S,1)
+        c[:,j] = get_cons(w, r, n[:,j].reshape(S,1), k[:,j].reshape(S,1), bq, p_c, p_tilde, j).reshape(S)
+
+    c_i = ((p_tilde*np.tile(c,(2,1,1))*np.tile(np.reshape(alpha,(2,1,1)),(1,S,J)))/np.tile(np.reshape(p_c,(2,1,1)),(1,S,J))
+                + np.tile(np.reshape(cbar,(2,1,1)),(1,S,J)))
+    # Find total consumption of each good
+    C = get_C(c_i)
+    # Find total demand for output from each sector from consumption
+    X_c = np.dot(np.reshape(C,(1,I)),pi)
+    guesses = X_c/I
+    X = opt.fsolve(solve_output, guesses, args=(w, r, X_c), xtol=1e-9, col_deriv=1)
+
+    # find aggregate savings and labor supply
+    K_s, K_constr = get_K(k)
+    L_s = get_L(n)
+    # find factor demands
+    K_d = get_k_demand(w, r, X)
+    L_d = ((1-gamma)*X)*((w/p)**(-1*epsilon))*(A**(epsilon-1))
+
+    error1 = K_d.sum()- K_s
+    error2 = L_d.sum() - L_s
+    print 'r, w: ', r, w, ' market clearing errors: ', error1, error2
+
+    return np.array([error1, error2])
+
+
+def Steady_State(guesses):
+    '''
+    Parameters: Guesses for SS interest rate and wage rate
+    Returns:    SS interest rate and wage rate, with r bracketed on the
+                capital market for each w tried and w bracketed on the
+                labor market (bracket_funcs.solve_pair).  Excess demand
+                for capital falls with r; excess demand for labor (with
+                r clearing the capital market) rises with w, as output
+                prices rise with w.
+    '''
+    x, errors, n_probes, ss_converged = bf.solve_pair(get_mkt_errors, guesses, [0.5, 0.5], slopes=[-1.0, 1.0],
+                                                      lb=[0.0, 0.0], ub=[1.0, None], xtol=1e-12,
+                                                      ftol=mindist_SS, maxiter=max_probes)
+    print 'market clearing evaluations: ', n_probes, ' converged: ', ss_converged
+    print 'market clearing errors: ', errors
+
+    return [x[0], x[1]]
+
+
+def Steady_State_bisection(guesses, mu):
     '''
     Parameters: Steady state distribution of capital guess as array
                 size SxJ and labor supply array of SxJ rss
@@ -473,103 +550,11 @@ def Steady_State(guesses, mu):
     dist_r_vec = np.zeros(maxiter)
     dist_w_vec = np.zeros(maxiter)
     
-    # find prices of consumption goods
-    p = get_p(r,w)
-    p_c = get_p_c(p)
-    p_tilde = get_p_tilde(p_c)
-    #print 'prices ', p, p_c, p_tilde
-
-
-    # Make initial guesses for capital and labor
-    K_guess_init = np.ones((S, J)) * 0.05
-    L_guess_init = np.ones((S, J)) * 0.3
-    k = np.zeros((S,J)) # initialize k matrix
-    n = np.zeros((S,J)) # initialize n matrix
-    c = np.zeros((S, J))
-    
     while (dist > mindist_SS) and (iteration < maxiter):
 
-        for j in xrange(J):
-            if j == 0:
-                guesses = np.append(K_guess_init[:,j], L_guess_init[:,j])
-            else:
-                guesses = np.append(k[:,(j-1)], n[:,(j-1)])
-            solutions = opt.fsolve(solve_hh, guesses, args=(r, w, p_c, p_tilde, j), xtol=1e-9, col_deriv=1)
-            #out = opt.fsolve(solve_hh, guesses, args=(r, w, j), xtol=1e-9, col_deriv=1, full_output=1)
-            #print'solution found flag', out[2], out[3]
-            #solutions = out[0]
-            k[:,j] = solutions[:S].reshape(S)
-            n[:,j] = solutions[S:].reshape(S)
-            BQ = get_BQ(r, k[:,j].reshape(S,1), j)
-            bq = get_dist_bq(BQ, j).reshape(S,1)
-            c[:,j] = get_cons(w, r, n[:,j].reshape(S,1), k[:,j].reshape(S,1), bq, p_c, p_tilde, j).reshape(S)
-
-        c_i = ((p_tilde*np.tile(c,(2,1,1))*np.tile(np.reshape(alpha,(2,1,1)),(1,S,J)))/np.tile(np.reshape(p_c,(2,1,1)),(1,S,J)) 
-                    + np.tile(np.reshape(cbar,(2,1,1)),(1,S,J)))
-        #print 'c_i', c_i
-
-        # Find total consumption of each good
-        C = get_C(c_i)
-        #print 'total cons by good: ', C
-
-        # Find total demand for output from each sector from consumption
-        X_c = np.dot(np.reshape(C,(1,I)),pi)
-        guesses = X_c/I
-        x_sol = opt.fsolve(solve_output, guesses, args=(w, r, X_c), xtol=1e-9, col_deriv=1)
-
-        X = x_sol
-
-        # find aggregate savings and labor supply
-        K_s, K_constr = get_K(k)
-        L_s = get_L(n)
-
-        # Find factor demand from each industry as a function of factor supply
-        #K_d = K_s - get_sum_Xk(r,p,X)
-        #L_d = L_s - get_sum_Xl(w,p,X)
-        #k_m_guesses = (X/X.sum())*K_s
-        #l_m_guesses = (X/X.sum())*L_s
-        #K_d = opt.fsolve(solve_k, k_m_guesses, args=(p, K_s, X), xtol=1e-9, col_deriv=1)
-        #L_d = opt.fsolve(solve_l, l_m_guesses, args=(p, L_s, X), xtol=1e-9, col_deriv=1)
-
-
-        #### Need to solve for labor and capital demand from each industry
-        K_d = get_k_demand(w, r, X)
-        #L_d = get_l_demand(w, r, K_d)
-        L_d = ((1-gamma)*X)*((w/p)**(-1*epsilon))*(A**(epsilon-1))
-
-        ## Solve for factor demands in a third way
-        #r_vec = np.array([r, r, r])
-        #K_d_3 = K_s - (gamma*X*((((r_vec+delta)/p)*(A**((1-epsilon)/1)))**(-1*epsilon))).sum() - (gamma*X*((((r_vec+delta)/p)*(A**((1-epsilon)/1)))**(-1*epsilon))) 
-        #print ' three k diffs: ', K_d-K_d_3, K_d-K_d_check, K_d_3-K_d_check
-
-        # get implied factor prices
-        r_new = get_r(X, K_d, p)[0]
-        w_new = get_w(X, L_d, p)[0]
-        #print 'all r_new values: ', get_r(X, K_d, p)
-        #print 'all alt r_new values: ', get_r(X,K_d_check,p)
-        #print 'alt r values: ', get_r(X,K_d_check,p)
-        #print 'diff btwn r: ', get_r(X, K_d, p) - get_r(X,K_d_check,p)
-        #print 'diff btwn k: ', K_d-K_d_check
-        #print 'diff btwn w: ', get_w(X, L_d, p) - get_w(X,L_d_check,p)
-        #print 'diff btwn l: ', L_d-L_d_check
-        #print 'all w_new values: ', get_w(X, L_d, p)
-        #print 'all alt w_new values: ', get_w(X,L_d_check,p)
-
-        #print 'r diffs', r-get_r(X[0],K_d[0]), r-get_r(X[1],K_d[1])
-        #print 'market clearing: ', K_s - K_d.sum(),  L_s - L_d.sum()
-        #print 'market clearing 2: ', K_s - K_d_check.sum(), L_s - L_d_check.sum()
-
         # Check labor and capital market clearing conditions
-        error1 = K_d.sum()- K_s  
-        error2 = L_d.sum() - L_s
-        #error2 = L_s - L_d.sum()
+        error1, error2 = get_mkt_errors([r, w])
 
-
-        #error1 = r_new - r
-        #error2 = w_new - w
-        print 'capital market clearing diff: ', error1
-        print 'labor market clearing diff: ', error2
-        
         dist_r_vec[iteration] = error1
         dist_w_vec[iteration] = error2
 
@@ -666,7 +651,10 @@ def Steady_State(guesses, mu):
 r_guess_init = 0.99 # start w really high initial guesses for bisection method
 w_guess_init = 2.0  
 guesses = [r_guess_init, w_guess_init]
-solutions = Steady_State(guesses,mu)
+if ss_method == 'bracket':
+    solutions = Steady_State(guesses)
+else:
+    solutions = Steady_State_bisection(guesses,mu)
 rss = solutions[0]
 wss = solutions[1]
 print 'ss r, w: ', rss, wss
@@ -24,6 +24,7 @@ import pickle
 #import income
 #import demographics
 import numpy.polynomial.polynomial as poly
+import fixed_point_funcs as fp
 
 
 
@@ -66,6 +67,8 @@ TPImindist   = Cut-off distance between iterations for TPI
 maxiter = 1000
 mindist_SS = 1e-9
 mu = 0.005
+accel = 'anderson' # outer loop update: 'anderson' (Anderson mixing, falls back to damping) or 'damping'
+accel_depth = 5 # number of past iterates used in Anderson mixing
 
 
 
@@ -466,6 +469,7 @@ def Steady_State(guesses, mu):
     dist_w = dist
     iteration = 0
     dist_vec = np.zeros(maxiter)
+    acc = fp.get_accel_state(mu, method=accel, depth=accel_depth, lb=np.zeros(2))
     dist_r_vec = np.zeros(maxiter)
     dist_w_vec = np.zeros(maxiter)
     
@@ -564,36 +568,21 @@ def Steady_State(guesses, mu):
         print 'r, w: ', r,w
         print 'r_new, w_new: ', r_new,w_new
 
-        r = mu_r*r_new + (1-mu_r)*r # so if r low, get low save, so low capital stock, so high mpk, so r_new bigger
-        w = mu_w*w_new + (1-mu_w)*w
-
-        dist = np.array([perc_dif_func(r_new, r)]+[perc_dif_func(w_new, w)]).max()
-        
+        # distances of g(x) from x, before the update moves x
         dist_r = perc_dif_func(r_new, r)
         dist_w = perc_dif_func(w_new, w)
+        dist = max(dist_r, dist_w)
 
         dist_r_vec[iteration] = dist_r
         dist_w_vec[iteration] = dist_w
 
         dist_vec[iteration] = dist
 
+        r, w = fp.accel_update(acc, [r, w], [r_new, w_new])
+
         print 'difference between consec distances: ', dist_vec[iteration] - dist_vec[iteration-1]
         print 'distances: ', dist_vec[iteration], dist_vec[iteration-1], dist
-        print 'mu: ', mu
-
-        if iteration > 10:
-            # if dist_vec[iteration] - dist_vec[iteration-1] > 0:
-            #    mu /= 2.0
-            #    print 'New value of mu:', mu
-            if dist_r_vec[iteration] - dist_r_vec[iteration-1] > 0:
-               mu_r /= 2.0
-               print 'New value of mu_r:', mu_r
-            if dist_w_vec[iteration] - dist_w_vec[iteration-1] > 0:
-               mu_w /= 2.0
-               print 'New value of mu_w:', mu_w
-            if np.absolute(dist_vec[iteration] - dist_vec[iteration-1]) < 1e-8:
-                mu = 0.8
-                print 'Was stuck in a cycle at iteration', iteration
+        print 'update: ', acc['method'], ' mu: ', acc['mu'], ' restarts: ', acc['n_restarts']
         iteration += 1
         print "Iteration: %02d" % iteration, " Distance: ", dist
 
@@ -24,6 +24,7 @@ import pickle
 #import income
 #import demographics
 import numpy.polynomial.polynomial as poly
+import fixed_point_funcs as fp
 
 
 
@@ -66,6 +67,8 @@ TPImindist   = Cut-off distance between iterations for TPI
 maxiter = 1000
 mindist_SS = 1e-9
 mu = 0.2
+accel = 'anderson' # outer loop update: 'anderson' (Anderson mixing, falls back to damping) or 'damping'
+accel_depth = 5 # number of past iterates used in Anderson mixing
 
 
 
@@ -464,6 +467,7 @@ def Steady_State(guesses, mu):
     dist = 10
     iteration = 0
     dist_vec = np.zeros(maxiter)
+    acc = fp.get_accel_state(mu, method=accel, depth=accel_depth, lb=np.zeros(2))
     
     # find prices of consumption goods
     p = get_p(r,w)
@@ -557,17 +561,12 @@ def Steady_State(guesses, mu):
         print 'r, w: ', r,w
         print 'r_new, w_new: ', r_new,w_new
 
-        r = mu*r_new + (1-mu)*r # so if r low, get low save, so low capital stock, so high mpk, so r_new bigger
-        w = mu*w_new + (1-mu)*w
-
-        #dist = np.array([perc_dif_func(r_new, r)]+[perc_dif_func(w_new, w)]).max()
+        # distance of g(x) from x, before the update moves x
         dist = np.absolute([r_new-r,w_new-w]).max()
-        
         dist_vec[iteration] = dist
-        if iteration > 10:
-            if dist_vec[iteration] - dist_vec[iteration-1] > 0:
-                mu /= 2.0
-                print 'New value of mu:', mu
+
+        r, w = fp.accel_update(acc, [r, w], [r_new, w_new])
+        print 'update: ', acc['method'], ' mu: ', acc['mu'], ' restarts: ', acc['n_restarts']
         iteration += 1
         print "Iteration: %02d" % iteration, " Distance: ", dist
 
@@ -24,6 +24,8 @@ import pickle
 #import income
 #import demographics
 import numpy.polynomial.polynomial as poly
+import fixed_point_funcs as fp
+import diag_funcs as dg
 
 
 
@@ -66,6 +68,9 @@ TPImindist   = Cut-off distance between iterations for TPI
 maxiter = 10
 mindist_SS = 1e-9
 mu = 0.1
+accel = 'anderson' # outer loop update: 'anderson' (Anderson mixing, falls back to damping) or 'damping'
+accel_depth = 5 # number of past iterates used in Anderson mixing
+diag = dg.get_diag(dg.INFO, min_interval=1.0) # diagnostics in the SS loop: iterations at most once a second, dg.DEBUG/dg.TRACE for every iteration and the checks
 
 
 # Parameters
@@ -484,6 +489,7 @@ def Steady_State(guesses, mu):
     dist = 10
     iteration = 0
     dist_vec = np.zeros(maxiter)
+    acc = fp.get_accel_state(mu, method=accel, depth=accel_depth, lb=np.zeros(2))
     
     # find prices of consumption and capital goods
     p_guesses = np.ones(M)
@@ -559,7 +565,7 @@ def Steady_State(guesses, mu):
         # Find value of each firm V = DIV/r in SS
         #V = (p*X - w*L_d - p_k*delta*K_d)/r
         V = p_k*K_d
-        print 'checking V two ways: ', V-(p_k*K_d)
+        dg.say(diag, dg.TRACE, 'checking V two ways: ', V-(p_k*K_d))
 
         # find residual to determine labor and capital demand for one industry
         # this industry will be used to get the implied interest and wage rate
@@ -575,37 +581,34 @@ def Steady_State(guesses, mu):
         #w_new = get_w(X, L_s, p)[0]
         
         #print 'checking r', get_r(X,K_d,p_k,p)-get_r(X,K_d_check,p_k,p)
-        print 'interest rates by industry: ', get_r(X,K_d,p_k,p)
-        print 'wage rates by industry: ', get_w(X,L_d,p)
+        if dg.enabled(diag, dg.TRACE):
+            dg.say(diag, dg.TRACE, 'interest rates by industry: ', get_r(X,K_d,p_k,p))
+            dg.say(diag, dg.TRACE, 'wage rates by industry: ', get_w(X,L_d,p))
 
-        print 'checking asset market', K_s - V.sum()
-        print 'checking labor market', L_s - L_d.sum()
+            dg.say(diag, dg.TRACE, 'checking asset market', K_s - V.sum())
+            dg.say(diag, dg.TRACE, 'checking labor market', L_s - L_d.sum())
         # Check labor and asset market clearing conditions
         #error1 = K_s - V.sum()
         #error2 = L_s - L_d.sum()
         error1 = r_new - r
         error2 = w_new - w
 
-        print 'r diff: ', error1
-        print 'w diff: ', error2
+        dg.say(diag, dg.DEBUG, 'r diff: ', error1)
+        dg.say(diag, dg.DEBUG, 'w diff: ', error2)
 
         #print 'asset market diff: ', error1
         #print 'labor market diff: ', error2
-        print 'r, w: ', r, w
+        dg.say(diag, dg.DEBUG, 'r, w: ', r, w)
 
 
-        r = mu*r_new + (1-mu)*r # so if r low, get low save, so low capital stock, so high mpk, so r_new bigger
-        w = mu*w_new + (1-mu)*w
-
+        # distance of g(x) from x, before the update moves x
         dist = np.array([perc_dif_func(r_new, r)]+[perc_dif_func(w_new, w)]).max()
-        
         dist_vec[iteration] = dist
-        if iteration > 10:
-            if dist_vec[iteration] - dist_vec[iteration-1] > 0:
-                mu /= 2.0
-                print 'New value of mu:', mu
+
+        r, w = fp.accel_update(acc, [r, w], [r_new, w_new])
+        dg.say(diag, dg.DEBUG, 'update: ', acc['method'], ' mu: ', acc['mu'], ' restarts: ', acc['n_restarts'])
         iteration += 1
-        print "Iteration: %02d" % iteration, " Distance: ", dist
+        dg.say(diag, dg.INFO, 'Iteration:', iteration, ' Distance: ', dist)
 
  
     return [r, w]
@@ -621,6 +624,7 @@ solutions = Steady_State(guesses, mu)
 rss = solutions[0]
 wss = solutions[1]
 print 'ss r, w: ', rss, wss
+dg.say_dropped(diag)
 
 
 # find prices of consumption and capital goods
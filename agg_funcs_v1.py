@@ -12,6 +12,7 @@ import scipy.optimize as opt
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MultipleLocator, FormatStrFormatter
+import ces_funcs as ces
 
 '''
 ------------------------------------------------------------------------
@@ -157,7 +158,8 @@ def SS(params, b_guess, graphs):
                        characterize lifetime savings decisions
 
     Objects in function:
-        eul_params   = [6,] vector, [S, beta, sigma, A, alpha, delta]
+        tech         = CESTech tuple, CES technology (see ces_funcs.py)
+        eul_params   = tuple, params followed by tech, for EulerSys
         b_ss         = [S-1,] vector, steady state distribution of
                        savings
         L_ss         = scalar > 0, steady-state aggregate labor
@@ -184,23 +186,24 @@ def SS(params, b_guess, graphs):
     Returns: b_ss, c_ss, w_ss, r_ss, K_ss, EulErr_ss
     '''
     S, beta, sigma, alpha, cbar1, cbar2, A, gamma, epsilon, delta, SS_tol = params
-    b_ss = opt.fsolve(EulerSys, b_guess, args=(params), xtol=SS_tol)
+    tech = ces.get_ces_tech(A, gamma, epsilon)
+    eul_params = tuple(params) + (tech,)
+    b_ss = opt.fsolve(EulerSys, b_guess, args=(eul_params,), xtol=SS_tol)
     
     # Generate other steady-state values and Euler equations
     L_ss = get_L(np.ones(S))
     K_ss, K_constr = get_K(b_ss)
-    r_params = np.array([A, gamma, epsilon, delta])
      
-    kl_params = np.array([A, gamma, epsilon, delta, SS_tol])
+    kl_params = (tech, delta, SS_tol)
     K1_ss, L1_ss = get_KL(kl_params, L_ss, K_ss)
     K2_ss = K_ss - K1_ss
     L2_ss = L_ss - L1_ss
-    y_params = np.array([A, gamma, epsilon])
+    y_params = tech
     Y1_ss = get_Y(y_params, K1_ss, L1_ss)
     Y2_ss = get_Y(y_params, K2_ss, L2_ss)
-    r_params = np.array([A, gamma, epsilon, delta])
+    r_params = (tech, delta)
     r_ss = get_r(r_params, K1_ss, L1_ss)
-    w_params = np.array([A, epsilon, gamma])
+    w_params = tech
     w_ss = get_w(w_params, K1_ss, L1_ss)
     p_params = np.array([A, gamma, epsilon, delta])
     p_c1_ss = get_p_c(p_params, r_ss, w_ss)
@@ -0,0 +1,123 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for creating aggregate variables of the
+multi-industry model (as in SS_v3pt2_mktclear.py).  All functions take
+the model parameters explicitly as a ModelParams tuple (see
+model_params.py).
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_L(mp, n):
+    '''
+    Generates aggregate labor supply in efficiency units.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        n  = [S,J] array, labor supply
+
+    Functions called: None
+
+    Objects in function:
+        L = scalar, aggregate labor
+
+    Returns: L
+    '''
+    L = np.sum(mp.weights*(n*mp.e))
+
+    return L
+
+
+def get_K(mp, k):
+    '''
+    Generates aggregate savings.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        k  = [S,J] array, savings
+
+    Functions called: None
+
+    Objects in function:
+        K        = scalar, aggregate capital
+        K_constr = boolean, =True if K<=0
+
+    Returns: K, K_constr
+    '''
+    K = np.sum(mp.weights*k)
+    K_constr = K <= 0
+
+    return K, K_constr
+
+
+def get_c_i(mp, c, p_c, p_tilde):
+    '''
+    Generates consumption of each good from composite consumption.
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        c       = [S,J] array, composite consumption
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+
+    Functions called: None
+
+    Objects in function:
+        c_i = [I,S,J] array, consumption of each good
+
+    Returns: c_i
+    '''
+    c_i = ((p_tilde*c*mp.alpha[:, np.newaxis, np.newaxis]) /
+           p_c[:, np.newaxis, np.newaxis] + mp.cbar[:, np.newaxis, np.newaxis])
+
+    return c_i
+
+
+def get_C(mp, c_i):
+    '''
+    Generates aggregate consumption of each good.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        c_i = [I,S,J] array, consumption of each good
+
+    Functions called: None
+
+    Objects in function:
+        C = [I,] vector, aggregate consumption of each good
+
+    Returns: C
+    '''
+    C = (mp.weights*c_i).sum(2).sum(1)
+
+    return C
+
+
+def get_X_c(mp, C):
+    '''
+    Generates demand for the output of each industry from consumption.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        C  = [I,] vector, aggregate consumption of each good
+
+    Functions called: None
+
+    Objects in function:
+        X_c = [M,] vector, demand for output from consumption
+
+    Returns: X_c
+    '''
+    X_c = np.dot(C, mp.pi)
+
+    return X_c
@@ -0,0 +1,334 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for allocating given supplies of capital
+and labor across industries in a batch of periods, the last step of the
+Time Path section of SS_TPI_algo.tex.  For each period t, given output
+X_{m,t} and prices, the M capital stocks K_{m,t} solve
+
+    sum_m v_{m,t}*K_{m,t} = K^s_t
+    r_{m,t}(K_{m,t}) = r_{1,t},  m = 2,...,M
+
+where r_{m,t} is the interest rate implied by the firm's FOC for capital
+of industry m, and the M labor demands EL_{m,t} solve the same system
+with the wage implied by the FOC for labor, w_{m,t}(EL_{m,t}), and
+v = 1.  SS_TPI_algo.tex has no taxes, so v = 1 for capital too.  With
+the taxes of SS_v3pt2_mktclear.py households hold the value of firms,
+so capital market clearing is in value: v is the value of a firm per
+unit of its capital, q + K_tau/K*Z (see tpi_funcs.get_demand_errors),
+and marginal q is taken at the guessed interest rate of the period, as
+in ff.get_r.  Also with taxes the price of output that sets profits to
+zero (price_funcs.py) is not the marginal cost, while the factor
+demands of the model (ff.get_k_demand, ff.get_l_demand) minimize cost,
+so the FOCs here value the marginal products at marginal cost.  At the
+factor demands of the model, the implied r and w are then the guessed
+ones.
+
+Both implied factor prices have the form a*Y^(-1/epsilon) + b in the
+factor Y, so one solver handles both.  All T periods are solved at once
+by Newton's method on [T,M] arrays with the closed form Jacobian, and
+periods that have converged are held fixed while the rest of the batch
+keeps iterating, as in price_funcs.solve_p.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import firm_funcs_v3 as ff
+import ces_funcs as ces
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_marg_cost(mp, p_k, r, w):
+    '''
+    Generates the marginal cost of output of each industry, uc/MPK at
+    the cost minimizing capital per unit of output.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [N,M] array, price of capital goods
+        r   = [N,] vector, interest rates
+        w   = [N,] vector, wage rates
+
+    Functions called:
+        ff.get_uc
+        ces.get_k_demand
+        ces.get_MPK
+
+    Objects in function:
+        uc = [N,M] array, user cost of capital
+        kx = [N,M] array, capital per unit of output
+
+    Returns: mc ([N,M] array)
+    '''
+    uc = ff.get_uc(mp, p_k, r[:, np.newaxis])
+    w_m = w[:, np.newaxis]*np.ones_like(uc)
+    kx = ces.get_k_demand(mp.tech, 1.0, uc, w_m)
+    mc = uc/ces.get_MPK(mp.tech, kx, 1.0)
+
+    return mc
+
+
+def get_k_coeffs(mp, mc, p_k, r, X):
+    '''
+    Generates the coefficients of the interest rate implied by the FOC
+    for capital, r_m = a_m*K_m^(-1/epsilon_m) + b_m, and the value of
+    firms per unit of capital.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        mc  = [N,M] array, marginal cost of output
+        p_k = [N,M] array, price of capital goods
+        r   = [N,] vector, guessed interest rates, for marginal q and Z
+        X   = [N,M] array, output
+
+    Functions called:
+        ff.get_q
+        ff.get_r
+        ff.get_Z
+
+    Objects in function:
+        q = [N,M] array, marginal q
+        a = [N,M] array, coefficient on K^(-1/epsilon)
+        b = [N,M] array, constant
+        v = [N,M] array, value of firms per unit of capital
+
+    Returns: a, b, v
+    '''
+    r_m = r[:, np.newaxis]
+    q = ff.get_q(mp, p_k, r_m)
+    b = -mp.delta*(1-mp.tau_g)*np.ones_like(X)
+    a = ff.get_r(mp, q, 1.0, X, mc) - b
+    v = q + (1-mp.delta_tau)*(mp.delta/mp.delta_tau)*p_k*ff.get_Z(mp, r_m)
+
+    return a, b, v
+
+
+def get_l_coeffs(mp, mc, X):
+    '''
+    Generates the coefficients of the wage implied by the FOC for labor,
+    w_m = a_m*EL_m^(-1/epsilon_m) + b_m, and the weights of the labor
+    market clearing condition.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        mc = [N,M] array, marginal cost of output
+        X  = [N,M] array, output
+
+    Functions called:
+        ces.get_MPL
+
+    Objects in function:
+        a = [N,M] array, coefficient on EL^(-1/epsilon)
+        b = [N,M] array, zeros
+        v = [N,M] array, ones
+
+    Returns: a, b, v
+    '''
+    a = mc*ces.get_MPL(mp.tech, X, 1.0)
+    b = np.zeros_like(a)
+    v = np.ones_like(a)
+
+    return a, b, v
+
+
+def get_alloc_errors(Y, a, b, inv_eps, v, supply):
+    '''
+    Generates the errors of the allocation system: the market clearing
+    error, then the difference of the factor price implied by each
+    industry from that of industry 1.
+
+    Inputs:
+        Y       = [N,M] array, factor demands
+        a, b    = [N,M] arrays, coefficients of the implied factor price
+        inv_eps = [M,] vector, 1/epsilon
+        v       = [N,M] array, weights of the market clearing condition
+        supply  = [N,] vector, supply of the factor
+
+    Functions called: None
+
+    Objects in function:
+        price = [N,M] array, factor price implied by each industry
+
+    Returns: errors ([N,M] array), price
+    '''
+    price = a*(Y**(-inv_eps)) + b
+    errors = price - price[:, :1]
+    errors[:, 0] = (v*Y).sum(1) - supply
+
+    return errors, price
+
+
+def get_alloc_jac(Y, price, b, inv_eps, v):
+    '''
+    Generates the Jacobian of the allocation errors in each period.
+
+    Inputs:
+        Y       = [N,M] array, factor demands
+        price   = [N,M] array, implied factor prices (see
+                  get_alloc_errors)
+        b       = [N,M] array, constants of the implied factor prices
+        inv_eps = [M,] vector, 1/epsilon
+        v       = [N,M] array, weights of the market clearing condition
+
+    Functions called: None
+
+    Objects in function:
+        d_price = [N,M] array, derivative of each implied price with
+                  respect to the demand of its industry
+
+    Returns: jac ([N,M,M] array, jac[n,i,m] = dF_i/dY_m in period n)
+    '''
+    N, M = Y.shape
+    d_price = -inv_eps*(price - b)/Y
+    jac = np.zeros((N, M, M))
+    idx = np.arange(1, M)
+    jac[:, idx, idx] = d_price[:, 1:]
+    jac[:, 1:, 0] = -d_price[:, :1]
+    jac[:, 0, :] = v
+
+    return jac
+
+
+def solve_alloc(a, b, inv_eps, v, supply, Y_guess=None, tol=1e-12,
+                maxiter=100, info=None):
+    '''
+    Solves the allocation system of every period by Newton's method with
+    the analytic Jacobian.  Steps are halved until demands stay positive
+    and the error norm falls.  Periods that have converged are held fixed
+    while the rest of the batch keeps iterating.  A period where 40
+    halvings give no such step keeps its last iterate, stops iterating
+    and is returned as not converged.
+
+    Inputs:
+        a, b    = [N,M] arrays, coefficients of the implied factor price
+        inv_eps = [M,] vector, 1/epsilon
+        v       = [N,M] array, weights of the market clearing condition
+        supply  = [N,] vector, supply of the factor
+        Y_guess = [N,M] array or None, initial guess, supply split by
+                  a**epsilon (the shares at a common price if b = 0) if
+                  None
+        tol     = scalar > 0, convergence tolerance on the max abs error
+        maxiter = integer >= 1, maximum number of Newton iterations
+        info    = dictionary or None, if given the Newton iterations and
+                  error evaluations are added to info['iterations'] and
+                  info['evals'] (see stats_funcs.py)
+
+    Functions called:
+        get_alloc_errors
+        get_alloc_jac
+
+    Objects in function:
+        active = [N,] boolean vector, =True if period not yet converged
+        failed = [N,] boolean vector, =True if no acceptable step was
+                 found for the period
+        idx    = [K,] vector, indices of the active periods
+        bad    = [K,] boolean vector, =True if the step of an active
+                 period is not acceptable
+        step   = [N,M] array, Newton step
+        lam    = [N,1] array, step length for each period
+
+    Returns: Y, price ([N,] vector, common implied factor price),
+             converged
+    '''
+    supply = np.asarray(supply, dtype=float)
+    if Y_guess is None:
+        share = a**(1/inv_eps)
+        Y_guess = share*(supply/(v*share).sum(1))[:, np.newaxis]
+    Y = np.array(Y_guess, dtype=float)
+
+    error, price = get_alloc_errors(Y, a, b, inv_eps, v, supply)
+    norm = np.absolute(error).max(1)
+    active = norm > tol
+    failed = np.zeros_like(active)
+    it = 0
+    n_evals = 1
+    while active.any() and it < maxiter:
+        Ya, aa, ba, va, sa = (Y[active], a[active], b[active], v[active],
+                              supply[active])
+        jac = get_alloc_jac(Ya, price[active], ba, inv_eps, va)
+        step = -np.linalg.solve(jac, error[active][..., np.newaxis])[..., 0]
+        lam = np.ones((Ya.shape[0], 1))
+        Y_new = Ya + lam*step
+        error_new, price_new = get_alloc_errors(np.absolute(Y_new), aa, ba,
+                                                inv_eps, va, sa)
+        n_evals += 1
+        bad = (Y_new <= 0).any(1) | ~(np.absolute(error_new).max(1) < norm[active])
+        halvings = 0
+        while bad.any() and halvings < 40:
+            lam[bad] *= 0.5
+            Y_new[bad] = Ya[bad] + lam[bad]*step[bad]
+            error_new[bad], price_new[bad] = get_alloc_errors(
+                np.absolute(Y_new[bad]), aa[bad], ba[bad], inv_eps, va[bad],
+                sa[bad])
+            bad[bad] = ((Y_new[bad] <= 0).any(1) |
+                        ~(np.absolute(error_new[bad]).max(1) < norm[active][bad]))
+            halvings += 1
+            n_evals += 1
+        idx = np.flatnonzero(active)
+        good = ~bad
+        Y[idx[good]] = Y_new[good]
+        error[idx[good]] = error_new[good]
+        price[idx[good]] = price_new[good]
+        failed[idx[bad]] = True
+        norm = np.absolute(error).max(1)
+        active = (norm > tol) & ~failed
+        it += 1
+
+    converged = norm <= tol
+    if info is not None:
+        info['iterations'] = info.get('iterations', 0) + it
+        info['evals'] = info.get('evals', 0) + n_evals
+    return Y, price[:, 0], converged
+
+
+def solve_factor_alloc(mp, p_k, r, w, X, K_s, L_s, K_guess=None,
+                       L_guess=None, info=None):
+    '''
+    Allocates the supplies of capital (in value) and labor across
+    industries in every period, and generates the interest rate and wage
+    rate implied by the firms' FOCs (r_new and w_new of
+    SS_TPI_algo.tex).
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        p_k     = [N,M] array, price of capital goods
+        r       = [N,] vector, guessed interest rates
+        w       = [N,] vector, guessed wage rates
+        X       = [N,M] array, output
+        K_s     = [N,] vector, supply of savings
+        L_s     = [N,] vector, supply of effective labor
+        K_guess = [N,M] array or None, guess for capital demands
+        L_guess = [N,M] array or None, guess for labor demands
+        info    = dictionary or None, passed to solve_alloc
+
+    Functions called:
+        get_marg_cost
+        get_k_coeffs
+        get_l_coeffs
+        solve_alloc
+
+    Objects in function:
+        mc    = [N,M] array, marginal cost of output
+        K     = [N,M] array, capital of each industry
+        L     = [N,M] array, labor of each industry
+        r_new = [N,] vector, implied interest rates
+        w_new = [N,] vector, implied wage rates
+
+    Returns: K, L, r_new, w_new, converged ([N,] boolean vector)
+    '''
+    inv_eps = mp.tech.inv_eps
+    mc = get_marg_cost(mp, p_k, r, w)
+    a, b, v = get_k_coeffs(mp, mc, p_k, r, X)
+    K, r_new, k_converged = solve_alloc(a, b, inv_eps, v, K_s, K_guess,
+                                        info=info)
+    a, b, v = get_l_coeffs(mp, mc, X)
+    L, w_new, l_converged = solve_alloc(a, b, inv_eps, v, L_s, L_guess,
+                                        info=info)
+
+    return K, L, r_new, w_new, k_converged & l_converged
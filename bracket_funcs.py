@@ -0,0 +1,280 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains bracketing root finders for the market clearing
+errors (as in the bisection on r and w in SS_v2pt5_bisection.py).
+
+expand_bracket() and brent_root() solve one equation f(x) = 0: the
+bracket is found by stepping away from the guess with growing steps,
+then Brent's method (inverse quadratic interpolation and secant steps,
+with a bisection whenever they do not shrink the bracket fast enough)
+converges superlinearly while always keeping a sign change.
+
+solve_pair() solves two coupled equations F(x) = 0 (the capital market
+in r and the labor market in w) with the same two steps nested: the
+first equation is solved for x[0] at every value of x[1] the outer
+solve tries, so both unknowns are always bracketed for the system as a
+whole, not each for a fixed value of the other.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def expand_bracket(func, x0, step, f0=None, slope=None, lb=None, ub=None,
+                   grow=2.0, max_bound=4, maxiter=50, args=()):
+    '''
+    Finds an interval [a, b] over which a function changes sign by
+    stepping away from a guess with growing steps.
+
+    Inputs:
+        func      = function, f(x, *args)
+        x0        = scalar, initial guess
+        step      = scalar > 0, first step
+        f0        = scalar or None, f(x0) if already known
+        slope     = +1, -1 or None, sign of the slope of f if known;
+                    if None the first step is taken up and the search
+                    goes the way |f| falls
+        lb, ub    = scalars or None, bounds on x; a step that would
+                    cross a bound goes halfway to it instead
+        grow      = scalar > 1, factor by which the step grows
+        max_bound = integer, steps towards a bound after which the
+                    search turns and goes the other way from x0
+        maxiter   = integer, largest number of evaluations of f
+        args      = tuple, extra arguments of func
+
+    Functions called:
+        func
+
+    Objects in function:
+        direction = scalar, +1 to search up, -1 to search down
+        n_bound   = integer, steps cut short by a bound
+        turned    = boolean, =True once the search has turned
+
+    Returns: a, b, fa, fb, n_evals, found (True if f(a) and f(b) have
+             different signs)
+    '''
+    n_evals = 0
+    if f0 is None:
+        f0 = func(x0, *args)
+        n_evals += 1
+    if f0 == 0:
+        return x0, x0, f0, f0, n_evals, True
+    x_start, f_start, step_start = x0, f0, step
+    if slope is None:
+        # take a first step up, its result tells which way is downhill
+        x1 = x0 + step
+        if ub is not None and x1 >= ub:
+            x1 = (x0 + ub)/2.0
+        f1 = func(x1, *args)
+        n_evals += 1
+        direction = 1.0 if np.absolute(f1) < np.absolute(f0) else -1.0
+        if direction < 0:
+            x0, f0, x1, f1 = x1, f1, x0, f0
+    else:
+        direction = -np.sign(f0*slope)
+        x1, f1 = x0, f0
+    n_bound = 0
+    turned = False
+    while np.sign(f0) == np.sign(f1) and n_evals < maxiter:
+        x0, f0 = x1, f1
+        if n_bound >= max_bound and not turned:
+            direction, turned, n_bound = -direction, True, 0
+            x0, f0, step = x_start, f_start, step_start/grow
+        step *= grow
+        x1 = x0 + direction*step
+        if lb is not None and x1 <= lb:
+            x1 = (x0 + lb)/2.0
+            n_bound += 1
+        if ub is not None and x1 >= ub:
+            x1 = (x0 + ub)/2.0
+            n_bound += 1
+        f1 = func(x1, *args)
+        n_evals += 1
+    found = np.sign(f0) != np.sign(f1)
+    a, b, fa, fb = (x0, x1, f0, f1) if x0 < x1 else (x1, x0, f1, f0)
+
+    return a, b, fa, fb, n_evals, found
+
+
+def brent_root(func, a, b, fa=None, fb=None, xtol=1e-12, ftol=0.0,
+               maxiter=100, args=()):
+    '''
+    Finds a root of a function in a bracket with Brent's method.
+
+    Inputs:
+        func    = function, f(x, *args)
+        a, b    = scalars, ends of the bracket, f(a) and f(b) must have
+                  different signs
+        fa, fb  = scalars or None, f(a) and f(b) if already known
+        xtol    = scalar > 0, absolute tolerance on the root
+        ftol    = scalar >= 0, tolerance on |f| at the root
+        maxiter = integer, largest number of evaluations of f
+        args    = tuple, extra arguments of func
+
+    Functions called:
+        func
+
+    Objects in function:
+        b, fb = scalars, best estimate of the root and f there
+        c, fc = scalars, the other end of the bracket
+        d, e  = scalars, last step and the step before it
+
+    Returns: x, fx, n_evals, converged
+    '''
+    n_evals = 0
+    if fa is None:
+        fa = func(a, *args)
+        n_evals += 1
+    if fb is None:
+        fb = func(b, *args)
+        n_evals += 1
+    if np.sign(fa) == np.sign(fb) and fa != 0 and fb != 0:
+        raise ValueError('f(a) and f(b) must have different signs')
+    c, fc = a, fa
+    d = e = b - a
+    while True:
+        if np.sign(fb) == np.sign(fc) and fb != 0:
+            c, fc = a, fa
+            d = e = b - a
+        if np.absolute(fc) < np.absolute(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2.0*np.finfo(float).eps*np.absolute(b) + 0.5*xtol
+        m = 0.5*(c - b)
+        if (np.absolute(m) <= tol or fb == 0 or np.absolute(fb) <= ftol
+                or n_evals >= maxiter):
+            return b, fb, n_evals, np.absolute(m) <= tol or np.absolute(fb) <= ftol
+        if np.absolute(e) >= tol and np.absolute(fa) > np.absolute(fb):
+            # interpolate: secant if only two points, else inverse quadratic
+            s = fb/fa
+            if a == c:
+                P = 2.0*m*s
+                Q = 1.0 - s
+            else:
+                Q = fa/fc
+                R = fb/fc
+                P = s*(2.0*m*Q*(Q - R) - (b - a)*(R - 1.0))
+                Q = (Q - 1.0)*(R - 1.0)*(s - 1.0)
+            if P > 0:
+                Q = -Q
+            else:
+                P = -P
+            if (2.0*P < min(3.0*m*Q - np.absolute(tol*Q), np.absolute(e*Q))):
+                e, d = d, P/Q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if np.absolute(d) > tol else np.copysign(tol, m)
+        fb = func(b, *args)
+        n_evals += 1
+
+
+def solve_pair(func, x0, step, slopes=None, lb=None, ub=None, xtol=1e-12,
+               ftol=0.0, maxiter=200, args=()):
+    '''
+    Solves a system of two equations F(x) = 0 with nested brackets.  For
+    each value of x[1] tried, the first equation is solved for x[0] by
+    expand_bracket() and brent_root(); the second equation, evaluated at
+    that x[0], is solved for x[1] the same way.  Each inner solve starts
+    from a linear extrapolation of the last two inner roots, so its
+    bracket is usually found with one or two evaluations.
+
+    Inputs:
+        func    = function, F(x, *args), returns a length 2 vector
+        x0      = length 2 vector, initial guess
+        step    = length 2 vector > 0, first steps taken to find the
+                  brackets
+        slopes  = length 2 vector or None, signs of the slope of F_0 in
+                  x[0] and of F_1 (at the inner root) in x[1], if known
+        lb, ub  = length 2 vectors or None, bounds on x
+        xtol    = scalar > 0, absolute tolerance on the roots
+        ftol    = scalar >= 0, tolerance on |F_i|
+        maxiter = integer, largest number of evaluations of F
+        args    = tuple, extra arguments of func
+
+    Functions called:
+        func
+        expand_bracket
+        brent_root
+
+    Objects in function:
+        memo  = dictionary, F at every point tried
+        roots = list of (x[1], x[0]) pairs, inner roots found so far
+
+    Returns: x, F (errors at x), n_evals, converged
+    '''
+    slopes = [None, None] if slopes is None else slopes
+    lb = [None, None] if lb is None else lb
+    ub = [None, None] if ub is None else ub
+    memo = {}
+    roots = []
+    state = dict(inner_converged=True)
+
+    def get_F(x):
+        key = (float(x[0]), float(x[1]))
+        if key not in memo:
+            memo[key] = np.asarray(func(np.array(key), *args), dtype=float)
+        return memo[key]
+
+    def f_inner(x_0, x_1):
+        if len(memo) >= maxiter:
+            raise StopIteration
+        return get_F([x_0, x_1])[0]
+
+    def f_outer(x_1):
+        if len(roots) == 0:
+            guess, step_in = x0[0], step[0]
+        elif len(roots) == 1 or roots[-1][0] == roots[-2][0]:
+            guess, step_in = roots[-1][1], 0.1*step[0]
+        else:
+            slope = (roots[-1][1] - roots[-2][1])/(roots[-1][0] - roots[-2][0])
+            guess = roots[-1][1] + slope*(x_1 - roots[-1][0])
+            step_in = max(0.1*np.absolute(guess - roots[-1][1]), 10*xtol)
+            if lb[0] is not None and guess <= lb[0]:
+                guess = 0.5*(roots[-1][1] + lb[0])
+            if ub[0] is not None and guess >= ub[0]:
+                guess = 0.5*(roots[-1][1] + ub[0])
+        a, b, fa, fb, n, found = expand_bracket(f_inner, guess, step_in,
+                                                slope=slopes[0], lb=lb[0],
+                                                ub=ub[0],
+                                                maxiter=maxiter, args=(x_1,))
+        if found:
+            x_0, f_0, n, converged = brent_root(f_inner, a, b, fa, fb, xtol,
+                                                ftol, maxiter, args=(x_1,))
+        else:
+            x_0 = a if np.absolute(fa) < np.absolute(fb) else b
+            converged = False
+        state['inner_converged'] = converged
+        roots.append((x_1, x_0))
+        state['x'] = np.array([x_0, x_1])
+
+        return get_F(state['x'])[1]
+
+    converged = False
+    try:
+        a, b, fa, fb, n, found = expand_bracket(f_outer, x0[1], step[1],
+                                                slope=slopes[1], lb=lb[1],
+                                                ub=ub[1],
+                                                maxiter=maxiter)
+        if found:
+            x_1, f_1, n, converged = brent_root(f_outer, a, b, fa, fb, xtol,
+                                                ftol, maxiter)
+            # the last inner solve may have been at another end point
+            if roots[-1][0] != x_1:
+                f_outer(x_1)
+            converged = converged and state['inner_converged']
+    except StopIteration:
+        pass
+    x = state.get('x', np.asarray(x0, dtype=float))
+
+    return x, get_F(x), len(memo), converged
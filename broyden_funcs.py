@@ -0,0 +1,282 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains a Broyden quasi-Newton root finder for the steady
+state market clearing errors in (r, w, T_H) (ss_funcs.get_ss_errors, as
+solved by ss_funcs.solve_ss).
+
+fsolve builds a new Jacobian at the start of every call and throws it
+away at the end, so re-solving after a small change in parameters pays
+for a full Jacobian again.  Here the Jacobian is an input and an output:
+it is updated after every step with Broyden's rank one update
+
+    J_new = J + (dF - J*dx) dx' / (dx'dx)
+
+so the one returned at the solution can start the next solve, or be
+saved with the solution (see warm_start_funcs.py) and loaded for a solve
+at nearby parameters.  A new Jacobian is only computed (if a function for
+it is given) when the updated one no longer gives a step that lowers
+the errors.
+
+solve_chord() takes Newton steps on a fixed, factorized Jacobian for
+when a Jacobian good near the solution is known in advance.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import scipy.linalg as la
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def _get_dense_solve(jac):
+    '''
+    Generates the linear solve of a Newton step for solve_broyden(): a
+    dense solve with the Jacobian, least squares if it is singular.
+
+    Inputs:
+        jac = [N,N] array, Jacobian
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: solve (function, solve(F) returns jac^-1 F)
+    '''
+    def solve(F):
+        try:
+            return np.linalg.solve(jac, F)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(jac, F, rcond=None)[0]
+
+    return solve
+
+
+def _get_lu_solve(jac):
+    '''
+    Generates the linear solve of a Newton step for solve_chord(): the
+    Jacobian is LU factorized once and each solve is two triangular
+    solves.
+
+    Inputs:
+        jac = [N,N] array, Jacobian
+
+    Functions called: None
+
+    Objects in function:
+        lu = tuple, LU factorization of jac (scipy.linalg.lu_factor)
+
+    Returns: solve (function, solve(F) returns jac^-1 F)
+    '''
+    lu = la.lu_factor(jac)
+
+    def solve(F):
+        return la.lu_solve(lu, F)
+
+    return solve
+
+
+def _broyden_update(jac, s, y):
+    '''
+    Generates Broyden's rank one update of a Jacobian after a step.
+
+    Inputs:
+        jac = [N,N] array, Jacobian before the step
+        s   = [N,] vector, change in x over the step
+        y   = [N,] vector, change in F over the step
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: jac ([N,N] array, updated Jacobian)
+    '''
+    return jac + np.outer(y - np.dot(jac, s), s)/np.dot(s, s)
+
+
+def _solve_newton(func, x0, jac0, get_solve, update, jac_func, xtol, ftol,
+                  maxiter, min_step, args):
+    '''
+    Solves a system of equations F(x) = 0 by Newton steps on an
+    approximate Jacobian with a backtracking line search, the loop
+    shared by solve_broyden() and solve_chord().
+
+    Inputs:
+        func      = function, F(x, *args), returns an [N,] vector
+        x0        = [N,] vector, initial guess
+        jac0      = [N,N] array, Jacobian of F near x0
+        get_solve = function, get_solve(jac) returns the linear solve of
+                    a Newton step with jac (_get_dense_solve or
+                    _get_lu_solve)
+        update    = function or None, update(jac, s, y) returns the
+                    Jacobian updated after a step, if None the Jacobian
+                    is kept until jac_func is called
+        jac_func  = function or None, see solve_broyden()
+        xtol, ftol, maxiter, min_step, args = see solve_broyden()
+
+    Functions called:
+        func
+        get_solve
+        update
+        jac_func
+
+    Objects in function:
+        jac   = [N,N] array, current Jacobian
+        solve = function, linear solve with jac
+        fresh = boolean, =True if jac was computed (not updated) at x
+        dx    = [N,] vector, Newton step
+        t     = scalar in (0,1], fraction of dx taken
+        s, y  = [N,] vectors, change in x and in F over the step
+
+    Returns: x, F, jac, n_evals, n_jacs, converged
+    '''
+    x = np.asarray(x0, dtype=float).copy()
+    F = np.asarray(func(x, *args), dtype=float)
+    n_evals, n_jacs = 1, 0
+    jac = np.array(jac0, dtype=float)
+    solve = get_solve(jac)
+    fresh = False
+    converged = np.absolute(F).max() <= ftol
+    while not converged and n_evals < maxiter:
+        dx = -solve(F)
+        norm = np.sqrt(np.dot(F, F))
+        t = 1.0
+        while True:
+            x_new = x + t*dx
+            F_new = np.asarray(func(x_new, *args), dtype=float)
+            n_evals += 1
+            if (np.sqrt(np.dot(F_new, F_new)) <= (1 - 1e-4*t)*norm or
+                    t/2.0 < min_step or n_evals >= maxiter):
+                break
+            t /= 2.0
+        if np.sqrt(np.dot(F_new, F_new)) > (1 - 1e-4*t)*norm:
+            # the Jacobian is too far off to give a descent direction
+            if jac_func is None or fresh:
+                break
+            jac = np.array(jac_func(x, *args), dtype=float)
+            solve = get_solve(jac)
+            n_jacs += 1
+            fresh = True
+            continue
+        s, y = x_new - x, F_new - F
+        if update is not None:
+            jac = update(jac, s, y)
+            solve = get_solve(jac)
+        fresh = False
+        x, F = x_new, F_new
+        converged = (np.absolute(F).max() <= ftol or
+                     np.absolute(s).max() <= xtol*(np.absolute(x).max() + xtol))
+
+    return x, F, jac, n_evals, n_jacs, converged
+
+
+def solve_broyden(func, x0, jac0, jac_func=None, xtol=1e-12, ftol=1e-12,
+                  maxiter=100, min_step=1e-4, args=()):
+    '''
+    Solves a system of equations F(x) = 0 by Broyden's method with a
+    backtracking line search.
+
+    Inputs:
+        func     = function, F(x, *args), returns an [N,] vector
+        x0       = [N,] vector, initial guess
+        jac0     = [N,N] array, Jacobian of F near x0, jac0[i,m] =
+                   dF_i/dx_m
+        jac_func = function or None, J(x, *args) computes the Jacobian;
+                   called when the line search fails with an updated
+                   Jacobian, if None the solve stops there
+        xtol     = scalar > 0, relative tolerance on the step
+        ftol     = scalar > 0, tolerance on max |F|
+        maxiter  = integer, largest number of evaluations of F
+        min_step = scalar in (0,1), smallest fraction of the Newton step
+                   tried by the line search
+        args     = tuple, extra arguments of func and jac_func
+
+    Functions called:
+        _solve_newton
+        _get_dense_solve
+        _broyden_update
+
+    Objects in function: None
+
+    Returns: x, F (errors at x), jac (Jacobian updated through the last
+             step), n_evals, n_jacs, converged
+    '''
+    return _solve_newton(func, x0, jac0, _get_dense_solve, _broyden_update,
+                         jac_func, xtol, ftol, maxiter, min_step, args)
+
+
+def solve_chord(func, x0, jac0, jac_func=None, xtol=1e-12, ftol=1e-12,
+                maxiter=100, min_step=1e-4, args=()):
+    '''
+    Solves a system of equations F(x) = 0 by Newton steps on a fixed
+    Jacobian (the chord method) with a backtracking line search.  The
+    Jacobian is LU factorized once, so each step costs one evaluation of
+    F (more if the line search backtracks) and two triangular solves.
+    Unlike solve_broyden() the Jacobian is not updated, which suits a
+    Jacobian that is accurate near the solution already (e.g. the
+    sequence space Jacobian of the time path at the steady state, see
+    tpi_funcs.py) and is to be reused as is by the next solve.
+
+    Inputs:
+        func     = function, F(x, *args), returns an [N,] vector
+        x0       = [N,] vector, initial guess
+        jac0     = [N,N] array, Jacobian of F, jac0[i,m] = dF_i/dx_m
+        jac_func = function or None, J(x, *args) computes the Jacobian;
+                   called when the line search fails, if None the solve
+                   stops there
+        xtol     = scalar > 0, relative tolerance on the step
+        ftol     = scalar > 0, tolerance on max |F|
+        maxiter  = integer, largest number of evaluations of F
+        min_step = scalar in (0,1), smallest fraction of the Newton step
+                   tried by the line search
+        args     = tuple, extra arguments of func and jac_func
+
+    Functions called:
+        _solve_newton
+        _get_lu_solve
+
+    Objects in function: None
+
+    Returns: x, F (errors at x), jac (Jacobian of the last steps),
+             n_evals, n_jacs, converged
+    '''
+    return _solve_newton(func, x0, jac0, _get_lu_solve, None, jac_func, xtol,
+                         ftol, maxiter, min_step, args)
+
+
+def get_fd_jac(func, x, F=None, rel_step=1e-6, args=()):
+    '''
+    Generates a forward difference Jacobian, for when no better Jacobian
+    is available to start solve_broyden() from.
+
+    Inputs:
+        func     = function, F(x, *args), returns an [N,] vector
+        x        = [N,] vector, point of the Jacobian
+        F        = [N,] vector or None, F(x) if already known
+        rel_step = scalar > 0, relative step of the differences
+        args     = tuple, extra arguments of func
+
+    Functions called:
+        func
+
+    Objects in function:
+        h = [N,] vector, difference steps
+
+    Returns: jac ([N,N] array, jac[i,m] = dF_i/dx_m)
+    '''
+    x = np.asarray(x, dtype=float)
+    if F is None:
+        F = np.asarray(func(x, *args), dtype=float)
+    h = rel_step*np.maximum(np.absolute(x), 1.0)
+    jac = np.empty((len(F), len(x)))
+    for m in range(len(x)):
+        x_h = x.copy()
+        x_h[m] += h[m]
+        jac[:, m] = (np.asarray(func(x_h, *args), dtype=float) - F)/h[m]
+
+    return jac
@@ -0,0 +1,288 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains the CES production function kernels used by
+firm_funcs_v3.py (the firms of SS_v3pt2_mktclear.py, ss_funcs.py and
+tpi_funcs.py), by firm_funcs_v1.py and agg_funcs_v1.py (with the
+technology passed on to hh_funcs_v1.py), by alloc_funcs.py and by the
+checks in SS_v3pt2_mktclear.py.  model_params.py builds the technology
+once for each ModelParams.
+
+The exponents and constants that depend only on A, gamma and epsilon
+are computed once in get_ces_tech() and kept in a CESTech tuple.  The
+kernels work on arrays of any leading shape (...,M), broadcasting
+against the (M,) technology parameters, and take an optional out array
+so the result can be written into an existing buffer.
+
+The user cost of capital, uc, is the rental price of a unit of capital
+in units of the firm's numeraire.  Without taxes it is (r+delta)*p_k.
+With the taxes in SS_v3pt2_mktclear.py it is q*(r/(1-tau_g)+delta)
+divided by (1-tau_d)*(1-tau_b)/(1-tau_g).
+------------------------------------------------------------------------
+'''
+# Import Packages
+from collections import namedtuple
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+CESTech = namedtuple('CESTech', ['A', 'gamma', 'epsilon', 'inv_eps', 'rho',
+                                 'x_exp', 'k_exp', 'gamma_w', 'gamma1_w',
+                                 'A_rho', 'k_coef', 'l_coef', 'kl',
+                                 'kl_rho'])
+
+
+def get_ces_tech(A, gamma, epsilon):
+    '''
+    Generates the CES technology tuple with all derived exponents and
+    constants computed once.
+
+    Inputs:
+        A       = scalar or [M,] vector, total factor productivity
+        gamma   = scalar or [M,] vector, capital's share of output
+        epsilon = scalar or [M,] vector, elasticity of substitution
+                  between capital and labor
+
+    Functions called: None
+
+    Objects in function:
+        inv_eps  = 1/epsilon
+        rho      = (epsilon-1)/epsilon
+        x_exp    = epsilon/(epsilon-1)
+        k_exp    = epsilon/(1-epsilon)
+        gamma_w  = gamma**(1/epsilon)
+        gamma1_w = (1-gamma)**(1/epsilon)
+        A_rho    = A**((epsilon-1)/epsilon)
+        k_coef   = gamma*A**(epsilon-1)
+        l_coef   = (1-gamma)*A**(epsilon-1)
+        kl       = (1-gamma)/gamma
+        kl_rho   = ((1-gamma)/gamma)**((epsilon-1)/epsilon)
+
+    Returns: tech
+    '''
+    A = np.asarray(A, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+    epsilon = np.asarray(epsilon, dtype=float)
+    inv_eps = 1/epsilon
+    rho = (epsilon-1)/epsilon
+    A_eps = A**(epsilon-1)
+    kl = (1-gamma)/gamma
+    tech = CESTech(A=A, gamma=gamma, epsilon=epsilon, inv_eps=inv_eps,
+                   rho=rho, x_exp=epsilon/(epsilon-1),
+                   k_exp=epsilon/(1-epsilon), gamma_w=gamma**inv_eps,
+                   gamma1_w=(1-gamma)**inv_eps, A_rho=A**rho,
+                   k_coef=gamma*A_eps, l_coef=(1-gamma)*A_eps, kl=kl,
+                   kl_rho=kl**rho)
+
+    return tech
+
+
+def get_out(out, *args):
+    '''
+    Returns the array a kernel writes its result into: out if given, or
+    a new array with the broadcast shape of the arguments.
+
+    Inputs:
+        out  = array or None, array to hold the result
+        args = arrays or scalars the result is broadcast from
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: out
+    '''
+    if out is None:
+        out = np.empty(np.broadcast(*args).shape)
+
+    return out
+
+
+def get_X(tech, K, L, out=None):
+    '''
+    Generates output from capital and labor.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        K    = [...,M] array, capital
+        L    = [...,M] array, labor
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        X = [...,M] array, output
+
+    Returns: X
+    '''
+    X = get_out(out, K, L, tech.rho)
+    np.power(K, tech.rho, out=X)
+    X *= tech.gamma_w
+    X += tech.gamma1_w*(L**tech.rho)
+    np.power(X, tech.x_exp, out=X)
+    X *= tech.A
+
+    return X[()] if X.ndim == 0 else X
+
+
+def get_MPK(tech, K, X, out=None):
+    '''
+    Generates the marginal product of capital.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        K    = [...,M] array, capital
+        X    = [...,M] array, output
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        MPK = [...,M] array, marginal product of capital
+
+    Returns: MPK
+    '''
+    MPK = get_out(out, X, K, tech.inv_eps)
+    np.divide(X, K, out=MPK)
+    np.power(MPK, tech.inv_eps, out=MPK)
+    MPK *= tech.A_rho*tech.gamma_w
+
+    return MPK[()] if MPK.ndim == 0 else MPK
+
+
+def get_MPL(tech, X, L, out=None):
+    '''
+    Generates the marginal product of labor.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        X    = [...,M] array, output
+        L    = [...,M] array, labor
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        MPL = [...,M] array, marginal product of labor
+
+    Returns: MPL
+    '''
+    MPL = get_out(out, X, L, tech.inv_eps)
+    np.divide(X, L, out=MPL)
+    np.power(MPL, tech.inv_eps, out=MPL)
+    MPL *= tech.A_rho*tech.gamma1_w
+
+    return MPL[()] if MPL.ndim == 0 else MPL
+
+
+def get_k_over_x(tech, p, uc, out=None):
+    '''
+    Generates the capital-output ratio from the firm's FOC for capital.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        p    = [...,M] array, price of output
+        uc   = [...,M] array, user cost of capital
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        k_over_x = [...,M] array, K/X
+
+    Returns: k_over_x
+    '''
+    k_over_x = get_out(out, p, uc, tech.epsilon)
+    np.divide(p, uc, out=k_over_x)
+    np.power(k_over_x, tech.epsilon, out=k_over_x)
+    k_over_x *= tech.k_coef
+
+    return k_over_x[()] if k_over_x.ndim == 0 else k_over_x
+
+
+def get_l_over_x(tech, p, w, out=None):
+    '''
+    Generates the labor-output ratio from the firm's FOC for labor.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        p    = [...,M] array, price of output
+        w    = [...,M] array, wage rate
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        l_over_x = [...,M] array, EL/X
+
+    Returns: l_over_x
+    '''
+    l_over_x = get_out(out, p, w, tech.epsilon)
+    np.divide(p, w, out=l_over_x)
+    np.power(l_over_x, tech.epsilon, out=l_over_x)
+    l_over_x *= tech.l_coef
+
+    return l_over_x[()] if l_over_x.ndim == 0 else l_over_x
+
+
+def get_k_demand(tech, X, uc, w, out=None):
+    '''
+    Generates the demand for capital given output, using the FOCs for
+    capital and labor and the production function.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        X    = [...,M] array, output
+        uc   = [...,M] array, user cost of capital
+        w    = [...,M] array, wage rate
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        K = [...,M] array, demand for capital
+
+    Returns: K
+    '''
+    K = get_out(out, X, uc, w, tech.epsilon)
+    np.divide(uc, w, out=K)
+    np.power(K, tech.epsilon-1, out=K)
+    K *= tech.gamma1_w*tech.kl_rho
+    K += tech.gamma_w
+    np.power(K, tech.k_exp, out=K)
+    K *= X
+    K /= tech.A
+
+    return K[()] if K.ndim == 0 else K
+
+
+def get_l_demand(tech, K, uc, w, out=None):
+    '''
+    Generates the demand for labor given the demand for capital.
+
+    Inputs:
+        tech = CESTech tuple, CES technology
+        K    = [...,M] array, demand for capital
+        uc   = [...,M] array, user cost of capital
+        w    = [...,M] array, wage rate
+        out  = [...,M] array or None, array to hold the result
+
+    Functions called: None
+
+    Objects in function:
+        L = [...,M] array, demand for labor
+
+    Returns: L
+    '''
+    L = get_out(out, K, uc, w, tech.epsilon)
+    np.divide(uc, w, out=L)
+    np.power(L, tech.epsilon, out=L)
+    L *= tech.kl
+    L *= K
+
+    return L[()] if L.ndim == 0 else L
@@ -0,0 +1,132 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for a diagnostics channel, used in place of
+print statements inside functions the solvers call many times (e.g. the
+market clearing errors in ss_funcs.get_ss_errors and the checks on firm
+values and interest rates in ss_funcs.get_mkt_parts).
+
+Each message has a level.  A message is only formatted and written if
+its level is at or below the level of the channel, so at the default
+level (INFO) the messages of each evaluation (DEBUG) and the checks
+(TRACE) cost one comparison.  Checks that need extra computations go
+under "if dg.enabled(diag, dg.TRACE):" so nothing is computed either.
+Messages that are written can also be rate limited: only every n-th
+call of a message is written, and at most one per min_interval seconds.
+The number of calls not written is kept for each message.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import sys
+import time
+
+# Levels of messages and channels
+QUIET = 0  # nothing
+INFO = 1  # progress of the outer solve, warnings
+DEBUG = 2  # every evaluation of the errors
+TRACE = 3  # checks computed at every evaluation
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_diag(level=INFO, every=1, min_interval=0.0, stream=None):
+    '''
+    Generates a diagnostics channel.
+
+    Inputs:
+        level        = integer, QUIET, INFO, DEBUG or TRACE, messages
+                       above it are dropped
+        every        = integer >= 1, write every n-th call of a message
+        min_interval = scalar >= 0, seconds between writes of a message
+        stream       = file or None, where messages go, sys.stdout if None
+
+    Functions called: None
+
+    Objects in function:
+        diag = dictionary, settings, and for each message the number of
+               calls, the time of the last write and the calls not
+               written
+
+    Returns: diag
+    '''
+    diag = dict(level=level, every=every, min_interval=min_interval,
+                stream=stream, counts={}, last={}, dropped={})
+
+    return diag
+
+
+def enabled(diag, level):
+    '''
+    Checks if messages of a level are written.
+
+    Inputs:
+        diag  = dictionary or None, diagnostics channel, None for QUIET
+        level = integer, level of the messages
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: boolean
+    '''
+    return diag is not None and level <= diag['level']
+
+
+def say(diag, level, msg, *values):
+    '''
+    Writes a message followed by values, separated by spaces as the print
+    statement does, if its level is enabled and it is not rate limited.
+    The values are only converted to strings when the message is written.
+
+    Inputs:
+        diag   = dictionary or None, diagnostics channel
+        level  = integer, level of the message
+        msg    = string, message, also the key for the rate limits
+        values = objects written after the message
+
+    Functions called:
+        enabled
+
+    Objects in function:
+        n   = integer, calls of the message so far
+        now = scalar, time of the call
+
+    Returns: None
+    '''
+    if not enabled(diag, level):
+        return
+    n = diag['counts'].get(msg, 0) + 1
+    diag['counts'][msg] = n
+    now = time.time()
+    if ((n - 1) % diag['every'] != 0 or
+            now - diag['last'].get(msg, -float('inf')) < diag['min_interval']):
+        diag['dropped'][msg] = diag['dropped'].get(msg, 0) + 1
+        return
+    diag['last'][msg] = now
+    stream = diag['stream'] if diag['stream'] is not None else sys.stdout
+    stream.write(' '.join([msg] + [str(v) for v in values]) + '\n')
+
+
+def say_dropped(diag):
+    '''
+    Writes the number of calls of each message that were rate limited.
+
+    Inputs:
+        diag = dictionary or None, diagnostics channel
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    if diag is None or not diag['dropped']:
+        return
+    stream = diag['stream'] if diag['stream'] is not None else sys.stdout
+    for msg, n in sorted(diag['dropped'].items()):
+        stream.write('diagnostics: %d calls of "%s" not written\n' % (n, msg.strip()))
@@ -0,0 +1,277 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for the producer's problem of the
+multi-industry model with taxes (as in SS_v3pt2_mktclear.py).  All
+functions take the model parameters explicitly as a ModelParams tuple
+(see model_params.py).
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import ces_funcs as ces
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_Z(mp, r):
+    '''
+    Generates the SS value of depreciation deductions per dollar of
+    capital.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        r  = scalar, interest rate
+
+    Functions called: None
+
+    Objects in function:
+        Z = [M,] vector, PV of depreciation deductions
+
+    Returns: Z
+    '''
+    tau_b, tau_d, tau_g, delta_tau = mp.tau_b, mp.tau_d, mp.tau_g, mp.delta_tau
+    Z = (((1-tau_d)/(1-tau_g))*tau_b*delta_tau)/((r/(1-tau_g))+delta_tau)
+
+    return Z
+
+
+def get_p_c(mp, p):
+    '''
+    Generates prices of consumption goods.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        p  = [M,] vector or [T,M] array, prices of industry output
+
+    Functions called: None
+
+    Objects in function:
+        p_c = [I,] vector or [T,I] array, prices of consumption goods
+
+    Returns: p_c
+    '''
+    p_c = np.dot(p, mp.pi.T)
+
+    return p_c
+
+
+def get_p_tilde(mp, p_c):
+    '''
+    Generates the price of the composite consumption good.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_c = [I,] vector or [T,I] array, prices of consumption goods
+
+    Functions called: None
+
+    Objects in function:
+        p_tilde = scalar or [T,] vector, price of composite consumption
+                  good
+
+    Returns: p_tilde
+    '''
+    p_tilde = ((p_c/mp.alpha)**mp.alpha).prod(-1)
+
+    return p_tilde
+
+
+def get_q(mp, p_k, r):
+    '''
+    Generates marginal q, the marginal change in firm value for another
+    unit of capital in the firm.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [M,] vector, price of capital goods
+        r   = scalar, interest rate
+
+    Functions called: None
+
+    Objects in function:
+        q = [M,] vector, shadow prices of capital
+
+    Returns: q
+    '''
+    tau_b, tau_d, tau_g, delta_tau = mp.tau_b, mp.tau_d, mp.tau_g, mp.delta_tau
+    q = p_k*((1-tau_d)/(1-tau_g))*(1-(tau_b*delta_tau)-(tau_b*delta_tau*(1-delta_tau)*(((r/(1-tau_g))+delta_tau)**(-1.0))))
+
+    return q
+
+
+def get_uc(mp, p_k, r):
+    '''
+    Generates the user cost of capital, the pre-tax rental price of a
+    unit of capital.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [M,] vector, price of capital goods
+        r   = scalar, interest rate
+
+    Functions called:
+        get_q
+
+    Objects in function:
+        uc = [M,] vector, user cost of capital
+
+    Returns: uc
+    '''
+    tau_b, tau_d, tau_g = mp.tau_b, mp.tau_d, mp.tau_g
+    uc = ((1-tau_g)/((1-tau_d)*(1-tau_b)))*get_q(mp, p_k, r)*((r/(1-tau_g))+mp.delta)
+
+    return uc
+
+
+def get_r(mp, q, K, X, p):
+    '''
+    Generates the interest rate implied by the given factor demands,
+    price and marginal q.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        q  = [M,] vector, marginal q
+        K  = [M,] vector, capital
+        X  = [M,] vector, output
+        p  = [M,] vector, prices of industry output
+
+    Functions called:
+        ces.get_MPK
+
+    Objects in function:
+        r = [M,] vector, interest rate implied by each industry
+
+    Returns: r
+    '''
+    tau_b, tau_d, tau_g = mp.tau_b, mp.tau_d, mp.tau_g
+    MPK = ces.get_MPK(mp.tech, K, X)
+    r = ((((1-tau_d)/(1-tau_g))*(1-tau_b)*(p/q)*MPK) - mp.delta)*(1-tau_g)
+
+    return r
+
+
+def get_k_over_x(mp, p_k, p, r):
+    '''
+    Generates K/X for each industry.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [M,] vector, price of capital goods
+        p   = [M,] vector, prices of industry output
+        r   = scalar, interest rate
+
+    Functions called:
+        get_uc
+        ces.get_k_over_x
+
+    Objects in function:
+        k_over_x = [M,] vector, K/X
+
+    Returns: k_over_x
+    '''
+    k_over_x = ces.get_k_over_x(mp.tech, p, get_uc(mp, p_k, r))
+
+    return k_over_x
+
+
+def get_l_over_x(mp, p, w):
+    '''
+    Generates EL/X for each industry.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        p  = [M,] vector, prices of industry output
+        w  = scalar, wage rate
+
+    Functions called:
+        ces.get_l_over_x
+
+    Objects in function:
+        l_over_x = [M,] vector, EL/X
+
+    Returns: l_over_x
+    '''
+    l_over_x = ces.get_l_over_x(mp.tech, p, w)
+
+    return l_over_x
+
+
+def get_k_demand(mp, p_k, w, r, X):
+    '''
+    Generates the demand for capital by each industry.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [M,] vector, price of capital goods
+        w   = scalar, wage rate
+        r   = scalar, interest rate
+        X   = [M,] vector, output
+
+    Functions called:
+        get_uc
+        ces.get_k_demand
+
+    Objects in function:
+        K = [M,] vector, demand for capital
+
+    Returns: K
+    '''
+    K = ces.get_k_demand(mp.tech, X, get_uc(mp, p_k, r), w)
+
+    return K
+
+
+def get_l_demand(mp, p_k, w, r, K):
+    '''
+    Generates the demand for labor by each industry.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p_k = [M,] vector, price of capital goods
+        w   = scalar, wage rate
+        r   = scalar, interest rate
+        K   = [M,] vector, demand for capital
+
+    Functions called:
+        get_uc
+        ces.get_l_demand
+
+    Objects in function:
+        L = [M,] vector, demand for labor
+
+    Returns: L
+    '''
+    L = ces.get_l_demand(mp.tech, K, get_uc(mp, p_k, r), w)
+
+    return L
+
+
+def get_firm_taxes(mp, p, p_k, w, X, K, L):
+    '''
+    Generates business income taxes paid by each industry.
+
+    Inputs:
+        mp  = ModelParams, model parameters
+        p   = [M,] vector, prices of industry output
+        p_k = [M,] vector, price of capital goods
+        w   = scalar, wage rate
+        X   = [M,] vector, output
+        K   = [M,] vector, capital
+        L   = [M,] vector, labor
+
+    Functions called: None
+
+    Objects in function:
+        firm_taxes = [M,] vector, business income taxes
+
+    Returns: firm_taxes
+    '''
+    firm_taxes = mp.tau_b*(p*X - w*L - mp.delta*p_k*K)
+
+    return firm_taxes
@@ -0,0 +1,170 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for accelerating the damped fixed point
+iterations on factor prices (as in Steady_State() in
+SS_v3pt1_converge.py and SS_v2pt5_converge*.py).
+
+Each outer iteration maps guesses x = (r, w) into implied prices
+g(x) = (r_new, w_new).  Plain damping updates x <- x + mu*(g(x)-x).
+Anderson mixing keeps the last few iterates and residuals f = g(x)-x
+and takes the combination of them whose residual is smallest in the
+least squares sense:
+
+    gamma = argmin ||f_k - dF*gamma||
+    x <- x_k + mu*f_k - (dX + mu*dF)*gamma
+
+where dX and dF hold the differences of consecutive iterates and
+residuals.  The step is safeguarded: if the residual grows by more than
+a factor of the smallest one seen, or the step leaves the bounds or is
+not finite, the history is cleared and a damped step is taken instead.
+After too many such restarts the accelerator falls back to plain
+damping for good, halving mu whenever the residual grows, as the
+original loops did.
+
+The state of the accelerator is kept in a dictionary made by
+get_accel_state() and updated in place by accel_update().
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_accel_state(mu, method='anderson', depth=5, growth=2.0,
+                    max_restarts=5, max_cond=1e10, wait=10, lb=None,
+                    ub=None):
+    '''
+    Generates the state of a fixed point accelerator.
+
+    Inputs:
+        mu           = scalar in (0,1], damping parameter, weight on
+                       the new guess
+        method       = string, 'anderson' or 'damping'
+        depth        = integer >= 1, number of past residual
+                       differences used in Anderson mixing
+        growth       = scalar >= 1, the history is cleared if the norm
+                       of the residual exceeds growth times the smallest
+                       norm seen
+        max_restarts = integer >= 0, number of restarts after which
+                       Anderson mixing gives way to plain damping
+        max_cond     = scalar > 0, largest condition number of dF that is
+                       used, older columns are dropped above it
+        wait         = integer >= 0, iterations before plain damping
+                       starts halving mu
+        lb, ub       = [N,] vectors or None, bounds on the iterates
+
+    Functions called: None
+
+    Objects in function:
+        state = dictionary, accelerator state
+
+    Returns: state
+    '''
+    state = dict(mu=mu, method=method, depth=depth, growth=growth,
+                 max_restarts=max_restarts, max_cond=max_cond, wait=wait,
+                 lb=lb, ub=ub, x_hist=[], f_hist=[], f_norm=[],
+                 n_restarts=0, n_anderson=0, n_damped=0)
+
+    return state
+
+
+def get_anderson_step(state, x, f):
+    '''
+    Generates the Anderson mixing step from the stored history.
+
+    Inputs:
+        state = dictionary, accelerator state
+        x     = [N,] vector, current iterate
+        f     = [N,] vector, current residual g(x)-x
+
+    Functions called: None
+
+    Objects in function:
+        dX    = [N,m] array, differences of consecutive iterates
+        dF    = [N,m] array, differences of consecutive residuals
+        sv    = [m,] vector, singular values of dF
+        gamma = [m,] vector, mixing coefficients
+
+    Returns: x_new
+    '''
+    mu = state['mu']
+    dX = np.diff(np.array(state['x_hist']), axis=0).T
+    dF = np.diff(np.array(state['f_hist']), axis=0).T
+    while dF.shape[1] > 0:
+        sv = np.linalg.svd(dF, compute_uv=False)
+        if sv[-1] > 0 and sv[0] <= state['max_cond']*sv[-1]:
+            break
+        dX, dF = dX[:, 1:], dF[:, 1:]
+    if dF.shape[1] == 0:
+        return x + mu*f
+    gamma = np.linalg.lstsq(dF, f, rcond=None)[0]
+    x_new = x + mu*f - np.dot(dX + mu*dF, gamma)
+
+    return x_new
+
+
+def accel_update(state, x, gx):
+    '''
+    Generates the next iterate of the fixed point iteration x = g(x) and
+    updates the accelerator state.
+
+    Inputs:
+        state = dictionary, accelerator state
+        x     = [N,] vector, current iterate
+        gx    = [N,] vector, value of the map at x
+
+    Functions called:
+        get_anderson_step
+
+    Objects in function:
+        f      = [N,] vector, residual g(x)-x
+        norm   = scalar, norm of the residual
+        x_new  = [N,] vector, next iterate
+
+    Returns: x_new
+    '''
+    x = np.asarray(x, dtype=float).ravel()
+    f = np.asarray(gx, dtype=float).ravel() - x
+    norm = np.sqrt((f**2).sum())
+    f_norm = state['f_norm']
+    f_norm.append(norm)
+
+    if state['method'] == 'anderson':
+        if len(f_norm) > 1 and norm > state['growth']*min(f_norm[:-1]):
+            # safeguard: residual grew, start the history over
+            state['x_hist'], state['f_hist'] = [], []
+            state['n_restarts'] += 1
+            if state['n_restarts'] > state['max_restarts']:
+                state['method'] = 'damping'
+        state['x_hist'].append(x)
+        state['f_hist'].append(f)
+        state['x_hist'] = state['x_hist'][-(state['depth']+1):]
+        state['f_hist'] = state['f_hist'][-(state['depth']+1):]
+
+    if state['method'] == 'anderson' and len(state['x_hist']) > 1:
+        x_new = get_anderson_step(state, x, f)
+        in_bounds = np.isfinite(x_new).all()
+        if state['lb'] is not None:
+            in_bounds = in_bounds and (x_new > state['lb']).all()
+        if state['ub'] is not None:
+            in_bounds = in_bounds and (x_new < state['ub']).all()
+        if in_bounds:
+            state['n_anderson'] += 1
+            return x_new
+        state['x_hist'], state['f_hist'] = [x], [f]
+        state['n_restarts'] += 1
+    elif (state['method'] == 'damping' and len(f_norm) > state['wait'] + 1
+          and norm > f_norm[-2]):
+        state['mu'] /= 2.0
+
+    x_new = x + state['mu']*f
+    state['n_damped'] += 1
+
+    return x_new
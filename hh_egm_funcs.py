@@ -0,0 +1,164 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the household problem of the
+multi-industry model (as in SS_v3pt2_mktclear.py) with an endogenous
+grid method.
+
+Given consumption in the last period of life, c_S, the household FOCs
+can be inverted period by period going backward:
+    - foc_bq gives the bequest k_S,
+    - foc_k gives c_s from c_{s+1},
+    - foc_l gives n_s from c_s,
+    - the budget constraint gives savings k_{s-1}.
+Savings at each age are affine in the bequests received, bq, so bq
+consistent with the mortality weighted savings of the type is found in
+closed form.  The only condition left is that the household starts life
+with no savings, k_0 = 0.  The implied k_0 is increasing in c_S, so it
+is evaluated on a grid of c_S for all types at once and the grid is
+narrowed around the sign change.  No root finder is used and the cost
+is linear in S.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import hh_solve_funcs as hf
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_egm_path(params, c_S, r, w, p_c, p_tilde, T_H):
+    '''
+    Generates the lifetime path of consumption, labor supply and savings
+    implied by consumption in the last period of life by iterating
+    backward on the household FOCs.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        c_S     = [G,J] array, grid of consumption in last period of life
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+
+    Functions called:
+        hf.MUc
+        hf.MUl
+        hf.MUb
+
+    Objects in function:
+        c      = [S,G,J] array, composite consumption
+        n      = [S,G,J] array, labor supply
+        k_a    = [S+1,G,J] array, savings at end of period s-1 when bq=0
+                 (k_a[0] is savings at the start of life)
+        k_b    = [S+1,J] array, reduction in savings per unit of bq
+        income = [S,G,J] array, resources other than savings and bq
+        bq     = [G,J] array, bequests received consistent with savings
+
+    Returns: c, n, k (end of period savings, [S,G,J]), k_0 ([G,J])
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    J = c_S.shape[-1]
+    e_j = np.asarray(e, dtype=float)[:J]
+
+    # foc_k: MUc(c_s) = (1+r)*beta*surv_s*MUc(c_{s+1}), inverted backward
+    c = np.empty((S,) + c_S.shape)
+    c[-1] = c_S
+    for s in range(S-2, -1, -1):
+        c[s] = ((1+r)*beta*surv_mat[s, :J]*hf.MUc(params, c[s+1]))**(-1/sigma)
+
+    # foc_l: MUl(n_s) = -w*e_j*MUc(c_s)/p_tilde
+    n = ltilde - (((w*e_j*hf.MUc(params, c))/(p_tilde*chi_n))**(-1/nu))
+
+    # foc_bq: MUb(k_S) = MUc(c_S)/p_tilde
+    k_a = np.empty((S+1,) + c_S.shape)
+    k_b = np.zeros((S+1, J))
+    k_a[S] = ((hf.MUc(params, c_S)/(p_tilde*chi_b))**(-1/sigma))
+
+    # budget constraint, backward: (1+r)*k_{s-1} = p_tilde*c_s + k_s - w*n_s*e_j - bq - ...
+    income = w*n*e_j + (T_H/weights.sum()) - ((p_c*cbar).sum())
+    for s in range(S-1, -1, -1):
+        k_a[s] = (p_tilde*c[s] + k_a[s+1] - income[s])/(1+r)
+        k_b[s] = (k_b[s+1] + 1)/(1+r)
+
+    # bq = (1+r)*sum(weights*mort*k)/sum(weights), with k = k_a - k_b*bq
+    wm = ((1+r)*weights[:, :J]*mort_mat[:, :J])/weights[:, :J].sum(0)
+    bq = ((wm[:, np.newaxis, :]*k_a[1:]).sum(0) /
+          (1 + (wm*k_b[1:]).sum(0)))
+    k = k_a[1:] - k_b[1:, np.newaxis, :]*bq
+    k_0 = k_a[0] - k_b[0]*bq
+
+    return c, n, k, k_0
+
+
+def solve_hh_egm(params, r, w, p_c, p_tilde, T_H, n_grid=16, tol=1e-12,
+                 maxiter=60):
+    '''
+    Solves the household problems of all J ability types by the
+    endogenous grid method.  A grid on consumption in the last period of
+    life is narrowed around the point where households start life with
+    zero savings.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        n_grid  = integer >= 3, number of grid points on c_S
+        tol     = scalar > 0, tolerance on the relative width of the
+                  bracket around c_S
+        maxiter = integer >= 1, maximum number of grid refinements
+
+    Functions called:
+        get_egm_path
+
+    Objects in function:
+        lo, hi = [J,] vectors, bracket on c_S with k_0(lo) <= 0 <= k_0(hi)
+        grid   = [G,J] array, grid on c_S
+        k_0    = [G,J] array, savings at the start of life on grid
+        c_S    = [1,J] array, solution for consumption in last period
+
+    Returns: k, n, converged
+    '''
+    S, ltilde = params[0], params[6]
+    J = params[8].shape[1]
+    args = (r, w, p_c, p_tilde, T_H)
+    lo = np.ones(J)*1e-3
+    hi = np.ones(J)
+    # widen the bracket until it contains the root for every type
+    for it in range(60):
+        k_0 = get_egm_path(params, np.vstack((lo, hi)), *args)[3]
+        if (k_0[0] <= 0).all() and (k_0[1] >= 0).all():
+            break
+        lo[k_0[0] > 0] *= 0.1
+        hi[k_0[1] < 0] *= 10.0
+    frac = np.linspace(0.0, 1.0, n_grid)[:, np.newaxis]
+    it = 0
+    while ((hi-lo) > tol*hi).any() and it < maxiter:
+        grid = lo + frac*(hi-lo)
+        k_0 = get_egm_path(params, grid, *args)[3]
+        # last grid point with k_0 <= 0 starts the new bracket
+        i = np.clip((k_0 <= 0).sum(0) - 1, 0, n_grid-2)
+        cols = np.arange(J)
+        lo, hi = grid[i, cols], grid[i+1, cols]
+        it += 1
+    # linear interpolation within the final bracket
+    k_0 = get_egm_path(params, np.vstack((lo, hi)), *args)[3]
+    weight = np.where(k_0[1] > k_0[0], -k_0[0]/(k_0[1]-k_0[0]), 0.0)
+    c_S = (lo + np.clip(weight, 0, 1)*(hi-lo))[np.newaxis, :]
+    c, n, k, k_0 = get_egm_path(params, c_S, *args)
+    k, n = k[:, 0, :], n[:, 0, :]
+    converged = (((hi-lo) <= tol*hi) & (n > 0).all(0) & (n < ltilde).all(0))
+
+    return k, n, converged
@@ -127,6 +127,8 @@ def EulerSys(bvec, params):
         alpha  = scalar in (0,1), capital share of income
         delta  = scalar in [0,1], model-period depreciation rate of
                  capital
+        tech   = CESTech tuple, CES technology built once by the caller
+                 (see ces_funcs.py)
 
     Functions called:
         get_L        = generates aggregate labor from nvec
@@ -159,19 +161,19 @@ def EulerSys(bvec, params):
 
     Returns: b_errors
     '''
-    S, beta, sigma, alpha, cbar1, cbar2, A, gamma, epsilon, delta, SS_tol = params
+    S, beta, sigma, alpha, cbar1, cbar2, A, gamma, epsilon, delta, SS_tol, tech = params
     L = get_L(np.ones(S))
     K, K_constr = get_K(bvec)
     if K_constr == True:
         b_err_vec = 1000 * np.ones(S-1)
     else:
-        kl_params = np.array([A, gamma, epsilon, delta, SS_tol])
+        kl_params = (tech, delta, SS_tol)
         K1, L1 = get_KL(kl_params, L, K)
         K2 = K - K1
         L2 = L - L1
-        r_params = np.array([A, gamma, epsilon, delta])
+        r_params = (tech, delta)
         r = get_r(r_params, K1, L1)
-        w_params = np.array([A, gamma, epsilon])
+        w_params = tech
         w = get_w(w_params, K1, L1)
         p_params = np.array([A, gamma, epsilon, delta])
         p_c1 = get_p_c(p_params, r, w)
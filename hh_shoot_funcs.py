@@ -0,0 +1,192 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the household problem of the
+multi-industry model (as in SS_v3pt2_mktclear.py) with a shooting
+method.
+
+Given consumption in the first period of life, c_1, the household FOCs
+and budget constraint give the whole lifetime path going forward:
+    - foc_k gives c_{s+1} from c_s,
+    - foc_l gives n_s from c_s,
+    - the budget constraint gives savings k_s from k_{s-1}, with k_0 = 0.
+Savings at each age are affine in the bequests received, bq, so bq
+consistent with the mortality weighted savings of the type is found in
+closed form.  The only condition left is foc_bq at the end of life,
+which is a scalar root in c_1 for each type.  The root is bracketed and
+found with the Illinois method, with the forward paths of all J types
+computed together.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import hh_solve_funcs as hf
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_shoot_path(params, c_1, r, w, p_c, p_tilde, T_H):
+    '''
+    Generates the lifetime path of consumption, labor supply and savings
+    implied by consumption in the first period of life, and the error in
+    the bequest FOC at the end of life.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        c_1     = [G,J] array, consumption in first period of life
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+
+    Functions called:
+        hf.MUc
+
+    Objects in function:
+        c      = [S,G,J] array, composite consumption
+        n      = [S,G,J] array, labor supply
+        k_a    = [S,G,J] array, end of period savings when bq=0
+        k_b    = [S,] vector, increase in savings per unit of bq
+        income = [S,G,J] array, resources other than savings and bq
+        bq     = [G,J] array, bequests received consistent with savings
+        k_bq   = [G,J] array, bequest that satisfies foc_bq given c_S
+        error  = [G,J] array, k_S - k_bq, monotone in c_1
+
+    Returns: c, n, k ([S,G,J]), error
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    J = c_1.shape[-1]
+    e_j = np.asarray(e, dtype=float)[:J]
+
+    # foc_k: MUc(c_{s+1}) = MUc(c_s)/((1+r)*beta*surv_s), going forward
+    c = np.empty((S,) + c_1.shape)
+    c[0] = c_1
+    for s in range(S-1):
+        c[s+1] = (hf.MUc(params, c[s])/((1+r)*beta*surv_mat[s, :J]))**(-1/sigma)
+
+    # foc_l: MUl(n_s) = -w*e_j*MUc(c_s)/p_tilde
+    n = ltilde - (((w*e_j*hf.MUc(params, c))/(p_tilde*chi_n))**(-1/nu))
+
+    # budget constraint, forward: k_s = (1+r)*k_{s-1} + w*n_s*e_j + bq + ... - p_tilde*c_s
+    income = w*n*e_j + (T_H/weights.sum()) - ((p_c*cbar).sum())
+    k_a = np.empty_like(c)
+    k_b = np.empty(S)
+    k_a_prev = np.zeros(c_1.shape)
+    k_b_prev = 0.0
+    for s in range(S):
+        k_a[s] = (1+r)*k_a_prev + income[s] - p_tilde*c[s]
+        k_b[s] = (1+r)*k_b_prev + 1
+        k_a_prev, k_b_prev = k_a[s], k_b[s]
+
+    # bq = (1+r)*sum(weights*mort*k)/sum(weights), with k = k_a + k_b*bq
+    wm = ((1+r)*weights[:, :J]*mort_mat[:, :J])/weights[:, :J].sum(0)
+    bq = ((wm[:, np.newaxis, :]*k_a).sum(0) /
+          (1 - (wm*k_b[:, np.newaxis]).sum(0)))
+    k = k_a + k_b[:, np.newaxis, np.newaxis]*bq
+
+    # foc_bq: MUb(k_S) = MUc(c_S)/p_tilde
+    k_bq = ((hf.MUc(params, c[-1])/(p_tilde*chi_b))**(-1/sigma))
+    error = k[-1] - k_bq
+
+    return c, n, k, error
+
+
+def solve_hh_shoot(params, r, w, p_c, p_tilde, T_H, tol=1e-13,
+                   maxiter=200, c_1_guess=None, info=None):
+    '''
+    Solves the household problems of all J ability types by shooting on
+    consumption in the first period of life.  The bequest FOC error is
+    evaluated on a wide grid of c_1 to bracket each type's root.  The
+    root is then found with the Illinois method, which keeps the root
+    bracketed throughout but converges superlinearly.  Given a guess for
+    c_1 (e.g. the solution at nearby prices), a narrow grid around it is
+    tried first and the wide grid is only used for types whose root is
+    not on it.
+
+    Inputs:
+        params    = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                    ltilde, e, surv_mat, mort_mat, weights, cbar)
+        r         = scalar, interest rate
+        w         = scalar, wage rate
+        p_c       = [I,] vector, prices of consumption goods
+        p_tilde   = scalar, price of composite consumption good
+        T_H       = scalar, total government transfers
+        tol       = scalar > 0, tolerance on the relative width of the
+                    bracket around c_1
+        maxiter   = integer >= 1, maximum number of Illinois iterations
+        c_1_guess = [J,] vector or None, guess for consumption in the
+                    first period of life
+        info      = dictionary or None, if given the Illinois iterations
+                    and the shooting paths computed are added to
+                    info['iterations'] and info['evals'] (see
+                    stats_funcs.py)
+
+    Functions called:
+        get_shoot_path
+
+    Objects in function:
+        grid   = [G,J] array, grid on c_1 used to bracket the roots
+        a, b   = [J,] vectors, bracket on c_1, b is the latest iterate
+        f_a    = [J,] vector, error at a (halved by the Illinois rule)
+        f_b    = [J,] vector, error at b
+        active = [J,] boolean vector, =True if type not yet converged
+
+    Returns: k, n, converged
+    '''
+    S, ltilde = params[0], params[6]
+    J = params[8].shape[1]
+    args = (r, w, p_c, p_tilde, T_H)
+    cols = np.arange(J)
+    if c_1_guess is None:
+        grid = np.tile(np.logspace(-6, 3, 37)[:, np.newaxis], (1, J))
+    else:
+        grid = (np.exp(np.linspace(-0.05, 0.05, 5))[:, np.newaxis] *
+                np.asarray(c_1_guess, dtype=float)[np.newaxis, :])
+    f = get_shoot_path(params, grid, *args)[3]
+    n_evals = grid.shape[0]
+    # first sign change on the grid for each type
+    change = np.sign(f[:-1]) != np.sign(f[1:])
+    i = np.argmax(change, axis=0)
+    bracketed = change[i, cols]
+    a, b = grid[i, cols], grid[i+1, cols]
+    f_a, f_b = f[i, cols], f[i+1, cols]
+    if not bracketed.all() and c_1_guess is not None:
+        # root not near the guess, search the wide grid
+        wide = np.tile(np.logspace(-6, 3, 37)[:, np.newaxis], (1, J))
+        f = get_shoot_path(params, wide, *args)[3]
+        n_evals += wide.shape[0]
+        change = np.sign(f[:-1]) != np.sign(f[1:])
+        i = np.argmax(change, axis=0)
+        miss = ~bracketed
+        a[miss], b[miss] = wide[i, cols][miss], wide[i+1, cols][miss]
+        f_a[miss], f_b[miss] = f[i, cols][miss], f[i+1, cols][miss]
+        bracketed = bracketed | change[i, cols]
+    active = bracketed & (np.absolute(b-a) > tol*np.absolute(b)) & (f_b != 0)
+    it = 0
+    while active.any() and it < maxiter:
+        x = np.where(active, b - f_b*(b-a)/np.where(active, f_b-f_a, 1.0), b)
+        f_x = get_shoot_path(params, x[np.newaxis, :], *args)[3][0]
+        switch = active & (np.sign(f_x) != np.sign(f_b))
+        keep = active & ~switch
+        # Illinois step: halve the error at the end that stays put
+        f_a[keep] *= 0.5
+        a[switch], f_a[switch] = b[switch], f_b[switch]
+        b[active], f_b[active] = x[active], f_x[active]
+        active = active & (np.absolute(b-a) > tol*np.absolute(b)) & (f_b != 0)
+        it += 1
+    c, n, k, f = get_shoot_path(params, b[np.newaxis, :], *args)
+    k, n = k[:, 0, :], n[:, 0, :]
+    converged = bracketed & ~active & (n > 0).all(0) & (n < ltilde).all(0)
+    if info is not None:
+        info['iterations'] = info.get('iterations', 0) + it
+        info['evals'] = info.get('evals', 0) + n_evals + it + 1
+
+    return k, n, converged
@@ -0,0 +1,556 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the household problem of the
+multi-industry model (as in SS_v3pt2_mktclear.py) with Newton's method
+and an analytic Jacobian.
+
+Ordering the unknowns by age as (k_1, n_1, k_2, n_2, ..., k_S, n_S) and
+the FOCs as (foc_l_1, foc_k_1, ..., foc_l_S, foc_bq), each FOC only
+depends on the choices at neighboring ages, so the Jacobian is banded
+with 3 sub- and 2 super-diagonals.  The bequests received, bq, depend on
+savings at every age.  This adds the rank one term u*v' to the Jacobian,
+which is handled with the Sherman-Morrison formula.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import scipy.linalg as la
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+# number of sub- and super-diagonals in the banded part of the Jacobian
+L_BAND = 3
+U_BAND = 2
+
+
+def MUc(params, c):
+    '''
+    Generates the marginal utility of consumption.
+
+    Inputs:
+        params = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                 ltilde, e, surv_mat, mort_mat, weights, cbar)
+        c      = array, consumption
+
+    Functions called: None
+
+    Objects in function:
+        output = array, marginal utility of consumption
+
+    Returns: output
+    '''
+    sigma = params[2]
+    output = c**(-sigma)
+    return output
+
+
+def MUl(params, n):
+    '''
+    Generates the marginal utility of labor.
+
+    Inputs:
+        params = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                 ltilde, e, surv_mat, mort_mat, weights, cbar)
+        n      = array, labor supply
+
+    Functions called: None
+
+    Objects in function:
+        output = array, marginal utility of labor
+
+    Returns: output
+    '''
+    nu, chi_n, ltilde = params[3], params[4], params[6]
+    output = -chi_n*((ltilde-n)**(-nu))
+    return output
+
+
+def MUb(params, bq):
+    '''
+    Generates the marginal utility of intentional bequests.
+
+    Inputs:
+        params = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                 ltilde, e, surv_mat, mort_mat, weights, cbar)
+        bq     = array, intentional bequests
+
+    Functions called: None
+
+    Objects in function:
+        output = array, marginal utility of bequests
+
+    Returns: output
+    '''
+    sigma, chi_b = params[2], params[5]
+    output = chi_b*(bq**(-sigma))
+    return output
+
+
+def get_hh_parts(params, k, n, r, w, p_c, p_tilde, T_H, j):
+    '''
+    Generates the bequests and consumption used by both the household
+    FOCs and their Jacobian.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k       = [S,nj] array, savings for each type solved for
+        n       = [S,nj] array, labor supply for each type solved for
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        j       = integer or [nj,] vector, ability type(s) solved for
+
+    Functions called: None
+
+    Objects in function:
+        e_j = [nj,] vector, effective labor units of the types
+        k0  = [S,nj] array, savings at the start of each period
+        bq  = [nj,] vector, bequests received at each age
+        c   = [S,nj] array, composite consumption
+
+    Returns: e_j, bq, c
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    j = np.atleast_1d(j)
+    e_j = np.asarray(e, dtype=float)[j]
+    k0 = np.zeros_like(k)
+    k0[1:, :] = k[:-1, :]
+    bq = (((1+r)*(k*weights[:, j]*mort_mat[:, j]).sum(0)) /
+          weights[:, j].sum(0))
+    c = ((((1+r))*k0) + w*n*e_j - k + bq + (T_H/weights.sum()) -
+         ((p_c*cbar).sum()))/p_tilde
+
+    return e_j, bq, c
+
+
+def get_hh_errors(params, k, n, r, w, p_c, p_tilde, T_H, j):
+    '''
+    Generates the household FOC errors, in the same order as solve_hh()
+    in SS_v3pt2_mktclear.py: S-1 savings Euler errors, S labor supply
+    FOC errors and the bequest FOC error.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k       = [S,] vector or [S,nj] array, savings
+        n       = [S,] vector or [S,nj] array, labor supply
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        j       = integer or [nj,] vector, ability type(s)
+
+    Functions called:
+        get_hh_parts
+        MUc
+        MUl
+        MUb
+
+    Objects in function:
+        mu_c   = [S,nj] array, marginal utility of consumption
+        error1 = [S-1,nj] array, savings Euler errors
+        error2 = [S,nj] array, labor supply FOC errors
+        error3 = [1,nj] array, bequest FOC errors
+
+    Returns: errors ([2S,] vector or [2S,nj] array)
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    k2 = k.reshape(S, -1)
+    n2 = n.reshape(S, -1)
+    e_j, bq, c = get_hh_parts(params, k2, n2, r, w, p_c, p_tilde, T_H, j)
+    mu_c = MUc(params, c)
+    error1 = mu_c[:-1, :] - (1+r)*beta*surv_mat[:-1, np.atleast_1d(j)]*mu_c[1:, :]
+    error2 = (w*mu_c*e_j)/p_tilde + MUl(params, n2)
+    error3 = mu_c[-1:, :]/p_tilde - MUb(params, k2[-1:, :])
+    errors = np.vstack((error1, error2, error3))
+
+    return errors.reshape((2*S,) + k.shape[1:])
+
+
+def get_hh_jac_band(params, k, n, r, w, p_c, p_tilde, T_H, j):
+    '''
+    Generates the analytic Jacobian of the household FOCs in banded plus
+    rank one form, jac = band + u*v', using the age ordering of the
+    unknowns and FOCs described at the top of this file.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k       = [S,] vector or [S,nj] array, savings
+        n       = [S,] vector or [S,nj] array, labor supply
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        j       = integer or [nj,] vector, ability type(s)
+
+    Functions called:
+        get_hh_parts
+
+    Objects in function:
+        dMUc = [S,nj] array, derivative of MUc wrt consumption
+        F_c0 = [2S,nj] array, derivative of each FOC wrt consumption at
+               the FOC's own age
+        F_c1 = [2S,nj] array, derivative of each FOC wrt consumption at
+               the next age
+        ab   = [nj,6,2S] array, banded part in LAPACK banded storage,
+               ab[:, U_BAND+i-m, m] = band[:, i, m]
+        u    = [nj,2S] array, derivative of each FOC wrt bq
+        v    = [nj,2S] array, derivative of bq wrt each unknown
+
+    Returns: ab, u, v (with the leading nj axis dropped if k is [S,])
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    jj = np.atleast_1d(j)
+    k2 = k.reshape(S, -1)
+    n2 = n.reshape(S, -1)
+    nj = k2.shape[1]
+    e_j, bq, c = get_hh_parts(params, k2, n2, r, w, p_c, p_tilde, T_H, j)
+    dMUc = -sigma*(c**(-sigma-1))
+    ages = np.arange(S)
+
+    # derivatives of the FOCs (in age order) wrt c_s and c_{s+1}
+    F_c0 = np.zeros((2*S, nj))
+    F_c1 = np.zeros((2*S, nj))
+    F_c0[2*ages, :] = (w*e_j*dMUc)/p_tilde
+    F_c0[2*ages[:-1]+1, :] = dMUc[:-1, :]
+    F_c1[2*ages[:-1]+1, :] = -(1+r)*beta*surv_mat[:-1, jj]*dMUc[1:, :]
+    F_c0[2*S-1, :] = dMUc[-1, :]/p_tilde
+
+    # chain through the budget constraint: dc_s/dk_{s-1} = (1+r)/p_tilde,
+    # dc_s/dk_s = -1/p_tilde and dc_s/dn_s = w*e_j/p_tilde
+    ab = np.zeros((nj, L_BAND+U_BAND+1, 2*S))
+    rows0 = np.arange(2*S)
+    rows1 = 2*ages[:-1]+1
+    for F_c, rows, s in ((F_c0[rows0, :], rows0, rows0//2),
+                         (F_c1[rows1, :], rows1, ages[:-1]+1)):
+        ab[:, U_BAND+rows-2*s, 2*s] += (-F_c/p_tilde).T
+        ab[:, U_BAND+rows-2*s-1, 2*s+1] += ((w*e_j*F_c)/p_tilde).T
+        lag = s > 0
+        ab[:, U_BAND+rows[lag]-2*s[lag]+2, 2*s[lag]-2] += (((1+r)*F_c[lag, :])/p_tilde).T
+
+    # direct derivatives wrt n in the labor FOCs and k_S in the bequest FOC
+    ab[:, U_BAND-1, 2*ages+1] += (-chi_n*nu*((ltilde-n2)**(-nu-1))).T
+    ab[:, U_BAND+1, 2*S-2] += chi_b*sigma*(k2[-1, :]**(-sigma-1))
+
+    # rank one term from bequests: all c_s move one-for-one with bq/p_tilde
+    u = ((F_c0 + F_c1)/p_tilde).T
+    v = np.zeros((nj, 2*S))
+    v[:, 2*ages] = (((1+r)*weights[:, jj]*mort_mat[:, jj]) /
+                    weights[:, jj].sum(0)).T
+
+    if k.ndim == 1:
+        return ab[0], u[0], v[0]
+    return ab, u, v
+
+
+def get_hh_jac(params, k, n, r, w, p_c, p_tilde, T_H, j):
+    '''
+    Generates the dense Jacobian of the household FOCs for one type with
+    the unknowns and FOCs in the order used by solve_hh() in
+    SS_v3pt2_mktclear.py, so it can be passed to fsolve as fprime.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k       = [S,] vector, savings
+        n       = [S,] vector, labor supply
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        j       = integer, ability type
+
+    Functions called:
+        get_hh_jac_band
+        get_hh_order
+        band_to_dense
+
+    Objects in function:
+        ab = [6,2S] array, banded part of the Jacobian in age order
+
+    Returns: jac
+    '''
+    S = params[0]
+    ab, u, v = get_hh_jac_band(params, k, n, r, w, p_c, p_tilde, T_H, j)
+    var_order, foc_order = get_hh_order(S)
+    jac = (band_to_dense(ab) + np.outer(u, v))[foc_order, :][:, var_order]
+
+    return jac
+
+
+def band_to_dense(ab):
+    '''
+    Generates dense matrices from matrices in LAPACK banded storage.
+
+    Inputs:
+        ab = [...,6,2S] array, matrices in LAPACK banded storage
+
+    Functions called: None
+
+    Objects in function:
+        N    = integer, number of rows and columns of each matrix
+        band = [...,2S,2S] array, dense matrices
+
+    Returns: band
+    '''
+    N = ab.shape[-1]
+    band = np.zeros(ab.shape[:-2] + (N, N))
+    for d in range(-L_BAND, U_BAND+1):
+        i = np.arange(max(0, -d), min(N, N-d))
+        band[..., i, i+d] = ab[..., U_BAND-d, i+d]
+
+    return band
+
+
+def get_hh_order(S):
+    '''
+    Generates the permutations between the age ordering used for the
+    banded Jacobian and the ordering used by solve_hh().
+
+    Inputs:
+        S = integer, number of periods in life of hh
+
+    Functions called: None
+
+    Objects in function:
+        var_order = [2S,] vector, position in age order of each element
+                    of [k, n]
+        foc_order = [2S,] vector, position in age order of each element
+                    of [foc_k, foc_l, foc_bq]
+
+    Returns: var_order, foc_order
+    '''
+    ages = np.arange(S)
+    var_order = np.append(2*ages, 2*ages+1)
+    foc_order = np.concatenate((2*ages[:-1]+1, 2*ages, [2*S-1]))
+
+    return var_order, foc_order
+
+
+def solve_band_rank1(ab, u, v, rhs):
+    '''
+    Solves (band + u*v')x = rhs with one banded LU solve for two right
+    hand sides and the Sherman-Morrison formula.
+
+    Inputs:
+        ab  = [6,2S] array, banded part in LAPACK banded storage
+        u   = [2S,] vector, left vector of rank one term
+        v   = [2S,] vector, right vector of rank one term
+        rhs = [2S,] vector, right hand side
+
+    Functions called: None
+
+    Objects in function:
+        y = [2S,2] array, band^-1 [rhs, u]
+
+    Returns: x
+    '''
+    y = la.solve_banded((L_BAND, U_BAND), ab, np.column_stack((rhs, u)))
+    x = y[:, 0] - y[:, 1]*(np.dot(v, y[:, 0])/(1.0 + np.dot(v, y[:, 1])))
+
+    return x
+
+
+def hh_feasible(params, k, n, r, w, p_c, p_tilde, T_H, j):
+    '''
+    Determines whether savings and labor supply give positive
+    consumption, labor supply in (0, ltilde) and positive bequests, so
+    that all marginal utilities are defined and the constraints that
+    solve_hh() punishes are not violated.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k       = [S,nj] array, savings
+        n       = [S,nj] array, labor supply
+        r, w, p_c, p_tilde, T_H, j = as in get_hh_parts
+
+    Functions called:
+        get_hh_parts
+
+    Objects in function:
+        c = [S,nj] array, composite consumption
+
+    Returns: ok ([nj,] boolean vector)
+    '''
+    ltilde = params[6]
+    c = get_hh_parts(params, k, n, r, w, p_c, p_tilde, T_H, j)[2]
+    ok = ((c > 0).all(0) & (n > 0).all(0) & (n < ltilde).all(0) &
+          (k[-1, :] > 0))
+
+    return ok
+
+
+def solve_hh_newton(params, guesses, r, w, p_c, p_tilde, T_H, j,
+                    tol=1e-10, maxiter=100):
+    '''
+    Solves the household problem for one ability type with Newton's
+    method, using the banded plus rank one Jacobian.  Steps are halved
+    until the guesses are feasible and the FOC errors fall.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        guesses = [2S,] vector, initial guess of [k, n] as for solve_hh()
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        j       = integer, ability type
+        tol     = scalar > 0, convergence tolerance on max abs FOC error
+        maxiter = integer >= 1, maximum number of Newton iterations
+
+    Functions called:
+        get_hh_errors
+        get_hh_jac_band
+        get_hh_order
+        solve_band_rank1
+        hh_feasible
+
+    Objects in function:
+        x    = [2S,] vector, [k, n]
+        step = [2S,] vector, Newton step in the ordering of x
+        lam  = scalar in (0,1], step length
+
+    Returns: k, n, converged
+    '''
+    S = params[0]
+    var_order, foc_order = get_hh_order(S)
+    args = (r, w, p_c, p_tilde, T_H, j)
+    x = np.array(guesses, dtype=float)
+    error = get_hh_errors(params, x[:S], x[S:], *args)
+    norm = np.absolute(error).max()
+    it = 0
+    while norm > tol and it < maxiter:
+        ab, u, v = get_hh_jac_band(params, x[:S], x[S:], *args)
+        rhs = np.zeros(2*S)
+        rhs[foc_order] = -error
+        step = solve_band_rank1(ab, u, v, rhs)[var_order]
+        lam = 1.0
+        while lam > 1e-10:
+            x_new = x + lam*step
+            if hh_feasible(params, x_new[:S, None], x_new[S:, None], *args)[0]:
+                error_new = get_hh_errors(params, x_new[:S], x_new[S:], *args)
+                if np.absolute(error_new).max() < norm:
+                    break
+            lam *= 0.5
+        else:
+            break
+        x = x_new
+        error = error_new
+        norm = np.absolute(error).max()
+        it += 1
+
+    converged = norm <= tol
+    return x[:S], x[S:], converged
+
+
+def solve_hh_batch(params, k_guess, n_guess, r, w, p_c, p_tilde, T_H,
+                   tol=1e-10, maxiter=100):
+    '''
+    Solves the household problems of all J ability types at once.  The
+    J problems are independent, so the Jacobian of the stacked system is
+    block diagonal.  Each Newton iteration builds the banded plus rank
+    one Jacobians of all active types in one call and solves each block
+    with one banded solve and Sherman-Morrison (solve_band_rank1), O(S)
+    per type.  Steps are halved type by type until guesses
+    are feasible and FOC errors fall, and types that have converged are
+    held fixed.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        k_guess = [S,J] array, initial guess of savings
+        n_guess = [S,J] array, initial guess of labor supply
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_c     = [I,] vector, prices of consumption goods
+        p_tilde = scalar, price of composite consumption good
+        T_H     = scalar, total government transfers
+        tol     = scalar > 0, convergence tolerance on max abs FOC error
+        maxiter = integer >= 1, maximum number of Newton iterations
+
+    Functions called:
+        get_hh_errors
+        get_hh_jac_band
+        get_hh_order
+        solve_band_rank1
+        hh_feasible
+
+    Objects in function:
+        active = [J,] boolean vector, =True if type not yet converged
+        ab     = [nj,6,2S] array, banded parts of the Jacobians of the
+                 active types in age order
+        u, v   = [nj,2S] arrays, rank one terms of the Jacobians
+        step   = [S,2,J] array, Newton steps for k and n
+        lam    = [J,] vector, step length for each type
+
+    Returns: k, n, converged
+    '''
+    S = params[0]
+    var_order, foc_order = get_hh_order(S)
+    k = np.array(k_guess, dtype=float)
+    n = np.array(n_guess, dtype=float)
+    types = np.arange(k.shape[1])
+    args = (r, w, p_c, p_tilde, T_H)
+    error = get_hh_errors(params, k, n, *(args + (types,)))
+    norm = np.absolute(error).max(0)
+    active = norm > tol
+    it = 0
+    while active.any() and it < maxiter:
+        ja = types[active]
+        ka, na = k[:, active], n[:, active]
+        ab, u, v = get_hh_jac_band(params, ka, na, *(args + (ja,)))
+        rhs = np.zeros((ja.shape[0], 2*S))
+        rhs[:, foc_order] = -error[:, active].T
+        step = np.column_stack([solve_band_rank1(ab[i], u[i], v[i], rhs[i])
+                                for i in range(ja.shape[0])])
+        step = step.reshape(S, 2, -1)
+        lam = np.ones(ja.shape[0])
+        bad = np.ones(ja.shape[0], dtype=bool)
+        k_new, n_new = ka.copy(), na.copy()
+        error_new = error[:, active].copy()
+        while bad.any() and lam.min() > 1e-10:
+            k_new[:, bad] = ka[:, bad] + lam[bad]*step[:, 0, bad]
+            n_new[:, bad] = na[:, bad] + lam[bad]*step[:, 1, bad]
+            ok = hh_feasible(params, k_new[:, bad], n_new[:, bad], *(args + (ja[bad],)))
+            error_bad = error_new[:, bad]
+            error_bad[:, ok] = get_hh_errors(params, k_new[:, bad][:, ok], n_new[:, bad][:, ok],
+                                             *(args + (ja[bad][ok],)))
+            error_new[:, bad] = error_bad
+            better = ok.copy()
+            better[ok] = np.absolute(error_bad[:, ok]).max(0) < norm[active][bad][ok]
+            still_bad = bad.copy()
+            still_bad[bad] = ~better
+            lam[still_bad] *= 0.5
+            bad = still_bad
+        # types whose line search failed keep their current guesses
+        k_new[:, bad], n_new[:, bad] = ka[:, bad], na[:, bad]
+        error_new[:, bad] = error[:, active][:, bad]
+        k[:, active], n[:, active] = k_new, n_new
+        error[:, active] = error_new
+        norm = np.absolute(error).max(0)
+        stalled = np.zeros_like(active)
+        stalled[ja[bad]] = True
+        active = (norm > tol) & ~stalled
+        it += 1
+
+    converged = norm <= tol
+    return k, n, converged
@@ -0,0 +1,189 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the steady state by parameter
+continuation (homotopy), for parameterizations where a direct solve from
+rough guesses does not converge (e.g. ability levels far apart, CES
+production far from Cobb-Douglas, or many industries).
+
+The steady state is first solved for an easy parameterization of the
+same model: every type has the average ability level, the elasticities
+of substitution are close to one and there are no taxes.  The
+parameters are then moved along the straight line
+
+    params(t) = (1-t)*params_easy + t*params_target,  t in [0,1]
+
+and the steady state is solved at each step, starting from a linear
+extrapolation of the solutions at the last two steps.  The step in t is
+doubled when a solve takes few evaluations of the market clearing
+errors, halved when it takes many, and halved and retried when a solve
+fails.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import model_params as mpf
+import ss_funcs as ssf
+import memo_funcs as mo
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_easy_params(mp, eps_gap=0.01):
+    '''
+    Generates the easy parameterization the continuation starts from.
+
+    Inputs:
+        mp      = ModelParams, target model parameters
+        eps_gap = scalar > 0, distance of the easy elasticities of
+                  substitution from one
+
+    Functions called:
+        mpf.replace_params
+
+    Objects in function:
+        e_easy   = [J,] vector, average ability level for every type
+        eps_easy = [M,] vector, elasticities of substitution next to one,
+                   on the same side of one as the target so the path
+                   never crosses Cobb-Douglas
+        zeros    = [M,] vector, zero tax rates
+
+    Returns: mp_easy (ModelParams)
+    '''
+    e_easy = np.ones(mp.J)*np.dot(mp.lambdas, mp.e)/mp.lambdas.sum()
+    epsilon = np.asarray(mp.epsilon, dtype=float)
+    eps_easy = np.where(np.absolute(epsilon - 1) < eps_gap, epsilon,
+                        np.where(epsilon < 1, 1 - eps_gap, 1 + eps_gap))
+    zeros = np.zeros(mp.M)
+    mp_easy = mpf.replace_params(mp, e=e_easy, epsilon=eps_easy,
+                                 tau_b=zeros, tau_d=zeros, tau_g=zeros)
+
+    return mp_easy
+
+
+def get_path_params(mp_easy, mp, t):
+    '''
+    Generates the model parameters at a point on the continuation path.
+    Parameters that are the same at both ends are not touched.
+
+    Inputs:
+        mp_easy = ModelParams, parameters at t=0
+        mp      = ModelParams, parameters at t=1
+        t       = scalar in [0,1], position on the path
+
+    Functions called:
+        mpf.get_model_params
+
+    Objects in function:
+        params = dictionary, primitive parameters at t
+
+    Returns: mp_t (ModelParams)
+    '''
+    if t >= 1:
+        return mp
+    params = {}
+    for name in mpf.PARAM_FIELDS:
+        a, b = getattr(mp_easy, name), getattr(mp, name)
+        if np.array_equal(a, b):
+            params[name] = b
+        else:
+            params[name] = ((1-t)*np.asarray(a, dtype=float) +
+                            t*np.asarray(b, dtype=float))
+
+    return mpf.get_model_params(**params)
+
+
+def solve_homotopy(mp, guesses, k_guess=None, n_guess=None,
+                   hh_method='shoot', mp_easy=None, step=0.25,
+                   min_step=1e-3, max_step=1.0, target_evals=20,
+                   max_steps=100, xtol=1e-12):
+    '''
+    Solves for the steady state by continuation from an easy
+    parameterization.
+
+    Inputs:
+        mp           = ModelParams, target model parameters
+        guesses      = [3,] vector, guesses for (r, w, T_H) at the easy
+                       parameterization
+        k_guess      = [S,J] array or None, guess for savings
+        n_guess      = [S,J] array or None, guess for labor supply
+        hh_method    = string, household solver, see ss_funcs.solve_hh_all
+        mp_easy      = ModelParams or None, parameters to start from,
+                       None for get_easy_params(mp)
+        step         = scalar in (0,1], first step in t
+        min_step     = scalar > 0, smallest step tried before giving up
+        max_step     = scalar in (0,1], largest step
+        target_evals = integer >= 1, number of error evaluations per
+                       solve the step size aims at
+        max_steps    = integer >= 1, largest number of solves
+        xtol         = scalar > 0, relative tolerance of the root finder
+
+    Functions called:
+        get_easy_params
+        get_path_params
+        mo.get_memo
+        ssf.solve_ss
+
+    Objects in function:
+        path  = list of (t, r, w, T_H, n_evals, converged) tuples, every
+                solve tried along the path
+        t     = scalar, position of the last converged solve
+        x     = [3,] vector, (r, w, T_H) at t
+        x_old = [3,] vector or None, (r, w, T_H) at the previous
+                converged step, used to extrapolate the next guess
+        sol   = dictionary, solution at the last solve
+
+    Returns: sol (see ss_funcs.solve_ss, with sol['converged'] False if
+             the target was not reached), path
+    '''
+    if mp_easy is None:
+        mp_easy = get_easy_params(mp)
+    cache = {}
+    memo = mo.get_memo()
+    path = []
+    sol = ssf.solve_ss(mp_easy, guesses, k_guess, n_guess, hh_method, xtol,
+                       cache, memo)
+    path.append((0.0, sol['r'], sol['w'], sol['T_H'], sol['n_evals'],
+                 sol['converged']))
+    if not sol['converged']:
+        return sol, path
+    t, t_old = 0.0, None
+    x, x_old = np.array([sol['r'], sol['w'], sol['T_H']]), None
+    k, n = sol['k'], sol['n']
+    step = min(step, max_step)
+    while t < 1 and len(path) < max_steps:
+        t_new = min(t + step, 1.0)
+        if x_old is None:
+            x_guess = x
+        else:
+            x_guess = x + (t_new - t)*(x - x_old)/(t - t_old)
+        sol = ssf.solve_ss(get_path_params(mp_easy, mp, t_new), x_guess, k,
+                           n, hh_method, xtol, cache, memo)
+        path.append((t_new, sol['r'], sol['w'], sol['T_H'], sol['n_evals'],
+                     sol['converged']))
+        if not sol['converged'] and x_old is not None:
+            # extrapolation overshot, try again from the last solution
+            sol = ssf.solve_ss(get_path_params(mp_easy, mp, t_new), x, k, n,
+                               hh_method, xtol, cache, memo)
+            path.append((t_new, sol['r'], sol['w'], sol['T_H'],
+                         sol['n_evals'], sol['converged']))
+        if not sol['converged']:
+            step /= 2.0
+            if step < min_step:
+                break
+            continue
+        t_old, x_old = t, x
+        t, x = t_new, np.array([sol['r'], sol['w'], sol['T_H']])
+        k, n = sol['k'], sol['n']
+        if sol['n_evals'] <= target_evals/2:
+            step = min(2.0*step, max_step)
+        elif sol['n_evals'] > target_evals:
+            step = max(step/2.0, min_step)
+    sol['converged'] = sol['converged'] and t >= 1
+
+    return sol, path
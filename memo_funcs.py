@@ -0,0 +1,136 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for memoizing the inner solves of the
+steady state market clearing errors (prices, household problems and
+output in ss_funcs.get_ss_errors).
+
+When fsolve builds its finite difference Jacobian it evaluates the
+errors at points that differ from the last one in a single coordinate
+by a tiny step, and it evaluates some points more than once.  Each
+inner solution is kept in a small least recently used (LRU) memo keyed
+by the outer guesses (r, w, T_H) and the parameter key.  A point already
+in the memo is not solved again; any other point has its inner solves
+started from the solution at the nearest point in the memo, so they
+take a few iterations instead of starting cold.
+------------------------------------------------------------------------
+'''
+# Import Packages
+from collections import OrderedDict
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_memo(maxsize=16):
+    '''
+    Generates an empty memo of inner solutions.
+
+    Inputs:
+        maxsize = integer >= 1, number of points kept, the least recently
+                  used point is dropped beyond it
+
+    Functions called: None
+
+    Objects in function:
+        memo = dictionary, entries (OrderedDict from key to entry, least
+               recently used first) and counts of exact hits, seeded
+               solves and cold solves
+
+    Returns: memo
+    '''
+    memo = dict(maxsize=maxsize, entries=OrderedDict(), hits=0, seeded=0,
+                cold=0)
+
+    return memo
+
+
+def get_memo_key(x, params_key=''):
+    '''
+    Generates the memo key of a point.
+
+    Inputs:
+        x          = [N,] vector, outer guesses, e.g. (r, w, T_H)
+        params_key = string, key of the model parameters
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: key (tuple)
+    '''
+    return (params_key,) + tuple(float(v) for v in np.ravel(x))
+
+
+def memo_lookup(memo, x, params_key=''):
+    '''
+    Looks a point up in the memo.
+
+    Inputs:
+        memo       = dictionary, memo of inner solutions
+        x          = [N,] vector, outer guesses
+        params_key = string, key of the model parameters
+
+    Functions called:
+        get_memo_key
+
+    Objects in function:
+        dist = scalar, largest relative difference between x and a point
+               in the memo
+
+    Returns: entry (stored at x, None if x is not in the memo), seed
+             (entry stored at the nearest point, None if the memo is
+             empty)
+    '''
+    entries = memo['entries']
+    key = get_memo_key(x, params_key)
+    if key in entries:
+        entries[key] = entries.pop(key)  # most recently used
+        memo['hits'] += 1
+        return entries[key], entries[key]
+    x = np.ravel(x).astype(float)
+    seed, min_dist = None, np.inf
+    for other, entry in entries.items():
+        y = np.array(other[1:])
+        if y.shape != x.shape:
+            continue
+        dist = (np.absolute(x - y)/np.maximum(np.absolute(y), 1e-8)).max()
+        if other[0] != params_key:
+            dist += 1.0  # prefer the same parameters
+        if dist < min_dist:
+            seed, min_dist = entry, dist
+    if seed is None:
+        memo['cold'] += 1
+    else:
+        memo['seeded'] += 1
+
+    return None, seed
+
+
+def memo_store(memo, x, entry, params_key=''):
+    '''
+    Stores the inner solution at a point, dropping the least recently
+    used point if the memo is full.
+
+    Inputs:
+        memo       = dictionary, memo of inner solutions
+        x          = [N,] vector, outer guesses
+        entry      = dictionary, inner solution at x
+        params_key = string, key of the model parameters
+
+    Functions called:
+        get_memo_key
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    entries = memo['entries']
+    entries[get_memo_key(x, params_key)] = entry
+    while len(entries) > memo['maxsize']:
+        entries.popitem(last=False)
@@ -0,0 +1,202 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains the model parameter object for the multi-industry
+model (as in SS_v3pt2_mktclear.py).
+
+A ModelParams tuple holds the primitive parameters together with the
+demographic and tax arrays derived from them (surv_mat, mort_mat, omega,
+weights, ...), which are computed once in get_model_params().  The
+tuple is immutable and its arrays are read only, so one object can be
+shared by any number of solves.  Its key is a hash of the primitive
+parameters that does not change from one run or process to the next,
+so it can be used to memoize or store results by parameter set.
+Pickling a ModelParams only sends the primitive parameters; the derived
+arrays are rebuilt on the other side.
+------------------------------------------------------------------------
+'''
+# Import Packages
+from collections import namedtuple
+import hashlib
+import numpy as np
+import ces_funcs as ces
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+# primitive parameters, in the order get_model_params() takes them
+PARAM_FIELDS = ['beta', 'sigma', 'nu', 'chi_n', 'chi_b', 'ltilde', 'e',
+                'lambdas', 'surv_rate', 'alpha', 'cbar', 'A', 'gamma',
+                'epsilon', 'delta', 'xi', 'pi', 'tau_b', 'tau_d', 'tau_g',
+                'delta_tau']
+
+# parameters derived from the primitives
+DERIVED_FIELDS = ['S', 'J', 'I', 'M', 'mort_rate', 'surv_mat', 'mort_mat',
+                  'omega', 'weights', 'tech', 'p_params', 'hh_params', 'key']
+
+_ModelParams = namedtuple('_ModelParams', PARAM_FIELDS + DERIVED_FIELDS)
+
+
+class ModelParams(_ModelParams):
+    '''
+    Immutable set of model parameters.  Two ModelParams are equal, and
+    hash the same, when their primitive parameters are the same.
+    '''
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, ModelParams) and self.key == other.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        return (get_model_params,
+                tuple(getattr(self, name) for name in PARAM_FIELDS))
+
+
+def get_params_key(params):
+    '''
+    Generates a hash of the primitive parameters that is the same in
+    every run and process.
+
+    Inputs:
+        params = dictionary, primitive parameters keyed by the names in
+                 PARAM_FIELDS
+
+    Functions called: None
+
+    Objects in function:
+        sha   = hashlib sha1 object
+        value = [...] array, parameter value as an array of floats
+
+    Returns: key (string of 40 hex digits)
+    '''
+    sha = hashlib.sha1()
+    for name in PARAM_FIELDS:
+        value = np.ascontiguousarray(params[name], dtype=float)
+        sha.update(('%s%s' % (name, value.shape)).encode('utf-8'))
+        sha.update(value.tobytes())
+
+    return sha.hexdigest()
+
+
+def get_model_params(beta, sigma, nu, chi_n, chi_b, ltilde, e, lambdas,
+                     surv_rate, alpha, cbar, A, gamma, epsilon, delta, xi,
+                     pi, tau_b, tau_d, tau_g, delta_tau):
+    '''
+    Generates the model parameter object, computing all derived
+    demographic and tax arrays once.
+
+    Inputs:
+        beta      = scalar, discount rate
+        sigma     = scalar, coeff of relative risk aversion
+        nu        = scalar, elasticity of labor supply
+        chi_n     = scalar, utility weight on disutility of labor
+        chi_b     = scalar, utility weight on warm glow bequest motive
+        ltilde    = scalar, maximum hours
+        e         = [J,] vector, effective labor units of the J types
+        lambdas   = [J,] vector, fraction of each cohort of each type
+        surv_rate = [S,] vector, probability of surviving to next period
+        alpha     = [I,] vector, shares of goods in composite consumption
+        cbar      = [I,] vector, min cons of each of I goods
+        A         = scalar or [M,] vector, total factor productivity
+        gamma     = [M,] vector, capital's share of output
+        epsilon   = [M,] vector, elasticity of substitution between
+                    capital and labor
+        delta     = [M,] vector, depreciation rate
+        xi        = [M,M] array, fixed coeff input-output matrix
+        pi        = [I,M] array, fixed coeff pce-bridge matrix
+        tau_b     = [M,] vector, business income tax rates
+        tau_d     = [M,] vector, dividend tax rates
+        tau_g     = [M,] vector, capital gains tax rates
+        delta_tau = [M,] vector, tax depreciation rates
+
+    Functions called:
+        get_params_key
+        ces.get_ces_tech
+
+    Objects in function:
+        mort_rate = [S,] vector, probability of dying at end of period
+        surv_mat  = [S,J] array, survival rates
+        mort_mat  = [S,J] array, mortality rates
+        omega     = [S,J] array, number of each age alive at any time
+        weights   = [S,J] array, population weights, sum to one
+        tech      = CESTech tuple, CES technology
+        p_params  = length 9 tuple, parameters of price_funcs and
+                    output_funcs
+        hh_params = length 12 tuple, parameters of hh_solve_funcs,
+                    hh_egm_funcs and hh_shoot_funcs
+
+    Returns: mp (ModelParams)
+    '''
+    params = dict(beta=beta, sigma=sigma, nu=nu, chi_n=chi_n, chi_b=chi_b,
+                  ltilde=ltilde, e=e, lambdas=lambdas, surv_rate=surv_rate,
+                  alpha=alpha, cbar=cbar, A=A, gamma=gamma, epsilon=epsilon,
+                  delta=delta, xi=xi, pi=pi, tau_b=tau_b, tau_d=tau_d,
+                  tau_g=tau_g, delta_tau=delta_tau)
+    for name, value in params.items():
+        if np.ndim(value) > 0:
+            value = np.array(value, dtype=float)
+            value.setflags(write=False)
+            params[name] = value
+    surv_rate = params['surv_rate'].copy()
+    S = surv_rate.shape[0]
+    J = params['lambdas'].shape[0]
+    surv_rate[-1] = 0.0
+    mort_rate = 1.0-surv_rate
+    surv_mat = np.tile(surv_rate.reshape(S, 1), (1, J))
+    mort_mat = np.tile(mort_rate.reshape(S, 1), (1, J))
+    surv_rate1 = np.ones((S, 1))
+    surv_rate1[1:, 0] = np.cumprod(surv_rate[:-1], dtype=float)
+    omega = np.ones((S, J))*surv_rate1
+    weights = omega*params['lambdas']/((omega*params['lambdas']).sum())
+    for value in (mort_rate, surv_mat, mort_mat, omega, weights):
+        value.setflags(write=False)
+    tech = ces.get_ces_tech(A, gamma, epsilon)
+    p_params = (params['A'], params['gamma'], params['epsilon'],
+                params['delta'], params['delta_tau'], params['tau_b'],
+                params['tau_d'], params['tau_g'], params['xi'])
+    hh_params = (S, beta, sigma, nu, chi_n, chi_b, ltilde, params['e'],
+                 surv_mat, mort_mat, weights, params['cbar'])
+    mp = ModelParams(S=S, J=J, I=params['alpha'].shape[0],
+                     M=params['xi'].shape[0], mort_rate=mort_rate,
+                     surv_mat=surv_mat, mort_mat=mort_mat, omega=omega,
+                     weights=weights, tech=tech, p_params=p_params,
+                     hh_params=hh_params, key=get_params_key(params),
+                     **params)
+
+    return mp
+
+
+def replace_params(mp, **changes):
+    '''
+    Generates a new model parameter object with some primitive
+    parameters changed.
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        changes = keyword arguments, new values of primitive parameters
+
+    Functions called:
+        get_model_params
+
+    Objects in function:
+        params = dictionary, primitive parameters of the new object
+
+    Returns: mp (ModelParams)
+    '''
+    params = dict((name, getattr(mp, name)) for name in PARAM_FIELDS)
+    for name in changes:
+        if name not in params:
+            raise ValueError('%s is not a primitive model parameter' % name)
+    params.update(changes)
+
+    return get_model_params(**params)
@@ -0,0 +1,188 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving for the output of each
+industry (as in solve_output() in SS_v3pt2_mktclear.py) directly.
+
+For given prices, the demand for capital is linear in output,
+K_m = kx_m*X_m with kx = ff.get_k_demand() at X = 1, so the resource constraint
+
+    X = X_c + xi'*(delta*K)
+
+is the linear system (I - xi'*diag(delta*kx))*X = X_c.  The matrix is
+LU factorized once for each set of prices and the factorization is used
+for every right hand side X_c.
+
+Along a time path, investment is K_{t+1} - (1-delta)*K_t and output is
+solved backward from the steady state, one M dimensional linear system
+per period (solve_output_path).
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import scipy.linalg as la
+import firm_funcs_v3 as ff
+
+# most factorizations kept by solve_output_path's cache
+MAX_FACTORS = 10000
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def factor_output(mp, p_k, r, w, cache=None, info=None):
+    '''
+    LU factorizes the matrix of the output demand system for given
+    prices and finds its condition number.  If a dictionary is passed as
+    cache, the factorization for the last prices seen is kept there and
+    reused when exactly the same prices come in again with the same
+    ModelParams.
+
+    Inputs:
+        mp     = ModelParams, model parameters
+        p_k    = [M,] vector, price of capital goods
+        r      = scalar, interest rate
+        w      = scalar, wage rate
+        cache  = dictionary or None, holds the last factorization
+        info   = dictionary or None, if given the factorizations done and
+                 reused are added to info['factorizations'] and
+                 info['reused'] (see stats_funcs.py)
+
+    Functions called:
+        ff.get_k_demand
+
+    Objects in function:
+        key    = tuple, prices the factorization is for
+        kx     = [M,] vector, capital per unit of output
+        mat    = [M,M] array, I - xi'*diag(delta*kx)
+        lu_piv = tuple, LU factorization of mat from scipy.linalg
+        cond   = scalar, 1-norm condition number of mat
+
+    Returns: lu_piv, kx, cond
+    '''
+    delta, xi = mp.delta, mp.xi
+    M = mp.M
+    key = (tuple(np.asarray(p_k, dtype=float)), float(r), float(w))
+    if (cache is not None and cache.get('params') is mp and
+            cache.get('key') == key):
+        if info is not None:
+            info['reused'] = info.get('reused', 0) + 1
+        return cache['lu_piv'], cache['kx'], cache['cond']
+    kx = ff.get_k_demand(mp, p_k, w, r, 1.0)
+    mat = np.eye(M) - xi.T*(delta*kx)
+    lu_piv = la.lu_factor(mat)
+    cond = np.linalg.cond(mat, 1)
+    if info is not None:
+        info['factorizations'] = info.get('factorizations', 0) + 1
+    if cache is not None:
+        cache.update(params=mp, key=key, lu_piv=lu_piv, kx=kx, cond=cond)
+
+    return lu_piv, kx, cond
+
+
+def solve_output(mp, p_k, r, w, X_c, cache=None, info=None):
+    '''
+    Solves for the output of each industry given consumption demand for
+    the output of each industry.
+
+    Inputs:
+        mp     = ModelParams, model parameters
+        p_k    = [M,] vector, price of capital goods
+        r      = scalar, interest rate
+        w      = scalar, wage rate
+        X_c    = [M,] vector or [M,N] array, demand for output from
+                 consumption
+        cache  = dictionary or None, passed to factor_output
+        info   = dictionary or None, passed to factor_output
+
+    Functions called:
+        factor_output
+
+    Objects in function:
+        lu_piv = tuple, LU factorization of the output demand system
+        kx     = [M,] vector, capital per unit of output
+        cond   = scalar, condition number of the output demand system
+
+    Returns: X, cond
+    '''
+    lu_piv, kx, cond = factor_output(mp, p_k, r, w, cache, info)
+    X = la.lu_solve(lu_piv, np.asarray(X_c, dtype=float))
+
+    return X, cond
+
+
+def solve_output_path(mp, p_k, r, w, X_c, X_T, cache=None, info=None):
+    '''
+    Solves for the output of each industry in every period of a time
+    path given the path of demand for output from consumption, by
+    backward recursion from output in period T.  With K_t = kx_t*X_t the
+    resource constraint of period t,
+
+        X_t = X^c_t + xi'*(K_{t+1} - (1-delta)*K_t),
+
+    is the linear system
+
+        (I + xi'*diag((1-delta)*kx_t))*X_t = X^c_t + xi'*(kx_{t+1}*X_{t+1})
+
+    in X_t given X_{t+1}.  The matrix of each period is LU factorized
+    once.  Periods with exactly the same prices (e.g. periods at the
+    steady state, or periods an outer solver did not change) share a
+    factorization, and with a cache the factorizations are kept for the
+    next call with the same ModelParams.  Prices are not rounded, so
+    periods merely near the steady state are factorized again.
+
+    Inputs:
+        mp     = ModelParams, model parameters
+        p_k    = [T+1,M] array, path of prices of capital goods
+        r      = [T+1,] vector, path of the interest rate
+        w      = [T+1,] vector, path of the wage rate
+        X_c    = [T,M] array, path of demand for output from consumption
+        X_T    = [M,] vector, output in period T
+        cache  = dictionary or None, holds the factorizations by prices
+                 under keys of its own ('path_params', 'factors'), so it
+                 can be shared with factor_output
+        info   = dictionary or None, if given the factorizations done and
+                 reused are added to info['factorizations'] and
+                 info['reused'] (see stats_funcs.py)
+
+    Functions called:
+        ff.get_k_demand
+
+    Objects in function:
+        kx      = [T+1,M] array, capital per unit of output
+        factors = dictionary, LU factorizations by prices
+        key     = tuple, prices of period t
+        X       = [T,M] array, output
+
+    Returns: X, kx ([T,M] array)
+    '''
+    delta, xi = mp.delta, mp.xi
+    T, M = np.shape(X_c)
+    kx = ff.get_k_demand(mp, p_k, w[:, np.newaxis], r[:, np.newaxis], 1.0)
+    if cache is None:
+        cache = {}
+    if (cache.get('path_params') is not mp or
+            len(cache.get('factors', ())) > MAX_FACTORS):
+        cache.update(path_params=mp, factors={})
+    factors = cache['factors']
+    n_factors, n_reused = 0, 0
+    X = np.empty((T, M))
+    X_next = np.asarray(X_T, dtype=float)
+    for t in range(T-1, -1, -1):
+        key = (tuple(p_k[t]), float(r[t]), float(w[t]))
+        if key in factors:
+            n_reused += 1
+        else:
+            factors[key] = la.lu_factor(np.eye(M) + xi.T*((1-delta)*kx[t]))
+            n_factors += 1
+        X[t] = la.lu_solve(factors[key], X_c[t] + np.dot(xi.T, kx[t+1]*X_next))
+        X_next = X[t]
+    if info is not None:
+        info['factorizations'] = info.get('factorizations', 0) + n_factors
+        info['reused'] = info.get('reused', 0) + n_reused
+
+    return X, kx[:T]
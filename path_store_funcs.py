@@ -0,0 +1,244 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for an on-disk store of the large arrays
+of a time path (see tpi_funcs.py), so a long path with many ages, types
+and goods can be solved without holding them in memory, and a finished
+path can be opened again for post-processing without solving it again.
+
+Each path array is a memory-mapped .npy file in the store directory:
+
+    k   = [T,S,J] savings (b in SS_TPI_algo.tex)
+    n   = [T,S,J] labor supply
+    c   = [T,S,J] composite consumption
+    c_i = [T,I,S,J] consumption of each good
+    X   = [T,M] output
+    K_d = [T,M] demand for capital (K)
+    L_d = [T,M] demand for labor (L)
+
+The time path writes them in chunks of periods (get_chunks), and the
+aggregates are sums over views of the mapped chunks, so only one chunk
+of c_i is ever in memory.  When the solve is done, the smaller paths
+and solve results go to summary.npz, and meta.json records the model
+key and dimensions and whether the path was finished.
+load_path_store() maps the arrays read only, which costs no reads until
+they are used.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import os
+import json
+import numpy as np
+
+# Names of the memory-mapped path arrays
+PATH_NAMES = ('k', 'n', 'c', 'c_i', 'X', 'K_d', 'L_d')
+# Largest size in bytes of one chunk of c_i
+CHUNK_BYTES = 2**24
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_path_shapes(mp, T):
+    '''
+    Generates the shapes of the path arrays.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        T  = integer, number of periods
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: shapes (dictionary, shape of each array in PATH_NAMES)
+    '''
+    S, J, I, M = mp.S, mp.J, mp.I, mp.M
+    shapes = dict(k=(T, S, J), n=(T, S, J), c=(T, S, J), c_i=(T, I, S, J),
+                  X=(T, M), K_d=(T, M), L_d=(T, M))
+
+    return shapes
+
+
+def get_chunks(T, chunk):
+    '''
+    Generates the ranges of periods of the chunks of a path.
+
+    Inputs:
+        T     = integer, number of periods
+        chunk = integer >= 1, periods per chunk
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: chunks (list of (t0, t1) tuples)
+    '''
+    chunks = [(t0, min(t0 + chunk, T)) for t0 in range(0, T, chunk)]
+
+    return chunks
+
+
+def write_meta(store_dir, meta):
+    '''
+    Writes the description of a store to meta.json, under a temporary
+    name first so a reader never sees half a file.
+
+    Inputs:
+        store_dir = string, path of the store directory
+        meta      = dictionary, description of the store
+
+    Functions called: None
+
+    Objects in function:
+        filename = string, path of meta.json
+
+    Returns: None
+    '''
+    filename = os.path.join(store_dir, 'meta.json')
+    tmp_name = '%s.%d.tmp' % (filename, os.getpid())
+    with open(tmp_name, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.rename(tmp_name, filename)
+
+
+def open_path_store(store_dir, mp, T, chunk=None):
+    '''
+    Creates the memory-mapped path arrays of a new store, replacing any
+    path stored there before.  The summary of an earlier path is
+    removed, so it can never be read with the new arrays.
+
+    Inputs:
+        store_dir = string, path of the store directory
+        mp        = ModelParams, model parameters
+        T         = integer, number of periods
+        chunk     = integer >= 1 or None, periods per chunk, as many as
+                    fit a chunk of c_i in CHUNK_BYTES if None
+
+    Functions called:
+        get_path_shapes
+        write_meta
+
+    Objects in function:
+        shapes   = dictionary, shape of each array
+        filename = string, path of summary.npz
+        arrays   = dictionary, memory-mapped arrays
+
+    Returns: store (dictionary, dir, T, chunk, arrays and meta)
+    '''
+    if not os.path.isdir(store_dir):
+        os.makedirs(store_dir)
+    if chunk is None:
+        chunk = min(T, max(1, CHUNK_BYTES//(8*mp.I*mp.S*mp.J)))
+    shapes = get_path_shapes(mp, T)
+    meta = dict(key=mp.key, T=T, S=mp.S, J=mp.J, I=mp.I, M=mp.M,
+                chunk=chunk, names=list(PATH_NAMES), finished=False)
+    write_meta(store_dir, meta)
+    filename = os.path.join(store_dir, 'summary.npz')
+    if os.path.exists(filename):
+        os.remove(filename)
+    arrays = {}
+    for name in PATH_NAMES:
+        arrays[name] = np.lib.format.open_memmap(
+            os.path.join(store_dir, name + '.npy'), mode='w+',
+            dtype=np.float64, shape=shapes[name])
+    store = dict(dir=store_dir, T=T, chunk=chunk, arrays=arrays, meta=meta)
+
+    return store
+
+
+def write_path(store, name, x):
+    '''
+    Writes a path to a store array chunk by chunk.
+
+    Inputs:
+        store = dictionary, path store (see open_path_store)
+        name  = string, one of PATH_NAMES
+        x     = [T,...] array, path
+
+    Functions called:
+        get_chunks
+
+    Objects in function:
+        out = [T,...] memory-mapped array
+
+    Returns: out
+    '''
+    out = store['arrays'][name]
+    for t0, t1 in get_chunks(store['T'], store['chunk']):
+        out[t0:t1] = x[t0:t1]
+
+    return out
+
+
+def close_path_store(store, summary=None):
+    '''
+    Flushes the path arrays to disk, saves the other results of the
+    solve to summary.npz and marks the path as finished.
+
+    Inputs:
+        store   = dictionary, path store (see open_path_store)
+        summary = dictionary or None, arrays and scalars to save with
+                  the path (e.g. r, w, T_H and the market clearing
+                  errors)
+
+    Functions called:
+        write_meta
+
+    Objects in function:
+        filename = string, path of summary.npz
+
+    Returns: None
+    '''
+    for name in PATH_NAMES:
+        store['arrays'][name].flush()
+    if summary is not None:
+        filename = os.path.join(store['dir'], 'summary.npz')
+        tmp_name = '%s.%d.tmp.npz' % (filename, os.getpid())
+        np.savez(tmp_name, **summary)
+        os.rename(tmp_name, filename)
+    store['meta']['finished'] = True
+    write_meta(store['dir'], store['meta'])
+
+
+def load_path_store(store_dir, mode='r'):
+    '''
+    Opens a stored path: the path arrays are memory-mapped, the summary
+    is read.  Raises ValueError if the path was not finished (see
+    close_path_store), e.g. if the solve stopped part way.
+
+    Inputs:
+        store_dir = string, path of the store directory
+        mode      = string, 'r' (read only) or 'r+' (read and write),
+                    see numpy.load
+
+    Functions called: None
+
+    Objects in function:
+        meta = dictionary, description of the store (see
+               open_path_store)
+
+    Returns: path (dictionary, the arrays of PATH_NAMES, the contents of
+             summary.npz if any, and meta)
+    '''
+    with open(os.path.join(store_dir, 'meta.json')) as f:
+        meta = json.load(f)
+    if not meta['finished']:
+        raise ValueError('the path in %s was not finished' % store_dir)
+    path = {}
+    filename = os.path.join(store_dir, 'summary.npz')
+    if os.path.exists(filename):
+        with np.load(filename) as summary:
+            for name in summary.files:
+                value = summary[name]
+                path[name] = value[()] if value.ndim == 0 else value
+    for name in meta['names']:
+        path[name] = np.load(os.path.join(store_dir, name + '.npy'),
+                             mmap_mode=mode)
+    path['meta'] = meta
+
+    return path
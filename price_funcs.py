@@ -0,0 +1,222 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving for the prices of output from
+the zero profit conditions of the dynamic firms (as in
+SS_v3pt2_mktclear.py) using Newton's method with the closed form
+Jacobian of the zero profit conditions.
+
+All functions accept either a single (r, w, Z) point or a batch of N
+points, so several price solves can be done in one call.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_p_coeffs(params, r, w, Z):
+    '''
+    Generates the coefficients of the zero profit conditions.  With
+    p_k = xi*p, the zero profit condition for firm m can be written as:
+
+        p_m = w*a_l_m*p_m**eps_m + b_m*a_k_m*(p_m**eps_m)*(p_k_m**(1-eps_m))
+
+    where a_l = EL/X divided by p**eps, a_k = K/X divided by
+    (p/p_k)**eps and b is the user cost of capital per dollar of p_k.
+    None of a_l, a_k or b depend on p.
+
+    Inputs:
+        params = length 9 tuple, (A, gamma, epsilon, delta, delta_tau,
+                 tau_b, tau_d, tau_g, xi)
+        r      = scalar or [N,] vector, interest rate(s)
+        w      = scalar or [N,] vector, wage rate(s)
+        Z      = [M,] or [N,M] array, depreciation deductions per dollar
+                 of capital
+
+    Functions called: None
+
+    Objects in function:
+        R   = [...,1] array, r/(1-tau_g)
+        c_q = [...,M] array, marginal q per dollar of p_k
+        a_l = [...,M] array, labor coefficient
+        a_k = [...,M] array, capital coefficient
+        b   = [...,M] array, user cost of capital coefficient
+
+    Returns: a_l, a_k, b
+    '''
+    A, gamma, epsilon, delta, delta_tau, tau_b, tau_d, tau_g, xi = params
+    r = np.asarray(r, dtype=float)[..., np.newaxis]
+    w = np.asarray(w, dtype=float)[..., np.newaxis]
+    R = r/(1-tau_g)
+    c_q = (((1-tau_d)/(1-tau_g))*(1-(tau_b*delta_tau)-(tau_b*delta_tau*(1-delta_tau)*((R+delta_tau)**(-1.0)))))
+    c_k = ((1-tau_d)/(1-tau_g))*(1-tau_b)
+    a_l = (1-gamma)*(A**(epsilon-1))*(w**(-epsilon))
+    a_k = gamma*(A**(epsilon-1))*((c_k/c_q)**epsilon)*((R+delta)**(-epsilon))
+    b = (r*(c_q+((1-delta_tau)*(delta/delta_tau)*Z)))/((1-tau_d)*(1-tau_b)) + delta
+
+    return a_l, a_k, b
+
+
+def get_p_errors(params, p, r, w, Z):
+    '''
+    Generates the errors in the zero profit conditions.  These are the
+    same errors as get_p() in SS_v3pt2_mktclear.py, but evaluated for
+    any number of points at once.
+
+    Inputs:
+        params = length 9 tuple, (A, gamma, epsilon, delta, delta_tau,
+                 tau_b, tau_d, tau_g, xi)
+        p      = [M,] or [N,M] array, prices of output
+        r      = scalar or [N,] vector, interest rate(s)
+        w      = scalar or [N,] vector, wage rate(s)
+        Z      = [M,] or [N,M] array, depreciation deductions per dollar
+                 of capital
+
+    Functions called:
+        get_p_coeffs
+
+    Objects in function:
+        p_k   = [...,M] array, price of capital goods
+        error = [...,M] array, zero profit errors
+
+    Returns: error
+    '''
+    epsilon = params[2]
+    xi = params[8]
+    a_l, a_k, b = get_p_coeffs(params, r, w, Z)
+    w = np.asarray(w, dtype=float)[..., np.newaxis]
+    p_k = np.dot(p, xi.T)
+    error = p - (w*a_l*(p**epsilon)) - (b*a_k*(p**epsilon)*(p_k**(1-epsilon)))
+
+    return error
+
+
+def get_p_jac(params, p, r, w, Z):
+    '''
+    Generates the Jacobian of the zero profit errors with respect to p.
+    The coupling through p_k = xi*p enters as diag(d_pk)*xi.
+
+    Inputs:
+        params = length 9 tuple, (A, gamma, epsilon, delta, delta_tau,
+                 tau_b, tau_d, tau_g, xi)
+        p      = [M,] or [N,M] array, prices of output
+        r      = scalar or [N,] vector, interest rate(s)
+        w      = scalar or [N,] vector, wage rate(s)
+        Z      = [M,] or [N,M] array, depreciation deductions per dollar
+                 of capital
+
+    Functions called:
+        get_p_coeffs
+
+    Objects in function:
+        p_k  = [...,M] array, price of capital goods
+        d_p  = [...,M] array, derivative of errors wrt own price
+        d_pk = [...,M] array, derivative of errors wrt own p_k
+        jac  = [...,M,M] array, Jacobian, jac[...,m,i] = d error_m/d p_i
+
+    Returns: jac
+    '''
+    epsilon = params[2]
+    xi = params[8]
+    M = xi.shape[0]
+    a_l, a_k, b = get_p_coeffs(params, r, w, Z)
+    w = np.asarray(w, dtype=float)[..., np.newaxis]
+    p_k = np.dot(p, xi.T)
+    d_p = 1 - epsilon*(p**(epsilon-1))*((w*a_l) + (b*a_k*(p_k**(1-epsilon))))
+    d_pk = -(1-epsilon)*b*a_k*(p**epsilon)*(p_k**(-epsilon))
+    jac = d_pk[..., np.newaxis]*xi
+    jac[..., np.arange(M), np.arange(M)] += d_p
+
+    return jac
+
+
+def solve_p(params, r, w, Z, p_guess=None, tol=1e-12, maxiter=100, info=None):
+    '''
+    Solves the zero profit conditions for the prices of output using
+    Newton's method with the analytic Jacobian.  Steps are halved until
+    prices stay positive and the error norm falls, so no penalty values
+    are needed.  Points that have converged are held fixed while the
+    rest of the batch keeps iterating.
+
+    Inputs:
+        params  = length 9 tuple, (A, gamma, epsilon, delta, delta_tau,
+                  tau_b, tau_d, tau_g, xi)
+        r       = scalar or [N,] vector, interest rate(s)
+        w       = scalar or [N,] vector, wage rate(s)
+        Z       = [M,] or [N,M] array, depreciation deductions per
+                  dollar of capital
+        p_guess = [M,] or [N,M] array, initial guess for prices, ones if
+                  None
+        tol     = scalar > 0, convergence tolerance on the max abs error
+        maxiter = integer >= 1, maximum number of Newton iterations
+        info    = dictionary or None, if given the Newton iterations and
+                  error evaluations are added to info['iterations'] and
+                  info['evals'] (see stats_funcs.py)
+
+    Functions called:
+        get_p_errors
+        get_p_jac
+
+    Objects in function:
+        shape  = tuple, shape of the price array returned
+        active = [N,] boolean vector, =True if point not yet converged
+        step   = [N,M] array, Newton step
+        lam    = [N,1] array, step length for each point
+
+    Returns: p, converged
+    '''
+    xi = params[8]
+    M = xi.shape[0]
+    r = np.asarray(r, dtype=float)
+    w = np.asarray(w, dtype=float)
+    Z = np.asarray(Z, dtype=float)
+    shape = np.broadcast(r[..., np.newaxis], w[..., np.newaxis], Z).shape
+    if p_guess is None:
+        p_guess = np.ones(shape)
+    r = np.broadcast_to(r[..., np.newaxis], shape).reshape(-1, M)[:, 0]
+    w = np.broadcast_to(w[..., np.newaxis], shape).reshape(-1, M)[:, 0]
+    Z = np.broadcast_to(Z, shape).reshape(-1, M)
+    p = np.array(np.broadcast_to(p_guess, shape), dtype=float).reshape(-1, M)
+
+    error = get_p_errors(params, p, r, w, Z)
+    norm = np.absolute(error).max(1)
+    active = norm > tol
+    it = 0
+    n_evals = 1
+    while active.any() and it < maxiter:
+        ra, wa, Za, pa = r[active], w[active], Z[active], p[active]
+        jac = get_p_jac(params, pa, ra, wa, Za)
+        step = -np.linalg.solve(jac, error[active][..., np.newaxis])[..., 0]
+        lam = np.ones((pa.shape[0], 1))
+        p_new = pa + lam*step
+        error_new = get_p_errors(params, np.absolute(p_new), ra, wa, Za)
+        n_evals += 1
+        bad = (p_new <= 0).any(1) | ~(np.absolute(error_new).max(1) < norm[active])
+        halvings = 0
+        while bad.any() and halvings < 40:
+            lam[bad] *= 0.5
+            p_new[bad] = pa[bad] + lam[bad]*step[bad]
+            error_new[bad] = get_p_errors(params, np.absolute(p_new[bad]),
+                                          ra[bad], wa[bad], Za[bad])
+            bad[bad] = ((p_new[bad] <= 0).any(1) |
+                        ~(np.absolute(error_new[bad]).max(1) < norm[active][bad]))
+            halvings += 1
+            n_evals += 1
+        p[active] = p_new
+        error[active] = error_new
+        norm = np.absolute(error).max(1)
+        active = norm > tol
+        it += 1
+
+    converged = ~active
+    if info is not None:
+        info['iterations'] = info.get('iterations', 0) + it
+        info['evals'] = info.get('evals', 0) + n_evals
+    return p.reshape(shape), converged.reshape(shape[:-1])
@@ -0,0 +1,560 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the steady state of the
+multi-industry model with taxes (as in SS_v3pt2_mktclear.py) for a given
+ModelParams (see model_params.py), without printing.
+
+Given guesses for the interest rate, wage rate and transfers, the
+household problems, prices, output and factor demands are solved and
+the asset market, labor market and government budget errors returned.
+The steady state is the root of these three errors.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import numpy as np
+import scipy.optimize as opt
+import price_funcs as pf
+import hh_solve_funcs as hf
+import hh_egm_funcs as he
+import hh_shoot_funcs as hs
+import output_funcs as of
+import firm_funcs_v3 as ff
+import agg_funcs_v3 as af
+import memo_funcs as mo
+import broyden_funcs as br
+import stats_funcs as st
+import diag_funcs as dg
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_prices(mp, r, w, p_guess=None, info=None):
+    '''
+    Generates prices of output, consumption goods and capital goods,
+    normalized so the price of output of industry 1 is one.
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        r       = scalar, interest rate
+        w       = scalar, wage rate
+        p_guess = [M,] vector or None, guess for the prices of output
+                  before normalizing, ones if None
+        info    = dictionary or None, passed to pf.solve_p
+
+    Functions called:
+        ff.get_Z
+        pf.solve_p
+        ff.get_p_c
+        ff.get_p_tilde
+
+    Objects in function:
+        Z           = [M,] vector, PV of depreciation deductions
+        p_raw       = [M,] vector, prices of industry output before
+                      normalizing
+        p           = [M,] vector, prices of industry output
+        p_converged = boolean, =True if the price solve converged
+        p_c         = [I,] vector, prices of consumption goods
+        p_tilde     = scalar, price of composite consumption good
+        p_k         = [M,] vector, prices of capital goods
+
+    Returns: p, p_c, p_tilde, p_k, p_converged, p_raw
+    '''
+    Z = ff.get_Z(mp, r)
+    if p_guess is None:
+        p_guess = np.ones(mp.M)
+    p_raw, p_converged = pf.solve_p(mp.p_params, r, w, Z, p_guess, info=info)
+    p = p_raw/p_raw[0]
+    p_c = ff.get_p_c(mp, p)
+    p_tilde = ff.get_p_tilde(mp, p_c)
+    p_k = np.dot(mp.xi, p)
+
+    return p, p_c, p_tilde, p_k, p_converged, p_raw
+
+
+def solve_hh_all(mp, k_guess, n_guess, r, w, p_c, p_tilde, T_H,
+                 hh_method='shoot', c_1_guess=None, info=None):
+    '''
+    Solves the household problems of all J types.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        k_guess   = [S,J] array, guess for savings (used by 'newton')
+        n_guess   = [S,J] array, guess for labor supply (used by
+                    'newton')
+        r         = scalar, interest rate
+        w         = scalar, wage rate
+        p_c       = [I,] vector, prices of consumption goods
+        p_tilde   = scalar, price of composite consumption good
+        T_H       = scalar, total government transfers
+        hh_method = string, 'shoot', 'egm' or 'newton'
+        c_1_guess = [J,] vector or None, guess for consumption in the
+                    first period of life (used by 'shoot')
+        info      = dictionary or None, passed to hs.solve_hh_shoot
+
+    Functions called:
+        hs.solve_hh_shoot
+        he.solve_hh_egm
+        hf.solve_hh_batch
+
+    Objects in function: None
+
+    Returns: k, n, hh_converged
+    '''
+    if hh_method == 'shoot':
+        k, n, hh_converged = hs.solve_hh_shoot(mp.hh_params, r, w, p_c, p_tilde, T_H,
+                                               c_1_guess=c_1_guess, info=info)
+    elif hh_method == 'egm':
+        k, n, hh_converged = he.solve_hh_egm(mp.hh_params, r, w, p_c, p_tilde, T_H)
+    else:
+        k, n, hh_converged = hf.solve_hh_batch(mp.hh_params, k_guess, n_guess, r, w, p_c, p_tilde, T_H)
+
+    return k, n, hh_converged
+
+
+def get_mkt_parts(mp, r, w, T_H, p_raw, k, n, cache=None, stats=None,
+                  diag=None):
+    '''
+    Generates the steady state equilibrium objects and market clearing
+    errors implied by guesses for the interest rate, wage rate and
+    transfers, given the solutions of the price and household problems
+    at those guesses.  Nothing is solved iteratively here.
+
+    Inputs:
+        mp    = ModelParams, model parameters
+        r     = scalar, interest rate
+        w     = scalar, wage rate
+        T_H   = scalar, total government transfers
+        p_raw = [M,] vector, prices of output before normalizing
+        k     = [S,J] array, savings
+        n     = [S,J] array, labor supply
+        cache = dictionary or None, passed to of.solve_output
+        stats = OrderedDict or None, stage statistics (see
+                stats_funcs.py), gets the output, factor demand and
+                market clearing stages
+        diag  = dictionary or None, diagnostics channel (see
+                diag_funcs.py), at TRACE the firm values and interest
+                rates are checked against dividends and the firms' FOC
+
+    Functions called:
+        st.timed
+        dg.enabled
+        dg.say
+        ff.get_p_c
+        ff.get_p_tilde
+        hf.get_hh_parts
+        af.get_c_i
+        af.get_C
+        af.get_X_c
+        of.solve_output
+        af.get_K
+        af.get_L
+        ff.get_k_demand
+        ff.get_l_demand
+        ff.get_firm_taxes
+        ff.get_q
+        ff.get_Z
+        ff.get_r
+
+    Objects in function:
+        parts  = dictionary, equilibrium objects
+        errors = [3,] vector, asset market, labor market and government
+                 budget errors
+        DIV    = [M,] vector, firm dividends (checks only)
+        V_alt  = [M,] vector, value of firms as PV of dividends (checks
+                 only)
+        r_firm = [M,] vector, interest rate implied by the firms' FOC
+                 for capital (checks only)
+
+    Returns: parts
+    '''
+    p = p_raw/p_raw[0]
+    p_c = ff.get_p_c(mp, p)
+    p_tilde = ff.get_p_tilde(mp, p_c)
+    p_k = np.dot(mp.xi, p)
+    with st.timed(stats, 'output') as info:
+        c = hf.get_hh_parts(mp.hh_params, k, n, r, w, p_c, p_tilde, T_H,
+                            np.arange(mp.J))[2]
+        C = af.get_C(mp, af.get_c_i(mp, c, p_c, p_tilde))
+        X, X_cond = of.solve_output(mp, p_k, r, w,
+                                    af.get_X_c(mp, C), cache, info)
+    with st.timed(stats, 'factor_demand'):
+        K_d = ff.get_k_demand(mp, p_k, w, r, X)
+        L_d = ff.get_l_demand(mp, p_k, w, r, K_d)
+    with st.timed(stats, 'mkt_clear'):
+        K_s, K_constr = af.get_K(mp, k)
+        L_s = af.get_L(mp, n)
+        firm_taxes = ff.get_firm_taxes(mp, p, p_k, w, X, K_d, L_d)
+        K_tau = (1-mp.delta_tau)*(mp.delta/mp.delta_tau)*p_k*K_d
+        q = ff.get_q(mp, p_k, r)
+        V = (q*K_d) + (K_tau*ff.get_Z(mp, r))
+        errors = np.array([K_s - V.sum(), L_s - L_d.sum(),
+                           T_H - firm_taxes.sum()])
+        # punish violations
+        if r <= 0 or r > 1:
+            errors[0] += 1e9
+        if w <= 0:
+            errors[1] += 1e9
+    if dg.enabled(diag, dg.TRACE):
+        with st.timed(stats, 'checks'):
+            DIV = (1-mp.tau_b)*(p*X - w*L_d - mp.delta*p_k*K_d)
+            V_alt = ((1-mp.tau_d)*DIV)/r
+            dg.say(diag, dg.TRACE, 'check V:', V.sum()-V_alt.sum())
+            dg.say(diag, dg.TRACE, 'check V all:', V-V_alt)
+            dg.say(diag, dg.TRACE, 'check V all 2nd way:', V/V_alt)
+            dg.say(diag, dg.TRACE, 'check V 2nd way:', V.sum()/V_alt.sum())
+            # Checking that interest rates are common across firms
+            r_firm = ff.get_r(mp, q, K_d, X, p)
+            dg.say(diag, dg.TRACE, 'check int rates another way: ', r - r_firm)
+            dg.say(diag, dg.TRACE, 'check int rates another way v2: ', r/r_firm)
+            dg.say(diag, dg.TRACE, 'check int rates another way v3: ', r_firm/r)
+            dg.say(diag, dg.TRACE, 'check int rates another way v4:',
+                   r - ((1-mp.tau_d)*DIV/V))
+            dg.say(diag, dg.TRACE, 'check int rates another way v5:', r - (DIV/V))
+            dg.say(diag, dg.TRACE, 'check int rates another way v6:',
+                   r_firm - ((1-mp.tau_d)*DIV/V))
+            dg.say(diag, dg.TRACE, 'check int rates another way v7:',
+                   r_firm - (DIV/V))
+    parts = dict(r=r, w=w, T_H=T_H, p=p, p_c=p_c, p_tilde=p_tilde, p_k=p_k,
+                 p_raw=p_raw, k=k, n=n, c=c, C=C, X=X, K_s=K_s, L_s=L_s,
+                 K_d=K_d, L_d=L_d, V=V, errors=errors)
+
+    return parts
+
+
+def get_ss_parts(mp, r, w, T_H, k_guess, n_guess, hh_method='shoot',
+                 cache=None, memo=None, stats=None, diag=None):
+    '''
+    Generates the steady state equilibrium objects implied by guesses
+    for the interest rate, wage rate and transfers.  With a memo, the
+    objects at a point already solved are not solved again, and the
+    price and household solves start from the solution at the nearest
+    point solved.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        r         = scalar, interest rate
+        w         = scalar, wage rate
+        T_H       = scalar, total government transfers
+        k_guess   = [S,J] array, guess for savings
+        n_guess   = [S,J] array, guess for labor supply
+        hh_method = string, household solver, see solve_hh_all
+        cache     = dictionary or None, passed to of.solve_output
+        memo      = dictionary or None, memo of inner solutions (see
+                    memo_funcs.get_memo)
+        stats     = OrderedDict or None, stage statistics (see
+                    stats_funcs.py)
+        diag      = dictionary or None, passed to get_mkt_parts
+
+    Functions called:
+        mo.memo_lookup
+        mo.memo_store
+        st.timed
+        get_prices
+        solve_hh_all
+        get_mkt_parts
+
+    Objects in function:
+        parts = dictionary, equilibrium objects (see get_mkt_parts) and
+                whether the inner solves converged
+
+    Returns: parts
+    '''
+    p_guess, c_1_guess = None, None
+    if memo is not None:
+        entry, seed = mo.memo_lookup(memo, [r, w, T_H], mp.key)
+        if entry is not None:
+            return entry['parts']
+        if seed is not None:
+            p_guess, c_1_guess = seed['parts']['p_raw'], seed['parts']['c'][0]
+            k_guess, n_guess = seed['parts']['k'], seed['parts']['n']
+    with st.timed(stats, 'price') as info:
+        p, p_c, p_tilde, p_k, p_converged, p_raw = get_prices(mp, r, w,
+                                                              p_guess, info)
+    with st.timed(stats, 'household') as info:
+        k, n, hh_converged = solve_hh_all(mp, k_guess, n_guess, r, w, p_c,
+                                          p_tilde, T_H, hh_method, c_1_guess,
+                                          info)
+    parts = get_mkt_parts(mp, r, w, T_H, p_raw, k, n, cache, stats, diag)
+    parts['converged'] = p_converged and hh_converged.all()
+    if memo is not None:
+        mo.memo_store(memo, [r, w, T_H], dict(parts=parts), mp.key)
+
+    return parts
+
+
+def get_ss_errors(guesses, mp, k_guess, n_guess, hh_method='shoot',
+                  cache=None, memo=None, stats=None, diag=None):
+    '''
+    Generates the steady state errors for guesses of the interest rate,
+    wage rate and transfers.
+
+    Inputs:
+        guesses   = [3,] vector, (r, w, T_H)
+        mp        = ModelParams, model parameters
+        k_guess   = [S,J] array, guess for savings
+        n_guess   = [S,J] array, guess for labor supply
+        hh_method = string, household solver, see solve_hh_all
+        cache     = dictionary or None, passed to of.solve_output
+        memo      = dictionary or None, memo of inner solutions
+        stats     = OrderedDict or None, stage statistics, the calls of
+                    the 'ss_errors' stage count the error evaluations
+        diag      = dictionary or None, diagnostics channel, the errors
+                    are written at DEBUG, the checks of get_mkt_parts at
+                    TRACE
+
+    Functions called:
+        st.timed
+        get_ss_parts
+        dg.say
+
+    Objects in function: None
+
+    Returns: errors ([3,] vector)
+    '''
+    r, w, T_H = guesses
+    with st.timed(stats, 'ss_errors'):
+        errors = get_ss_parts(mp, r, w, T_H, k_guess, n_guess, hh_method,
+                              cache, memo, stats, diag)['errors']
+    dg.say(diag, dg.DEBUG, 'Market clearing errors: ', errors)
+
+    return errors
+
+
+def get_ss_jac(mp, r, w, T_H, p_raw, k, n, rel_step=1e-6):
+    '''
+    Generates the Jacobian of the market clearing errors with respect to
+    (r, w, T_H) by the implicit function theorem, given the solutions of
+    the price and household problems at (r, w, T_H).
+
+    The price and household solutions move with the guesses as
+
+        dp/dx = -(dF_p/dp)^-1 * dF_p/dx
+        dz_j/dx = -(dF_hh/dz_j)^-1 * dF_hh/dx    for each type j
+
+    where F_p are the zero profit errors, F_hh the household FOC errors
+    and z_j = (k_j, n_j).  The Jacobians with respect to p and z_j are
+    the analytic ones used by the inner solvers.  The derivatives with
+    respect to x, and of the market clearing errors along each direction
+    (dx, dp, dz), are central differences of functions that solve
+    nothing, so no inner problem is solved again.
+
+    Inputs:
+        mp       = ModelParams, model parameters
+        r        = scalar, interest rate
+        w        = scalar, wage rate
+        T_H      = scalar, total government transfers
+        p_raw    = [M,] vector, solution for prices before normalizing
+        k        = [S,J] array, solution for savings
+        n        = [S,J] array, solution for labor supply
+        rel_step = scalar > 0, relative step of the central differences
+
+    Functions called:
+        ff.get_Z
+        pf.get_p_errors
+        pf.get_p_jac
+        ff.get_p_c
+        ff.get_p_tilde
+        hf.get_hh_errors
+        hf.get_hh_jac
+        get_mkt_parts
+
+    Objects in function:
+        x    = [3,] vector, (r, w, T_H)
+        h    = [3,] vector, difference steps
+        dp   = [M,3] array, derivatives of p_raw
+        dz   = [2S,J,3] array, derivatives of (k, n)
+        jac  = [3,3] array, jac[i,m] = d error_i/d x_m
+
+    Returns: jac
+    '''
+    S, J = mp.S, mp.J
+    x = np.array([r, w, T_H], dtype=float)
+    h = rel_step*np.maximum(np.absolute(x), 1.0)
+    jj = np.arange(J)
+
+    def get_F_p(x, p_raw):
+        return pf.get_p_errors(mp.p_params, p_raw, x[0], x[1],
+                               ff.get_Z(mp, x[0]))
+
+    def get_F_hh(x, p_raw, k, n):
+        p_c = ff.get_p_c(mp, p_raw/p_raw[0])
+        p_tilde = ff.get_p_tilde(mp, p_c)
+        return hf.get_hh_errors(mp.hh_params, k, n, x[0], x[1], p_c,
+                                p_tilde, x[2], jj)
+
+    # prices
+    J_p = pf.get_p_jac(mp.p_params, p_raw, r, w, ff.get_Z(mp, r))
+    dF_p = np.empty((mp.M, 3))
+    for m in range(3):
+        e = np.zeros(3)
+        e[m] = h[m]
+        dF_p[:, m] = (get_F_p(x + e, p_raw) - get_F_p(x - e, p_raw))/(2*h[m])
+    dp = -np.linalg.solve(J_p, dF_p)
+
+    # households, the FOCs of type j only depend on (k_j, n_j)
+    dz = np.empty((2*S, J, 3))
+    dF_hh = np.empty((2*S, J, 3))
+    for m in range(3):
+        e = np.zeros(3)
+        e[m] = h[m]
+        dF_hh[:, :, m] = ((get_F_hh(x + e, p_raw + h[m]*dp[:, m], k, n) -
+                           get_F_hh(x - e, p_raw - h[m]*dp[:, m], k, n)) /
+                          (2*h[m]))
+    p = p_raw/p_raw[0]
+    p_c = ff.get_p_c(mp, p)
+    p_tilde = ff.get_p_tilde(mp, p_c)
+    for j in range(J):
+        J_hh = hf.get_hh_jac(mp.hh_params, k[:, j], n[:, j], r, w, p_c,
+                             p_tilde, T_H, j)
+        dz[:, j, :] = -np.linalg.solve(J_hh, dF_hh[:, j, :])
+
+    # market clearing errors along each direction
+    jac = np.empty((3, 3))
+    for m in range(3):
+        e = np.zeros(3)
+        e[m] = h[m]
+        dk, dn = h[m]*dz[:S, :, m], h[m]*dz[S:, :, m]
+        up = get_mkt_parts(mp, r + e[0], w + e[1], T_H + e[2],
+                           p_raw + h[m]*dp[:, m], k + dk, n + dn)['errors']
+        down = get_mkt_parts(mp, r - e[0], w - e[1], T_H - e[2],
+                             p_raw - h[m]*dp[:, m], k - dk, n - dn)['errors']
+        jac[:, m] = (up - down)/(2*h[m])
+
+    return jac
+
+
+def get_ss_errors_jac(guesses, mp, k_guess, n_guess, hh_method='shoot',
+                      cache=None, memo=None, stats=None, diag=None):
+    '''
+    Generates the Jacobian of the steady state errors at guesses of the
+    interest rate, wage rate and transfers, taking the same arguments as
+    get_ss_errors so it can be passed to fsolve as fprime.  With a memo,
+    fsolve's evaluation of the errors at the same point has already
+    solved the inner problems.
+
+    Inputs:
+        guesses   = [3,] vector, (r, w, T_H)
+        mp        = ModelParams, model parameters
+        k_guess   = [S,J] array, guess for savings
+        n_guess   = [S,J] array, guess for labor supply
+        hh_method = string, household solver, see solve_hh_all
+        cache     = dictionary or None, passed to of.solve_output
+        memo      = dictionary or None, memo of inner solutions
+        stats     = OrderedDict or None, stage statistics
+        diag      = dictionary or None, diagnostics channel
+
+    Functions called:
+        st.timed
+        get_ss_parts
+        get_ss_jac
+
+    Objects in function:
+        parts = dictionary, equilibrium objects at guesses
+
+    Returns: jac ([3,3] array)
+    '''
+    r, w, T_H = guesses
+    parts = get_ss_parts(mp, r, w, T_H, k_guess, n_guess, hh_method, cache,
+                         memo, stats, diag)
+    with st.timed(stats, 'jacobian'):
+        jac = get_ss_jac(mp, r, w, T_H, parts['p_raw'], parts['k'],
+                         parts['n'])
+
+    return jac
+
+
+def solve_ss(mp, guesses, k_guess=None, n_guess=None, hh_method='shoot',
+             xtol=1e-12, cache=None, memo=None, jac='ift', method='hybr',
+             jac0=None, stats=None, diag=None):
+    '''
+    Solves for the steady state with a hybrid Powell root finder (fsolve)
+    or Broyden's method on the interest rate, wage rate and transfers.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        guesses   = [3,] vector, guesses for (r, w, T_H)
+        k_guess   = [S,J] array or None, guess for savings
+        n_guess   = [S,J] array or None, guess for labor supply
+        hh_method = string, household solver, see solve_hh_all
+        xtol      = scalar > 0, relative tolerance of the root finder
+        cache     = dictionary or None, passed to of.solve_output
+        memo      = dictionary or None, memo of inner solutions, a new
+                    one if None
+        jac       = string, Jacobian used by fsolve, 'ift' (implicit
+                    function theorem, get_ss_errors_jac) or 'fd' (finite
+                    differences of the errors, each one a full solve);
+                    with Broyden, the one computed when jac0 is None or
+                    stops giving descent steps ('fd' only at the start)
+        method    = string, 'hybr' (fsolve) or 'broyden'
+        jac0      = [3,3] array or None, Jacobian to start Broyden from,
+                    e.g. sol['jac'] of a solve at nearby parameters
+        stats     = OrderedDict or None, stage statistics (see
+                    stats_funcs.py), the outer solver's evaluations are
+                    added to the 'outer' stage
+        diag      = dictionary or None, diagnostics channel (see
+                    get_ss_errors)
+
+    Functions called:
+        mo.get_memo
+        get_ss_errors
+        get_ss_errors_jac
+        br.get_fd_jac
+        br.solve_broyden
+        get_ss_parts
+        st.add_counts
+
+    Objects in function:
+        sol = dictionary, steady state equilibrium objects (see
+              get_ss_parts), the number of error evaluations, n_evals,
+              of Jacobian evaluations, n_jacs, and with Broyden the
+              Jacobian at the solution, jac
+
+    Returns: sol
+    '''
+    if k_guess is None:
+        k_guess = np.ones((mp.S, mp.J))*0.05
+    if n_guess is None:
+        n_guess = np.ones((mp.S, mp.J))*0.3
+    if cache is None:
+        cache = {}
+    if memo is None:
+        memo = mo.get_memo()
+    # fsolve's finite difference steps are relative, keep guesses off zero
+    guesses = np.asarray(guesses, dtype=float)
+    guesses = np.where(np.absolute(guesses) < 1e-6, 1e-6, guesses)
+    fprime = get_ss_errors_jac if jac == 'ift' else None
+    args = (mp, k_guess, n_guess, hh_method, cache, memo, stats, diag)
+    if method == 'broyden':
+        n_jacs = 0
+        if jac0 is None:
+            if fprime is None:
+                jac0 = br.get_fd_jac(get_ss_errors, guesses, args=args)
+            else:
+                jac0 = fprime(guesses, *args)
+            n_jacs += 1
+        x, F, jac_x, nfev, njev, ok = br.solve_broyden(get_ss_errors, guesses,
+                                                       jac0, fprime, xtol,
+                                                       args=args)
+        info = dict(nfev=nfev, njev=n_jacs + njev)
+        ier = 1 if ok else 0
+    else:
+        x, info, ier, mesg = opt.fsolve(get_ss_errors, guesses, args=args,
+                                        fprime=fprime, xtol=xtol,
+                                        full_output=1)
+    sol = dict(get_ss_parts(mp, x[0], x[1], x[2], k_guess, n_guess,
+                            hh_method, cache, memo))
+    sol['converged'] = sol['converged'] and ier == 1
+    sol['n_evals'] = info['nfev']
+    sol['n_jacs'] = info.get('njev', 0)
+    st.add_counts(stats, 'outer', solves=1, evals=sol['n_evals'],
+                  jacs=sol['n_jacs'])
+    if method == 'broyden':
+        sol['jac'] = jac_x
+
+    return sol
@@ -0,0 +1,318 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+Solves the steady state of the multi-industry model with taxes (the
+model of SS_v3pt2_mktclear.py) from the command line or from other
+code.
+
+Unlike the SS_v*.py scripts, importing this file sets up nothing and
+solves nothing, and matplotlib is only imported when graphs are asked
+for, so it can be imported cheaply by process pool workers (see
+sweep_funcs.py) or by other code:
+
+    import ss_main
+    mp = ss_main.get_default_params()
+    sol = ss_main.run_ss(mp)
+
+From the command line:
+
+    python ss_main.py [--hh-method shoot] [--solver hybr|broyden]
+                      [--homotopy] [--store DIR] [--stats FILE]
+                      [--plots DIR] [--set NAME=VALUE ...] [-q]
+
+e.g. python ss_main.py --solver broyden --store OUTPUT/ss_store
+--set tau_b=0.3 solves with a 30% business tax rate in every industry,
+starting from the nearest stored solution and its Jacobian.
+
+This py-file calls the following other file(s):
+            model_params.py
+            ss_funcs.py
+            homotopy_funcs.py
+            warm_start_funcs.py
+            stats_funcs.py
+            diag_funcs.py
+
+This py-file creates the following other file(s):
+            (with --store) DIR/<params key>.pkl
+            (with --stats) FILE
+            (with --plots) DIR/ss_k.pdf, DIR/ss_n.pdf
+------------------------------------------------------------------------
+'''
+# Import Packages
+import os
+import sys
+import ast
+import argparse
+import numpy as np
+import model_params as mpf
+import ss_funcs as ssf
+import homotopy_funcs as hm
+import warm_start_funcs as ws
+import stats_funcs as st
+import diag_funcs as dg
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_default_params():
+    '''
+    Generates the default model parameters, the ones
+    SS_v3pt2_mktclear.py solves.
+
+    Inputs: None
+
+    Functions called:
+        mpf.get_model_params
+
+    Objects in function: see the parameter list in SS_v3pt2_mktclear.py
+
+    Returns: mp (ModelParams)
+    '''
+    sigma = 1.9  # coeff of relative risk aversion for hh
+    beta = 0.98  # discount rate
+    # preference parameter - share of good i in composite consumption,
+    # shape =(I,), shares must sum to 1
+    alpha = np.array([0.29, 0.2, (1-0.2-0.29)])
+    cbar = np.array([0.001, 0.002, 0.000])  # min cons of each of I goods
+    delta = np.array([0.1, 0.1, 0.1, 0.1])  # depreciation rate, shape =(M,)
+    A = 1.0  # Total factor productivity
+    gamma = np.array([0.3, 0.3, 0.3, 0.3])  # capital's share of output
+    # fixed coeff input-output matrix, shape =(M,M)
+    xi = np.array([[0.2, 0.5, 0.2, 0.1], [0.0, 0.2, 0.8, 0.0],
+                   [0.4, 0.2, 0.2, 0.2], [0.3, 0.3, 0.1, 0.3]])
+    # fixed coeff pce-bridge matrix relating output and cons goods,
+    # shape =(I,M)
+    pi = np.array([[0.2, 0.3, 0.3, 0.2], [0.1, 0.8, 0.1, 0.0],
+                   [0.25, 0.25, 0.25, 0.25]])
+    # elasticity of substitution between capital and labor, shape =(M,)
+    epsilon = np.array([0.6, 0.6, 0.6, 0.6])
+    nu = 2.0  # elasticity of labor supply
+    chi_n = 0.5  # utility weight, disutility of labor
+    chi_b = 0.2  # utility weight, warm glow bequest motive
+    ltilde = 1.0  # maximum hours
+    e = [0.5, 1.0, 1.2, 1.7]  # effective labor units for the J types
+    # probability of surviving to next period, shape =(S,)
+    surv_rate = np.array([0.99, 0.98, 0.6, 0.4, 0.0])
+    lambdas = np.array([0.5, 0.2, 0.2, 0.1])  # fraction of each cohort of each type
+    M = len(delta)
+    # Tax parameters
+    tau_b = np.ones(M)*0.25
+    # without adjustment costs, want div tax rate to exceed cap gains
+    # rate or no sol'n to firm prob
+    tau_d = np.ones(M)*0.05
+    tau_g = np.ones(M)*0.0
+    # for now just make tax depreciation rate some scaled version of the
+    # rate of physical depreciation
+    delta_tau = delta*1.2
+    mp = mpf.get_model_params(beta, sigma, nu, chi_n, chi_b, ltilde, e,
+                              lambdas, surv_rate, alpha, cbar, A, gamma,
+                              epsilon, delta, xi, pi, tau_b, tau_d, tau_g,
+                              delta_tau)
+
+    return mp
+
+
+def set_params(mp, settings):
+    '''
+    Generates model parameters with primitive parameters changed by
+    NAME=VALUE strings, where VALUE is a Python literal.  A scalar VALUE
+    for a vector or matrix parameter sets every element.
+
+    Inputs:
+        mp       = ModelParams, model parameters
+        settings = list of strings, NAME=VALUE
+
+    Functions called:
+        mpf.replace_params
+
+    Objects in function:
+        changes = dictionary, new values by parameter name
+
+    Returns: mp (ModelParams)
+    '''
+    changes = {}
+    for setting in settings:
+        name, sep, value = setting.partition('=')
+        name = name.strip()
+        if not sep or name not in mpf.PARAM_FIELDS:
+            raise ValueError('bad parameter setting %r, expected NAME=VALUE '
+                             'with NAME in %s' % (setting, mpf.PARAM_FIELDS))
+        value = np.asarray(ast.literal_eval(value.strip()), dtype=float)
+        old = np.asarray(getattr(mp, name), dtype=float)
+        if value.ndim == 0 and old.ndim > 0:
+            value = np.ones(old.shape)*value
+        changes[name] = value if value.ndim > 0 else float(value)
+
+    return mpf.replace_params(mp, **changes)
+
+
+def run_ss(mp, guesses=(0.97, 1.03, 0.1), hh_method='shoot', method='hybr',
+           use_homotopy=False, store_dir=None, stats=None, diag=None):
+    '''
+    Solves for the steady state, starting from the stored solution for
+    the nearest parameters if there is a store, and saving the solution
+    to it.
+
+    Inputs:
+        mp           = ModelParams, model parameters
+        guesses      = [3,] vector, guesses for (r, w, T_H) if there is
+                       no stored solution
+        hh_method    = string, household solver, see ssf.solve_hh_all
+        method       = string, outer solver, 'hybr' (fsolve) or
+                       'broyden' (see ssf.solve_ss)
+        use_homotopy = boolean, =True to solve by continuation (see
+                       homotopy_funcs.py) when there is no exact stored
+                       solution
+        store_dir    = string or None, directory of stored solutions
+        stats        = OrderedDict or None, stage statistics
+        diag         = dictionary or None, diagnostics channel
+
+    Functions called:
+        ws.load_solution
+        hm.solve_homotopy
+        ssf.solve_ss
+        ws.save_solution
+
+    Objects in function:
+        warm      = dictionary or None, nearest stored solution
+        warm_dist = scalar, distance to its parameters
+        k_guess   = [S,J] array or None, guess for savings
+        n_guess   = [S,J] array or None, guess for labor supply
+        jac0      = [3,3] array or None, stored Jacobian for Broyden
+
+    Returns: sol (see ssf.solve_ss)
+    '''
+    warm, warm_dist = None, np.inf
+    k_guess, n_guess, jac0 = None, None, None
+    if store_dir is not None:
+        warm, warm_dist = ws.load_solution(store_dir, mp)
+    if warm is not None:
+        dg.say(diag, dg.INFO, 'warm start from stored solution', warm['key'],
+               'at distance', warm_dist)
+        guesses = [warm['r'], warm['w'], warm['T_H']]
+        k_guess, n_guess, jac0 = warm['k'], warm['n'], warm.get('jac')
+    if use_homotopy and warm_dist > 0:
+        hom_sol, hom_path = hm.solve_homotopy(mp, guesses, k_guess, n_guess,
+                                              hh_method)
+        dg.say(diag, dg.INFO, 'homotopy path (t, r, w, T_H, evals, '
+               'converged):', hom_path)
+        if hom_sol['converged']:
+            guesses = [hom_sol['r'], hom_sol['w'], hom_sol['T_H']]
+            k_guess, n_guess = hom_sol['k'], hom_sol['n']
+    sol = ssf.solve_ss(mp, guesses, k_guess, n_guess, hh_method,
+                       method=method, jac0=jac0, stats=stats, diag=diag)
+    dg.say(diag, dg.INFO, 'ss r, w, T_H:', sol['r'], sol['w'], sol['T_H'])
+    dg.say(diag, dg.INFO, 'SS error and Jacobian evaluations:',
+           sol['n_evals'], sol['n_jacs'])
+    if store_dir is not None and sol['converged']:
+        ws.save_solution(store_dir, mp, sol['r'], sol['w'], sol['T_H'],
+                         sol['k'], sol['n'], sol.get('jac'))
+
+    return sol
+
+
+def plot_ss(mp, sol, output_dir):
+    '''
+    Plots steady state savings and labor supply by age for each type.
+    matplotlib is only imported here.
+
+    Inputs:
+        mp         = ModelParams, model parameters
+        sol        = dictionary, steady state (see ssf.solve_ss)
+        output_dir = string, directory the graphs are saved to
+
+    Functions called: None
+
+    Objects in function:
+        age = [S,] vector, model periods of life
+
+    Returns: filenames (list of strings)
+    '''
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    age = np.arange(1, mp.S + 1)
+    filenames = []
+    for name, label in (('k', 'savings'), ('n', 'labor supply')):
+        fig, ax = plt.subplots()
+        for j in range(mp.J):
+            ax.plot(age, sol[name][:, j], label='type %d' % (j + 1))
+        ax.set_xlabel('age')
+        ax.set_ylabel('SS ' + label)
+        ax.legend()
+        filename = os.path.join(output_dir, 'ss_%s.pdf' % name)
+        fig.savefig(filename)
+        plt.close(fig)
+        filenames.append(filename)
+
+    return filenames
+
+
+def main(argv=None):
+    '''
+    Runs the steady state solve from the command line.
+
+    Inputs:
+        argv = list of strings or None, arguments, sys.argv[1:] if None
+
+    Functions called:
+        get_default_params
+        set_params
+        run_ss
+        plot_ss
+        st.print_stats
+        st.save_stats
+
+    Objects in function:
+        args = argparse.Namespace, parsed arguments
+
+    Returns: 0 if the solve converged, 1 if not
+    '''
+    parser = argparse.ArgumentParser(description='Solve the steady state '
+                                     'of the multi-industry OLG model.')
+    parser.add_argument('--hh-method', default='shoot',
+                        choices=['shoot', 'egm', 'newton'])
+    parser.add_argument('--solver', default='hybr',
+                        choices=['hybr', 'broyden'])
+    parser.add_argument('--homotopy', action='store_true',
+                        help='solve by continuation if no exact stored '
+                        'solution')
+    parser.add_argument('--store', default=None,
+                        help='directory of stored solutions')
+    parser.add_argument('--stats', default=None,
+                        help='save stage statistics to this .json/.csv file')
+    parser.add_argument('--plots', default=None,
+                        help='save graphs of the steady state here')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='NAME=VALUE',
+                        help='change a primitive parameter')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='print nothing')
+    args = parser.parse_args(argv)
+
+    diag = dg.get_diag(dg.QUIET if args.quiet else dg.INFO)
+    mp = set_params(get_default_params(), args.set)
+    stats = st.get_stats() if args.stats is not None else None
+    sol = run_ss(mp, hh_method=args.hh_method, method=args.solver,
+                 use_homotopy=args.homotopy, store_dir=args.store,
+                 stats=stats, diag=diag)
+    if stats is not None:
+        st.print_stats(stats)
+        st.save_stats(stats, args.stats)
+    if args.plots is not None:
+        plot_ss(mp, sol, args.plots)
+    if not sol['converged']:
+        dg.say(diag, dg.INFO, 'steady state solve did not converge')
+
+    return 0 if sol['converged'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
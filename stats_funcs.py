@@ -0,0 +1,185 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for timing the stages of the steady state
+solve (price solve, household solves, output, factor demands and market
+clearing in ss_funcs.get_ss_errors) and counting their evaluations and
+solver iterations.
+
+The statistics are kept in an ordered dictionary with one entry per
+stage.  Each entry counts the calls of the stage and adds up their wall
+clock and CPU time; any other counts (e.g. the iterations and error
+evaluations reported by pf.solve_p and hs.solve_hh_shoot through their
+info argument) are added to the same entry.  Everything is optional:
+with stats=None the stages are not timed and the counts are dropped.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import os
+import time
+import json
+import csv
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# CPU time of this process, time.clock() before Python 3.3
+cpu_time = getattr(time, 'process_time', None) or time.clock
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_stats():
+    '''
+    Generates an empty set of stage statistics.
+
+    Inputs: None
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: stats (OrderedDict, stage name to dictionary of counts)
+    '''
+    return OrderedDict()
+
+
+def get_stage(stats, stage):
+    '''
+    Generates the entry of a stage, adding it if not there yet.
+
+    Inputs:
+        stats = OrderedDict, stage statistics
+        stage = string, name of the stage
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: entry (dictionary, calls, wall and cpu time and other counts)
+    '''
+    if stage not in stats:
+        stats[stage] = OrderedDict([('calls', 0), ('wall', 0.0),
+                                    ('cpu', 0.0)])
+
+    return stats[stage]
+
+
+@contextmanager
+def timed(stats, stage):
+    '''
+    Times a stage, for use in a with statement:
+
+        with st.timed(stats, 'price') as info:
+            p, p_converged = pf.solve_p(..., info=info)
+
+    Inputs:
+        stats = OrderedDict or None, stage statistics, None to not time
+        stage = string, name of the stage
+
+    Functions called:
+        get_stage
+
+    Objects in function:
+        entry = dictionary, entry of the stage, yielded so solvers can
+                add their counts to it (a throwaway dictionary if stats
+                is None)
+
+    Returns: None
+    '''
+    if stats is None:
+        yield {}
+        return
+    entry = get_stage(stats, stage)
+    wall_0, cpu_0 = time.time(), cpu_time()
+    try:
+        yield entry
+    finally:
+        entry['calls'] += 1
+        entry['wall'] += time.time() - wall_0
+        entry['cpu'] += cpu_time() - cpu_0
+
+
+def add_counts(stats, stage, **counts):
+    '''
+    Adds counts to the entry of a stage.
+
+    Inputs:
+        stats  = OrderedDict or None, stage statistics
+        stage  = string, name of the stage
+        counts = integers or scalars, counts to add by name
+
+    Functions called:
+        get_stage
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    if stats is None:
+        return
+    entry = get_stage(stats, stage)
+    for name, value in counts.items():
+        entry[name] = entry.get(name, 0) + value
+
+
+def save_stats(stats, filename):
+    '''
+    Saves stage statistics to a JSON file or, if the file name ends in
+    .csv, to a CSV file with one row per stage.  The directory of the
+    file is created if it does not exist.
+
+    Inputs:
+        stats    = OrderedDict, stage statistics
+        filename = string, path of the file
+
+    Functions called: None
+
+    Objects in function:
+        dirname = string, directory of the file
+        columns = list of strings, names of all counts over stages
+
+    Returns: None
+    '''
+    dirname = os.path.dirname(filename)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    if filename.lower().endswith('.csv'):
+        columns = ['calls', 'wall', 'cpu']
+        for entry in stats.values():
+            columns += [name for name in entry if name not in columns]
+        with open(filename, 'w') as f:
+            writer = csv.writer(f)
+            writer.writerow(['stage'] + columns)
+            for stage, entry in stats.items():
+                writer.writerow([stage] + [entry.get(name, '') for name in columns])
+    else:
+        with open(filename, 'w') as f:
+            json.dump(stats, f, indent=2)
+
+
+def print_stats(stats):
+    '''
+    Prints a table of stage statistics.
+
+    Inputs:
+        stats = OrderedDict, stage statistics
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    print('%-14s %8s %10s %10s  %s' % ('stage', 'calls', 'wall (s)',
+                                       'cpu (s)', 'other counts'))
+    for stage, entry in stats.items():
+        other = ', '.join('%s=%s' % (name, value) for name, value in entry.items()
+                          if name not in ('calls', 'wall', 'cpu'))
+        print('%-14s %8d %10.4f %10.4f  %s' % (stage, entry['calls'],
+                                               entry['wall'], entry['cpu'],
+                                               other))
@@ -0,0 +1,226 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for running a function over a grid of
+points in parallel (as in the initial guess loop of
+SS_v2pt1_mktclear_loop.py).
+
+A grid is the product of the values of any number of named axes, e.g.
+initial guesses for r and w, or any parameter of the model.  Points are
+spread over a process pool and each finished row is appended to a csv
+file as soon as it comes back.  The file starts with a header line and
+each row starts with the index of its point in the grid, so if a sweep
+stops part way through it can be run again with the same file and only
+the points not yet in the file are solved.  A point where the function
+raises an exception is not written: its traceback goes to stderr and it
+is tried again when the sweep is run again.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import itertools
+import multiprocessing
+import os
+import sys
+import traceback
+import numpy as np
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_grid(axes):
+    '''
+    Generates the points of a grid from the values along each axis.  The
+    last axis varies fastest.
+
+    Inputs:
+        axes = list of (name, values) pairs, the grid axes
+
+    Functions called: None
+
+    Objects in function:
+        names  = list of strings, axis names
+        points = list of tuples, grid points
+
+    Returns: names, points
+    '''
+    names = [name for name, values in axes]
+    points = list(itertools.product(*[list(values) for name, values in axes]))
+
+    return names, points
+
+
+def get_done(filename, header):
+    '''
+    Reads the indices of the points already in a sweep output file.
+    Rows that were cut off when a sweep stopped are dropped and the file
+    is rewritten with only the complete rows.
+
+    Inputs:
+        filename = string, path of the sweep output file
+        header   = string, header line the file must start with
+
+    Functions called: None
+
+    Objects in function:
+        lines = list of strings, newline terminated lines in the file
+        rows  = list of strings, complete rows in the file
+        done  = set of integers, indices of points in the file
+
+    Returns: done
+    '''
+    done = set()
+    if not os.path.exists(filename):
+        return done
+    with open(filename) as f:
+        lines = f.read().split('\n')
+    # The last element is empty if the file ends with a newline, and a
+    # row cut off before its newline otherwise: drop it either way
+    lines = lines[:-1]
+    if not lines or not lines[0]:
+        return done
+    if lines[0] != header:
+        raise ValueError('%s is the output of a different sweep' % filename)
+    n_fields = len(header.split(','))
+    rows = []
+    for line in lines[1:]:
+        fields = line.split(',')
+        if len(fields) != n_fields:
+            continue
+        try:
+            [float(x) for x in fields]
+        except ValueError:
+            continue
+        rows.append(line)
+        done.add(int(float(fields[0])))
+    with open(filename, 'w') as f:
+        f.write('\n'.join([header] + rows) + '\n')
+
+    return done
+
+
+def run_point(args):
+    '''
+    Runs the sweep function at one grid point.  Used by the process pool
+    in run_sweep.
+
+    Inputs:
+        args = length 4 tuple, (func, i, names, point)
+
+    Functions called:
+        func
+
+    Objects in function:
+        row = [n_out,] vector, output of func at the point, None if
+              func raised an exception
+        tb  = string, traceback of the exception, None if func returned
+
+    Returns: i, point, row, tb
+    '''
+    func, i, names, point = args
+    tb = None
+    try:
+        row = np.asarray(func(dict(zip(names, point))), dtype=float).ravel()
+    except Exception:
+        row = None
+        tb = traceback.format_exc()
+
+    return i, point, row, tb
+
+
+def run_sweep(func, names, points, filename, columns, processes=None,
+              chunksize=1):
+    '''
+    Runs a function at every point of a grid, spread over a process
+    pool, and appends each row to a csv file as soon as it is done.
+    Points already in the file are skipped.  Points where func raises
+    are reported on stderr and left out of the file, so running the
+    sweep again retries them.
+
+    Inputs:
+        func      = function, takes a dictionary of axis values and
+                    returns a list of len(columns) outputs.  Must be
+                    defined at the top level of a module so it can be
+                    sent to the workers
+        names     = list of strings, axis names
+        points    = list of tuples, grid points
+        filename  = string, path of the sweep output file
+        columns   = list of strings, names of the outputs of func
+        processes = integer >= 1 or None, number of worker processes,
+                    None for one per cpu, 1 to run in this process
+        chunksize = integer >= 1, points sent to a worker at a time
+
+    Functions called:
+        get_done
+        run_point
+
+    Objects in function:
+        header = string, header line of the output file
+        done   = set of integers, indices of points already in the file
+        tasks  = list of tuples, arguments of run_point for points to do
+
+    Returns: n_done (number of points solved in this call)
+    '''
+    header = ','.join(['point'] + list(names) + list(columns))
+    done = get_done(filename, header)
+    if not done:
+        with open(filename, 'w') as f:
+            f.write(header + '\n')
+    tasks = [(func, i, names, point) for i, point in enumerate(points)
+             if i not in done]
+    if processes == 1:
+        pool = None
+        results = (run_point(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap_unordered(run_point, tasks, chunksize)
+    n_done = 0
+    try:
+        with open(filename, 'a') as f:
+            for i, point, row, tb in results:
+                if row is None:
+                    sys.stderr.write('point %d %s failed:\n%s'
+                                     % (i, str(tuple(point)), tb))
+                    continue
+                values = np.append(np.asarray(point, dtype=float), row)
+                f.write(str(i) + ',' + ','.join(['%.18e' % x for x in values])
+                        + '\n')
+                f.flush()
+                n_done += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return n_done
+
+
+def load_sweep(filename, n_points):
+    '''
+    Loads a sweep output file into an array ordered by point, with NaN
+    rows for points not in the file.
+
+    Inputs:
+        filename = string, path of the sweep output file
+        n_points = integer, number of points in the grid
+
+    Functions called: None
+
+    Objects in function:
+        data   = [n_done, n_cols+1] array, rows of the file
+        output = [n_points, n_cols] array, axis values and outputs
+
+    Returns: output
+    '''
+    data = np.loadtxt(filename, delimiter=',', skiprows=1, ndmin=2)
+    with open(filename) as f:
+        n_cols = len(f.readline().split(',')) - 1
+    output = np.nan*np.ones((n_points, n_cols))
+    if data.shape[0] > 0:
+        output[data[:, 0].astype(int)] = data[:, 1:]
+
+    return output
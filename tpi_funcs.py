@@ -0,0 +1,1164 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for solving the time path (TPI) of the
+multi-industry model with taxes (as in SS_v3pt2_mktclear.py) from an
+initial distribution of savings to the steady state, following the Time
+Path section of SS_TPI_algo.tex.
+
+Given guesses for the paths of the interest rate, wage rate, transfers
+and bequests received (at their steady state values from period T on):
+    - prices of output for all periods are solved as one [T,M] batch
+      (pf.solve_p), and the paths of p^c, p~ and p_k are array
+      operations on it,
+    - the household problems of all cohorts alive along the path and
+      all J types are solved together by shooting on consumption in the
+      first period of the path each cohort is alive (as in
+      hh_shoot_funcs.py, with prices that change over time), in this
+      process or spread over a process pool in blocks of cohorts, with
+      the paths and solutions in shared memory,
+    - consumption of each good and demand for output from consumption
+      are aggregated for each period, in chunks of periods, in memory
+      or in memory-mapped files (path_store_funcs.py),
+    - output solves the resource constraints of all periods,
+          X_t = X^c_t + xi'*(K_{t+1} - (1-delta)*K_t),  K_t = kx_t*X_t,
+      backward from X_T at its steady state value, one M dimensional
+      linear system per period (of.solve_output_path),
+    - factor demands and the market clearing errors of each period are
+      those of the steady state (ss_funcs.get_mkt_parts).
+Savings held during period t (chosen at t-1) finance the value of
+firms in period t, and give the bequests received in period t.  The
+paths of the guesses that set the market clearing errors and the change
+in bequests to zero in every period are found with Broyden's method, or
+with Newton steps on the sequence space Jacobian at the steady state
+(get_tpi_ssj), which is computed once from the Jacobians of the
+household block (get_hh_ss_jac) and the firm block (get_firm_ss_jacs).
+
+SS_TPI_algo.tex describes a model without taxes or bequests.  Here
+transfers and bequests are paths guessed along with r and w and, as in
+the steady state, firms price output period by period.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import multiprocessing
+import numpy as np
+import scipy.linalg as la
+import price_funcs as pf
+import hh_solve_funcs as hf
+import output_funcs as of
+import firm_funcs_v3 as ff
+import alloc_funcs as af
+import path_store_funcs as pst
+import ss_funcs as ssf
+import broyden_funcs as br
+import stats_funcs as st
+import diag_funcs as dg
+
+# household parameters and shared arrays of a cohort pool worker, set by
+# init_cohort_worker
+_SHARED = {}
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_price_path(mp, r, w, p_guess=None, info=None):
+    '''
+    Generates the paths of the prices of output, consumption goods and
+    capital goods, normalized so the price of output of industry 1 is
+    one in every period.
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        r       = [T,] vector, path of the interest rate
+        w       = [T,] vector, path of the wage rate
+        p_guess = [T,M] array or None, guess for the prices of output
+                  before normalizing, ones if None
+        info    = dictionary or None, passed to pf.solve_p
+
+    Functions called:
+        ff.get_Z
+        pf.solve_p
+        ff.get_p_c
+        ff.get_p_tilde
+
+    Objects in function:
+        Z           = [T,M] array, PV of depreciation deductions
+        p_raw       = [T,M] array, prices of industry output before
+                      normalizing
+        p           = [T,M] array, prices of industry output
+        p_converged = boolean, =True if the price solve converged in
+                      every period
+        p_c         = [T,I] array, prices of consumption goods
+        p_tilde     = [T,] vector, price of composite consumption good
+        p_k         = [T,M] array, prices of capital goods
+
+    Returns: p, p_c, p_tilde, p_k, p_converged, p_raw
+    '''
+    Z = ff.get_Z(mp, r[:, np.newaxis])
+    p_raw, p_converged = pf.solve_p(mp.p_params, r, w, Z, p_guess, info=info)
+    p = p_raw/p_raw[:, :1]
+    p_c = ff.get_p_c(mp, p)
+    p_tilde = ff.get_p_tilde(mp, p_c)
+    p_k = np.dot(p, mp.xi.T)
+
+    return p, p_c, p_tilde, p_k, p_converged.all(), p_raw
+
+
+def get_cohort_path(params, c_1, r, w, p_c, p_tilde, T_H, bq, k_init,
+                    cohorts=None):
+    '''
+    Generates the lifetime paths of consumption, labor supply and savings
+    of every cohort alive along the time path implied by its consumption
+    in the first period of the path it is alive, and the error in the
+    bequest FOC at the end of life.
+
+    Cohort i is born in period i-(S-1), so cohorts 0 to S-2 are alive at
+    t=0 and start the path at age s0 = S-1-i with the savings k_init of
+    the age before.  Cohort i is age s in period t = i-(S-1)+s and dies
+    at the end of period i.
+
+    Inputs:
+        params  = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                  ltilde, e, surv_mat, mort_mat, weights, cbar)
+        c_1     = [G,N,J] array, consumption of each of the N cohorts in
+                  the first period of the path it is alive
+        r       = [T+S-1,] vector, path of the interest rate
+        w       = [T+S-1,] vector, path of the wage rate
+        p_c     = [T+S-1,I] array, path of prices of consumption goods
+        p_tilde = [T+S-1,] vector, path of price of composite
+                  consumption good
+        T_H     = [T+S-1,] vector, path of total government transfers
+        bq      = [T+S-1,J] array, path of bequests received
+        k_init  = [S,J] array, savings at the end of period -1
+        cohorts = [N,] integer vector or None, cohorts solved, all T+S-1
+                  if None
+
+    Functions called:
+        hf.MUc
+
+    Objects in function:
+        s0     = [N,] vector, age of each cohort at the start of the path
+        t      = [N,] vector, period each cohort is age s (0 if before
+                 the path)
+        live   = [N,1] boolean array, =True if the cohort is age s
+                 during the path
+        income = [T+S-1,] vector, transfers net of minimum consumption
+                 expenditures
+        k_bq   = [G,N,J] array, bequest that satisfies foc_bq given c_S
+        error  = [G,N,J] array, k_S - k_bq, monotone in c_1
+
+    Returns: c, n, k ([S,G,N,J]), error
+    '''
+    (S, beta, sigma, nu, chi_n, chi_b, ltilde, e, surv_mat, mort_mat,
+     weights, cbar) = params
+    J = c_1.shape[-1]
+    e_j = np.asarray(e, dtype=float)[:J]
+    if cohorts is None:
+        cohorts = np.arange(len(r))
+    s0 = np.maximum(S - 1 - cohorts, 0)
+    income = (T_H/weights.sum()) - (p_c*cbar).sum(-1)
+
+    c = np.empty((S,) + c_1.shape)
+    n = np.empty_like(c)
+    k = np.empty_like(c)
+    for s in range(S):
+        t = np.maximum(cohorts - (S-1) + s, 0)
+        live = (s >= s0)[:, np.newaxis]
+        r_t, w_t = r[t][:, np.newaxis], w[t][:, np.newaxis]
+        p_tilde_t = p_tilde[t][:, np.newaxis]
+        # foc_k: MUc(c_s) = MUc(c_{s-1})/((1+r_t)*beta*surv_{s-1})
+        if s == 0:
+            c[s] = c_1
+        else:
+            c[s] = np.where((s > s0)[:, np.newaxis],
+                            (hf.MUc(params, c[s-1]) /
+                             ((1+r_t)*beta*surv_mat[s-1, :J]))**(-1/sigma), c_1)
+        # foc_l: MUl(n_s) = -w_t*e_j*MUc(c_s)/p~_t
+        n[s] = ltilde - (((w_t*e_j*hf.MUc(params, c[s]))/(p_tilde_t*chi_n))**(-1/nu))
+        # budget constraint, savings before the path are given
+        k_prev = k[s-1] if s > 0 else 0.0
+        k[s] = np.where(live, (1+r_t)*k_prev + w_t*n[s]*e_j + bq[t] +
+                        income[t][:, np.newaxis] - p_tilde_t*c[s],
+                        k_init[s, :J])
+
+    # foc_bq: MUb(k_S) = MUc(c_S)/p~_t at the last period of life
+    k_bq = ((hf.MUc(params, c[-1])/(p_tilde[cohorts, np.newaxis]*chi_b))**(-1/sigma))
+    error = k[-1] - k_bq
+
+    return c, n, k, error
+
+
+def solve_cohorts(params, r, w, p_c, p_tilde, T_H, bq, k_init, tol=1e-13,
+                  maxiter=200, c_1_guess=None, cohorts=None, info=None):
+    '''
+    Solves the household problems of all cohorts alive along the time
+    path and all J types by shooting on consumption in the first period
+    of the path each cohort is alive.  The roots are bracketed on a grid
+    and found with the Illinois method, as in hs.solve_hh_shoot, with
+    the paths of all cohorts and types computed together.
+
+    Inputs:
+        params    = length 12 tuple, (S, beta, sigma, nu, chi_n, chi_b,
+                    ltilde, e, surv_mat, mort_mat, weights, cbar)
+        r, w, p_c, p_tilde, T_H, bq, k_init = paths and initial savings,
+                    see get_cohort_path
+        tol       = scalar > 0, tolerance on the relative width of the
+                    bracket around c_1
+        maxiter   = integer >= 1, maximum number of Illinois iterations
+        c_1_guess = [N,J] array or None, guess for c_1 (e.g. the
+                    solution at the last guesses of the paths)
+        cohorts   = [N,] integer vector or None, cohorts solved, all
+                    T+S-1 if None
+        info      = dictionary or None, if given the Illinois iterations
+                    and the shooting paths computed are added to
+                    info['iterations'] and info['evals']
+
+    Functions called:
+        get_cohort_path
+
+    Objects in function:
+        grid   = [G,N,J] array, grid on c_1 used to bracket the roots
+        a, b   = [N,J] arrays, bracket on c_1, b is the latest iterate
+        f_a    = [N,J] array, error at a (halved by the Illinois rule)
+        f_b    = [N,J] array, error at b
+        active = [N,J] boolean array, =True if not yet converged
+
+    Returns: c, n, k ([S,N,J]), c_1 ([N,J]), converged ([N,J])
+    '''
+    S, ltilde = params[0], params[6]
+    J = params[8].shape[1]
+    if cohorts is None:
+        cohorts = np.arange(len(r))
+    N = len(cohorts)
+    args = (r, w, p_c, p_tilde, T_H, bq, k_init, cohorts)
+    rows, cols = np.indices((N, J))
+    wide = np.tile(np.logspace(-6, 3, 37)[:, np.newaxis, np.newaxis], (1, N, J))
+    if c_1_guess is None:
+        grid = wide
+    else:
+        grid = (np.exp(np.linspace(-0.05, 0.05, 5))[:, np.newaxis, np.newaxis] *
+                np.asarray(c_1_guess, dtype=float)[np.newaxis])
+    f = get_cohort_path(params, grid, *args)[3]
+    n_evals = grid.shape[0]
+    # first sign change on the grid for each cohort and type
+    change = np.sign(f[:-1]) != np.sign(f[1:])
+    i = np.argmax(change, axis=0)
+    bracketed = change[i, rows, cols]
+    a, b = grid[i, rows, cols], grid[i+1, rows, cols]
+    f_a, f_b = f[i, rows, cols], f[i+1, rows, cols]
+    if not bracketed.all() and c_1_guess is not None:
+        # roots not near the guess, search the wide grid
+        f = get_cohort_path(params, wide, *args)[3]
+        n_evals += wide.shape[0]
+        change = np.sign(f[:-1]) != np.sign(f[1:])
+        i = np.argmax(change, axis=0)
+        miss = ~bracketed
+        a[miss], b[miss] = wide[i, rows, cols][miss], wide[i+1, rows, cols][miss]
+        f_a[miss], f_b[miss] = f[i, rows, cols][miss], f[i+1, rows, cols][miss]
+        bracketed = bracketed | change[i, rows, cols]
+    active = bracketed & (np.absolute(b-a) > tol*np.absolute(b)) & (f_b != 0)
+    it = 0
+    while active.any() and it < maxiter:
+        x = np.where(active, b - f_b*(b-a)/np.where(active, f_b-f_a, 1.0), b)
+        f_x = get_cohort_path(params, x[np.newaxis], *args)[3][0]
+        switch = active & (np.sign(f_x) != np.sign(f_b))
+        keep = active & ~switch
+        # Illinois step: halve the error at the end that stays put
+        f_a[keep] *= 0.5
+        a[switch], f_a[switch] = b[switch], f_b[switch]
+        b[active], f_b[active] = x[active], f_x[active]
+        active = active & (np.absolute(b-a) > tol*np.absolute(b)) & (f_b != 0)
+        it += 1
+    c, n, k, f = get_cohort_path(params, b[np.newaxis], *args)
+    c, n, k = c[:, 0], n[:, 0], k[:, 0]
+    # labor supply only has to be interior at ages during the path
+    live = (np.arange(S)[:, np.newaxis] >=
+            np.maximum(S - 1 - cohorts, 0))[:, :, np.newaxis]
+    converged = (bracketed & ~active & ((n > 0) | ~live).all(0) &
+                 ((n < ltilde) | ~live).all(0))
+    if info is not None:
+        info['iterations'] = info.get('iterations', 0) + it
+        info['evals'] = info.get('evals', 0) + n_evals + it + 1
+
+    return c, n, k, b, converged
+
+
+def get_shared_views(raws, shapes):
+    '''
+    Generates numpy arrays on blocks of shared memory, without copying.
+
+    Inputs:
+        raws   = dictionary, multiprocessing.RawArray of doubles by name
+        shapes = dictionary, shape of each array by name
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: arrays (dictionary, numpy arrays by name)
+    '''
+    arrays = dict((name, np.frombuffer(raws[name], dtype=float).reshape(shapes[name]))
+                  for name in raws)
+
+    return arrays
+
+
+def init_cohort_worker(params, raws, shapes):
+    '''
+    Sets up a worker process of a cohort pool: keeps the household
+    parameters and numpy views of the shared arrays for
+    solve_cohort_block.
+
+    Inputs:
+        params = length 12 tuple, household parameters (mp.hh_params)
+        raws   = dictionary, shared memory blocks by name
+        shapes = dictionary, shape of each array by name
+
+    Functions called:
+        get_shared_views
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    _SHARED.clear()
+    _SHARED['params'] = params
+    _SHARED['arrays'] = get_shared_views(raws, shapes)
+
+
+def solve_cohort_block(args):
+    '''
+    Solves the household problems of a block of cohorts in a worker
+    process.  The paths are read from and the solutions written to the
+    shared arrays, so only the block and the counts of the solve go
+    through the pool's pipes.
+
+    Inputs:
+        args = length 3 tuple, (i0, i1, use_guess), the block is cohorts
+               i0 to i1-1, use_guess =True to start from the shared c_1
+
+    Functions called:
+        solve_cohorts
+
+    Objects in function:
+        arrays = dictionary, shared arrays (see get_cohort_pool)
+        info   = dictionary, iterations and evaluations of the solve
+
+    Returns: info
+    '''
+    i0, i1, use_guess = args
+    arrays = _SHARED['arrays']
+    c_1_guess = arrays['c_1'][i0:i1].copy() if use_guess else None
+    info = {}
+    c, n, k, c_1, converged = solve_cohorts(
+        _SHARED['params'], arrays['r'], arrays['w'], arrays['p_c'],
+        arrays['p_tilde'], arrays['T_H'], arrays['bq'], arrays['k_init'],
+        c_1_guess=c_1_guess, cohorts=np.arange(i0, i1), info=info)
+    arrays['c'][i0:i1] = c.transpose(1, 0, 2)
+    arrays['n'][i0:i1] = n.transpose(1, 0, 2)
+    arrays['k'][i0:i1] = k.transpose(1, 0, 2)
+    arrays['c_1'][i0:i1] = c_1
+    arrays['converged'][i0:i1] = converged
+
+    return info
+
+
+def get_cohort_pool(mp, T, processes=None, n_blocks=None):
+    '''
+    Generates a process pool for the household problems of the time
+    path, with the paths the problems depend on and their solutions in
+    shared memory.  The solutions are kept by cohort as (T+S-1, S, J)
+    arrays.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        T         = integer, number of periods to the steady state
+        processes = integer >= 1 or None, number of worker processes,
+                    None for one per cpu
+        n_blocks  = integer >= 1 or None, number of blocks of cohorts
+                    the problems are split into, 4 per process if None
+
+    Functions called:
+        get_shared_views
+        init_cohort_worker
+
+    Objects in function:
+        TT     = integer, T+S-1, number of cohorts
+        shapes = dictionary, shape of each shared array by name
+        raws   = dictionary, shared memory blocks by name
+        pool   = multiprocessing.Pool, worker processes
+        blocks = list of tuples, (first, last+1) cohort of each block
+
+    Returns: hh_pool (dictionary, pool, shared arrays and blocks)
+    '''
+    S, J, I = mp.S, mp.J, mp.I
+    TT = T + S - 1
+    shapes = dict(r=(TT,), w=(TT,), T_H=(TT,), p_tilde=(TT,), p_c=(TT, I),
+                  bq=(TT, J), k_init=(S, J), c=(TT, S, J), n=(TT, S, J),
+                  k=(TT, S, J), c_1=(TT, J), converged=(TT, J))
+    raws = dict((name, multiprocessing.RawArray('d', int(np.prod(shape))))
+                for name, shape in shapes.items())
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if n_blocks is None:
+        n_blocks = 4*processes
+    pool = multiprocessing.Pool(processes, init_cohort_worker,
+                                (mp.hh_params, raws, shapes))
+    blocks = [(block[0], block[-1] + 1) for block in
+              np.array_split(np.arange(TT), min(n_blocks, TT))]
+    hh_pool = dict(pool=pool, arrays=get_shared_views(raws, shapes),
+                   blocks=blocks)
+
+    return hh_pool
+
+
+def solve_cohorts_pool(hh_pool, r, w, p_c, p_tilde, T_H, bq, k_init,
+                       c_1_guess=None, info=None):
+    '''
+    Solves the household problems of all cohorts alive along the time
+    path, spread over the blocks of cohorts of a cohort pool.  The paths
+    are written to shared memory once and each worker reads them there.
+
+    Inputs:
+        hh_pool   = dictionary, cohort pool (see get_cohort_pool)
+        r, w, p_c, p_tilde, T_H, bq, k_init = paths and initial savings,
+                    see get_cohort_path
+        c_1_guess = [T+S-1,J] array or None, guess for c_1
+        info      = dictionary or None, if given the Illinois iterations
+                    and shooting paths of all blocks are added to it
+
+    Functions called:
+        solve_cohort_block (in the workers)
+
+    Objects in function:
+        arrays = dictionary, shared arrays
+        infos  = list of dictionaries, counts of each block
+
+    Returns: c, n, k ([S,T+S-1,J] views of the shared arrays), c_1,
+             converged (as solve_cohorts)
+    '''
+    arrays = hh_pool['arrays']
+    for name, value in (('r', r), ('w', w), ('p_c', p_c), ('p_tilde', p_tilde),
+                        ('T_H', T_H), ('bq', bq), ('k_init', k_init)):
+        arrays[name][...] = value
+    if c_1_guess is not None:
+        arrays['c_1'][...] = c_1_guess
+    infos = hh_pool['pool'].map(solve_cohort_block,
+                                [(i0, i1, c_1_guess is not None)
+                                 for i0, i1 in hh_pool['blocks']])
+    if info is not None:
+        for block_info in infos:
+            for name, value in block_info.items():
+                info[name] = info.get(name, 0) + value
+    c, n, k = [arrays[name].transpose(1, 0, 2) for name in ('c', 'n', 'k')]
+
+    return c, n, k, arrays['c_1'].copy(), arrays['converged'] > 0.5
+
+
+def close_cohort_pool(hh_pool):
+    '''
+    Stops the worker processes of a cohort pool.
+
+    Inputs:
+        hh_pool = dictionary, cohort pool (see get_cohort_pool)
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: None
+    '''
+    hh_pool['pool'].close()
+    hh_pool['pool'].join()
+
+
+def get_period_path(x, T, out=None, chunk=None):
+    '''
+    Rearranges an array by age and cohort into an array by period and
+    age, for the first T periods of the path.
+
+    Inputs:
+        x     = [S,N,...] array, by age and cohort (see get_cohort_path)
+        T     = integer, number of periods
+        out   = [T,S,...] array or None, array to hold the result (e.g.
+                a memory-mapped path array, see path_store_funcs.py)
+        chunk = integer >= 1 or None, periods rearranged at a time, all
+                T if None
+
+    Functions called:
+        pst.get_chunks
+
+    Objects in function:
+        s = [1,S] array, ages
+        t = [T,1] array, periods
+
+    Returns: x_t ([T,S,...] array)
+    '''
+    S = x.shape[0]
+    s = np.arange(S)[np.newaxis, :]
+    if out is None:
+        out = np.empty((T,) + x.shape[:1] + x.shape[2:])
+    for t0, t1 in pst.get_chunks(T, chunk or T):
+        t = np.arange(t0, t1)[:, np.newaxis]
+        out[t0:t1] = x[s, t - s + S - 1]
+
+    return out
+
+
+def get_demand_errors(mp, r, w, T_H, X, p_guess=None):
+    '''
+    Generates the demand side of the market clearing errors (those terms
+    that do not depend on households) in a batch of periods, for given
+    output.
+
+    Inputs:
+        mp      = ModelParams, model parameters
+        r       = [N,] vector, interest rates
+        w       = [N,] vector, wage rates
+        T_H     = [N,] vector, total government transfers
+        X       = [N,M] array, output
+        p_guess = [N,M] array or None, guess for the prices of output
+                  before normalizing
+
+    Functions called:
+        get_price_path
+        ff.get_k_demand
+        ff.get_l_demand
+        ff.get_firm_taxes
+        ff.get_q
+        ff.get_Z
+
+    Objects in function:
+        K_d        = [N,M] array, demand for capital
+        L_d        = [N,M] array, demand for labor
+        firm_taxes = [N,M] array, business income taxes
+        K_tau      = [N,M] array, tax basis of capital
+        V          = [N,M] array, value of firms
+
+    Returns: errors ([N,3] array, -sum V, -sum L_d, T_H - sum taxes), K_d,
+             L_d, V
+    '''
+    p, p_c, p_tilde, p_k = get_price_path(mp, r, w, p_guess)[:4]
+    r_m, w_m = r[:, np.newaxis], w[:, np.newaxis]
+    K_d = ff.get_k_demand(mp, p_k, w_m, r_m, X)
+    L_d = ff.get_l_demand(mp, p_k, w_m, r_m, K_d)
+    firm_taxes = ff.get_firm_taxes(mp, p, p_k, w_m, X, K_d, L_d)
+    K_tau = (1-mp.delta_tau)*(mp.delta/mp.delta_tau)*p_k*K_d
+    V = (ff.get_q(mp, p_k, r_m)*K_d) + (K_tau*ff.get_Z(mp, r_m))
+    errors = np.column_stack((-V.sum(1), -L_d.sum(1), T_H - firm_taxes.sum(1)))
+
+    return errors, K_d, L_d, V
+
+
+def get_hh_path(mp, r, w, p_c, p_tilde, T_H, bq, k_init, T, c_1_guess=None,
+                hh_pool=None, info=None, store=None):
+    '''
+    Generates the paths of the household choices and their aggregates
+    over the first T periods implied by paths of prices, transfers and
+    bequests.  The paths by period are filled and aggregated in chunks
+    of periods, so with a path store only a chunk of consumption of each
+    good is in memory at a time.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        r, w, p_c, p_tilde, T_H, bq, k_init = paths and initial savings,
+                    see get_cohort_path
+        T         = integer, number of periods to the steady state
+        c_1_guess = [T+S-1,J] array or None, guess for c_1 of each cohort
+        hh_pool   = dictionary or None, cohort pool (see
+                    get_cohort_pool), the household problems are solved
+                    in this process if None
+        info      = dictionary or None, passed to solve_cohorts
+        store     = dictionary or None, path store the paths of k, n, c
+                    and c_i are written to (see path_store_funcs.py), in
+                    memory if None
+
+    Functions called:
+        solve_cohorts
+        solve_cohorts_pool
+        get_period_path
+        pst.get_chunks
+
+    Objects in function:
+        k, n, c = [T,S,J] arrays, savings, labor supply and composite
+                  consumption by period
+        c_i     = [T,I,S,J] array, consumption of each good
+        C       = [T,I] array, aggregate consumption of each good
+        K_end   = [T,] vector, aggregate savings at the end of each period
+        B_end   = [T,J] array, savings of those who die at the end of
+                  each period
+        K_s     = [T,] vector, aggregate savings held during each period
+        L_s     = [T,] vector, aggregate labor supply
+        bq_new  = [T,J] array, bequests implied by the path of savings:
+                  bequests received in period t are the mortality
+                  weighted savings of period t-1 with interest
+
+    Returns: hh (dictionary)
+    '''
+    if hh_pool is None:
+        c, n, k, c_1, converged = solve_cohorts(mp.hh_params, r, w, p_c,
+                                                p_tilde, T_H, bq, k_init,
+                                                c_1_guess=c_1_guess, info=info)
+    else:
+        c, n, k, c_1, converged = solve_cohorts_pool(hh_pool, r, w, p_c,
+                                                     p_tilde, T_H, bq, k_init,
+                                                     c_1_guess, info)
+    if store is None:
+        chunk = T
+        paths = dict(c_i=np.empty((T, mp.I, mp.S, mp.J)))
+    else:
+        chunk = store['chunk']
+        paths = store['arrays']
+    c = get_period_path(c, T, paths.get('c'), chunk)
+    n = get_period_path(n, T, paths.get('n'), chunk)
+    k = get_period_path(k, T, paths.get('k'), chunk)
+    c_i = paths['c_i']
+    C = np.empty((T, mp.I))
+    K_end, L_s, B_end = np.empty(T), np.empty(T), np.empty((T, mp.J))
+    for t0, t1 in pst.get_chunks(T, chunk):
+        c_i[t0:t1] = ((p_tilde[t0:t1, np.newaxis, np.newaxis, np.newaxis] *
+                       c[t0:t1, np.newaxis] *
+                       mp.alpha[:, np.newaxis, np.newaxis]) /
+                      p_c[t0:t1, :, np.newaxis, np.newaxis] +
+                      mp.cbar[:, np.newaxis, np.newaxis])
+        C[t0:t1] = (mp.weights*c_i[t0:t1]).sum(3).sum(2)
+        K_end[t0:t1] = (mp.weights*k[t0:t1]).sum(2).sum(1)
+        L_s[t0:t1] = (mp.weights*n[t0:t1]*mp.e).sum(2).sum(1)
+        B_end[t0:t1] = (mp.weights*mp.mort_mat*k[t0:t1]).sum(1)
+    K_s = np.append((mp.weights*k_init).sum(), K_end[:-1])
+    B_lag = np.vstack(((mp.weights*mp.mort_mat*k_init).sum(0), B_end[:-1]))
+    bq_new = (1+r[:T, np.newaxis])*B_lag/mp.weights.sum(0)
+    hh = dict(k=k, n=n, c=c, c_1=c_1, c_i=c_i, C=C, K_s=K_s, L_s=L_s,
+              bq_new=bq_new, converged=converged.all())
+
+    return hh
+
+
+def get_tpi_parts(mp, r, w, T_H, bq, k_init, X_ss, T, p_guess=None,
+                  c_1_guess=None, cache=None, hh_pool=None, stats=None,
+                  store=None):
+    '''
+    Generates the equilibrium objects and market clearing errors of every
+    period implied by guesses for the paths of the interest rate, wage
+    rate, transfers and bequests.
+
+    Inputs:
+        mp        = ModelParams, model parameters
+        r         = [T+S-1,] vector, path of the interest rate
+        w         = [T+S-1,] vector, path of the wage rate
+        T_H       = [T+S-1,] vector, path of total government transfers
+        bq        = [T+S-1,J] array, path of bequests received
+        k_init    = [S,J] array, savings at the end of period -1
+        X_ss      = [M,] vector, steady state output
+        T         = integer, number of periods to the steady state
+        p_guess   = [T+S-1,M] array or None, guess for prices of output
+                    before normalizing
+        c_1_guess = [T+S-1,J] array or None, guess for c_1 of each cohort
+        cache     = dictionary or None, passed to of.solve_output_path
+        hh_pool   = dictionary or None, cohort pool, see get_hh_path
+        stats     = OrderedDict or None, stage statistics (see
+                    stats_funcs.py)
+        store     = dictionary or None, path store (see
+                    path_store_funcs.py), the path arrays are written
+                    there and the parts returned are views of them
+
+    Functions called:
+        st.timed
+        get_price_path
+        get_hh_path
+        of.solve_output_path
+        get_demand_errors
+        pst.write_path
+
+    Objects in function:
+        hh     = dictionary, household choices and aggregates (see
+                 get_hh_path)
+        X_c    = [T,M] array, demand for output from consumption
+        errors = [T,3] array, asset market, labor market and government
+                 budget errors of each period
+
+    Returns: parts (dictionary)
+    '''
+    with st.timed(stats, 'tpi_price') as info:
+        p, p_c, p_tilde, p_k, p_converged, p_raw = get_price_path(mp, r, w,
+                                                                  p_guess, info)
+    with st.timed(stats, 'tpi_household') as info:
+        hh = get_hh_path(mp, r, w, p_c, p_tilde, T_H, bq, k_init, T, c_1_guess,
+                         hh_pool, info, store)
+    with st.timed(stats, 'tpi_output') as info:
+        X_c = np.dot(hh['C'], mp.pi)
+        X, kx = of.solve_output_path(mp, p_k[:T+1], r[:T+1],
+                                     w[:T+1], X_c, X_ss, cache, info)
+    with st.timed(stats, 'tpi_mkt_clear'):
+        errors, K_d, L_d, V = get_demand_errors(mp, r[:T], w[:T], T_H[:T], X,
+                                                p_raw[:T])
+        errors[:, 0] += hh['K_s']
+        errors[:, 1] += hh['L_s']
+    if store is not None:
+        X = pst.write_path(store, 'X', X)
+        K_d = pst.write_path(store, 'K_d', K_d)
+        L_d = pst.write_path(store, 'L_d', L_d)
+    parts = dict(hh)
+    parts.update(r=r[:T], w=w[:T], T_H=T_H[:T], bq=bq[:T], p=p[:T],
+                 p_c=p_c[:T], p_tilde=p_tilde[:T], p_k=p_k[:T], p_raw=p_raw,
+                 X=X, K_d=K_d, L_d=L_d, V=V, errors=errors,
+                 converged=p_converged and hh['converged'])
+
+    return parts
+
+
+def get_ss_bq(mp, r, k):
+    '''
+    Generates steady state bequests received by each type.
+
+    Inputs:
+        mp = ModelParams, model parameters
+        r  = scalar, interest rate
+        k  = [S,J] array, savings
+
+    Functions called: None
+
+    Objects in function: None
+
+    Returns: bq ([J,] vector)
+    '''
+    bq = (1+r)*(mp.weights*mp.mort_mat*k).sum(0)/mp.weights.sum(0)
+
+    return bq
+
+
+def get_tpi_errors(z, mp, k_init, X_ss, T, x_tail, bq_tail, last=None,
+                   cache=None, hh_pool=None, stats=None, store=None):
+    '''
+    Generates the errors of the time path for stacked guesses of the
+    paths of (r, w, T_H) and bequests: the market clearing errors of
+    every period and the change in bequests.
+
+    Inputs:
+        z       = [T*(3+J),] vector, paths of (r, w, T_H) by period,
+                  then the path of bequests by period
+        mp      = ModelParams, model parameters
+        k_init  = [S,J] array, savings at the end of period -1
+        X_ss    = [M,] vector, steady state output
+        T       = integer, number of periods to the steady state
+        x_tail  = [3,] vector, steady state (r, w, T_H), after period T
+        bq_tail = [J,] vector, steady state bequests, after period T
+        last    = dictionary or None, if given the guesses and parts of
+                  the last call are kept in last['z'] and last['parts'],
+                  and their prices and c_1 start the next solves
+        cache   = dictionary or None, passed to of.solve_output_path
+        hh_pool = dictionary or None, cohort pool, see get_tpi_parts
+        stats   = OrderedDict or None, stage statistics
+        store   = dictionary or None, path store, see get_tpi_parts
+
+    Functions called:
+        get_tpi_parts
+
+    Objects in function:
+        x     = [T+S-1,3] array, paths of (r, w, T_H)
+        bq    = [T+S-1,J] array, path of bequests received
+        parts = dictionary, equilibrium objects (see get_tpi_parts)
+
+    Returns: errors ([T*(3+J),] vector)
+    '''
+    S, J = mp.S, mp.J
+    x = np.concatenate((z[:3*T].reshape(T, 3), np.tile(x_tail, (S-1, 1))))
+    bq = np.concatenate((z[3*T:].reshape(T, J), np.tile(bq_tail, (S-1, 1))))
+    p_guess, c_1_guess = None, None
+    if last is not None and 'parts' in last:
+        p_guess, c_1_guess = last['parts']['p_raw'], last['parts']['c_1']
+    parts = get_tpi_parts(mp, x[:, 0], x[:, 1], x[:, 2], bq, k_init, X_ss, T,
+                          p_guess, c_1_guess, cache, hh_pool, stats, store)
+    if last is not None:
+        last['z'] = np.array(z, dtype=float)
+        last['parts'] = parts
+    errors = np.concatenate((parts['errors'].ravel(),
+                             (bq[:T] - parts['bq_new']).ravel()))
+
+    return errors
+
+
+def get_tpi_fd_jac(z, *args):
+    '''
+    Generates the forward difference Jacobian of the time path errors,
+    taking the same arguments as get_tpi_errors.
+
+    Inputs:
+        z    = [T*(3+J),] vector, stacked paths (see get_tpi_errors)
+        args = tuple, the other arguments of get_tpi_errors
+
+    Functions called:
+        br.get_fd_jac
+        get_tpi_errors
+
+    Objects in function: None
+
+    Returns: jac ([T*(3+J),T*(3+J)] array)
+    '''
+    jac = br.get_fd_jac(get_tpi_errors, z, args=args)
+
+    return jac
+
+
+def get_hh_ss_jac(mp, ss, T, rel_step=1e-6, info=None):
+    '''
+    Generates the sequence space Jacobians of the household block at the
+    steady state: the derivatives of the paths of aggregate savings,
+    labor supply, consumption of each good and bequests with respect to
+    the paths of r, w, T_H and bequests received, with the economy at the
+    steady state from period -1 on.
+
+    Along a flat path a change in a guess in period s only moves the
+    cohorts alive in s, so for s >= S-1 (all of them born in period 0 or
+    later) the response is the response to a change in period S-1
+    shifted by s-(S-1) periods.  Only the columns s < S are computed,
+    by forward differences with one household solve of all cohorts for
+    each guess and period, (3+J)*S solves instead of (3+J)*T.  Changes
+    in r and w also change the prices households face.
+
+    Inputs:
+        mp       = ModelParams, model parameters
+        ss       = dictionary, steady state of mp (see ssf.solve_ss)
+        T        = integer, number of periods to the steady state
+        rel_step = scalar > 0, relative step of the differences
+        info     = dictionary or None, passed to get_hh_path
+
+    Functions called:
+        get_ss_bq
+        get_price_path
+        get_hh_path
+
+    Objects in function:
+        q_ss   = [3+J,] vector, steady state (r, w, T_H, bq)
+        q0     = [T+S-1,3+J] array, steady state paths of the guesses
+        Y0     = [T,2+I+J] array, aggregates (K_s, L_s, C, bq_new) along
+                 the steady state path
+        c_1_ss = [T+S-1,J] array, c_1 of each cohort along it, the guess
+                 for the other solves
+        jac    = [T,2+I+J,3+J,T] array, jac[t,o,q,s] = dY_{t,o}/dq_s
+
+    Returns: jac
+    '''
+    S, J = mp.S, mp.J
+    TT = T + S - 1
+    q_ss = np.concatenate(([ss['r'], ss['w'], ss['T_H']],
+                           get_ss_bq(mp, ss['r'], ss['k'])))
+    h = rel_step*np.maximum(np.absolute(q_ss), 1.0)
+
+    def get_aggregates(q, c_1_guess=None):
+        p_c, p_tilde = get_price_path(mp, q[:, 0], q[:, 1])[1:3]
+        hh = get_hh_path(mp, q[:, 0], q[:, 1], p_c, p_tilde, q[:, 2],
+                         q[:, 3:], ss['k'], T, c_1_guess, info=info)
+        Y = np.column_stack((hh['K_s'], hh['L_s'], hh['C'], hh['bq_new']))
+        return Y, hh['c_1']
+
+    q0 = np.tile(q_ss, (TT, 1))
+    Y0, c_1_ss = get_aggregates(q0)
+    jac = np.zeros((T, Y0.shape[1], len(q_ss), T))
+    for s in range(min(S, T)):
+        for m in range(len(q_ss)):
+            q = q0.copy()
+            q[s, m] += h[m]
+            jac[:, :, m, s] = (get_aggregates(q, c_1_ss)[0] - Y0)/h[m]
+    for s in range(S, T):
+        d = s - (S-1)
+        jac[d:, :, :, s] = jac[:T-d, :, :, S-1]
+
+    return jac
+
+
+def get_firm_ss_jacs(mp, ss, rel_step=1e-6):
+    '''
+    Generates the Jacobians of the two maps of one period of the firm
+    block at the steady state, by forward differences: the demand side
+    of the market clearing errors (see get_demand_errors) in (r, w, T_H)
+    and output of the period, and the step of the backward output
+    recursion (see of.solve_output_path),
+
+        X_t = X(x_t, x_{t+1}, X_{t+1}, C_t)
+
+    in (r, w, T_H) of the period and the next, output of the next period
+    and consumption of each good.  At the steady state the maps are the
+    same in every period, so their cost does not depend on T.
+
+    Inputs:
+        mp       = ModelParams, model parameters
+        ss       = dictionary, steady state of mp (see ssf.solve_ss)
+        rel_step = scalar > 0, relative step of the differences
+
+    Functions called:
+        get_demand_errors
+        get_price_path
+        of.solve_output_path
+        br.get_fd_jac
+
+    Objects in function:
+        x_ss = [3,] vector, steady state (r, w, T_H)
+        u_ss = [3+M,] vector, steady state (x, X)
+        v_ss = [6+M+I,] vector, steady state (x_t, x_{t+1}, X_{t+1}, C)
+
+    Returns: G ([3,3+M] array, Jacobian of the errors in (x, X)), f
+             ([M,6+M+I] array, Jacobian of the output step in v)
+    '''
+    M = mp.M
+    x_ss = np.array([ss['r'], ss['w'], ss['T_H']])
+    p_guess = ss['p_raw'][np.newaxis]
+
+    def get_errors(u):
+        return get_demand_errors(mp, u[0:1], u[1:2], u[2:3], u[np.newaxis, 3:],
+                                 p_guess)[0][0]
+
+    def get_output(v):
+        p_k = get_price_path(mp, v[[0, 3]], v[[1, 4]],
+                             np.tile(p_guess, (2, 1)))[3]
+        X_c = np.dot(v[np.newaxis, 6+M:], mp.pi)
+        return of.solve_output_path(mp, p_k, v[[0, 3]], v[[1, 4]],
+                                    X_c, v[6:6+M])[0][0]
+
+    u_ss = np.concatenate((x_ss, ss['X']))
+    v_ss = np.concatenate((x_ss, x_ss, ss['X'], ss['C']))
+    G = br.get_fd_jac(get_errors, u_ss, rel_step=rel_step)
+    f = br.get_fd_jac(get_output, v_ss, rel_step=rel_step)
+
+    return G, f
+
+
+def get_tpi_ssj(mp, ss, T, rel_step=1e-6, stats=None):
+    '''
+    Generates the Jacobian of the time path errors (see get_tpi_errors)
+    at the steady state from the sequence space Jacobians of the blocks:
+
+        dE/dz = dF/dx + dF/dC*dC/dz + d(K_s, L_s)/dz   (market errors)
+        dE/dz = I - dbq_new/dz                         (bequest errors)
+
+    where F are the demand side errors of the firm block and the
+    household Jacobians come from get_hh_ss_jac.  The errors of period t
+    depend on x_t and output X_t, and X_t on x_t, x_{t+1}, C_t and
+    X_{t+1}, so with the Jacobians of one period (get_firm_ss_jacs)
+
+        dX_t/dx_t     = f_x0
+        dX_t/dx_{t+1} = f_x1 + f_X*f_x0
+        dX_t/dx_{t+k} = f_X*dX_t/dx_{t+k-1},  k >= 2
+        dX_t/dC_{t+k} = f_X^k*f_C
+
+    and dF_t/dy_s = G_X*dX_t/dy_s, plus G_x if y_s = x_t.  The firm
+    block Jacobian is block upper triangular and block Toeplitz in time.
+    It is computed once for the steady state of a set of parameters and
+    can be reused by the Newton solves of nearby policy experiments (see
+    solve_tpi).
+
+    Inputs:
+        mp       = ModelParams, model parameters
+        ss       = dictionary, steady state of mp (see ssf.solve_ss)
+        T        = integer, number of periods to the steady state
+        rel_step = scalar > 0, relative step of the differences
+        stats    = OrderedDict or None, stage statistics
+
+    Functions called:
+        st.timed
+        get_hh_ss_jac
+        get_firm_ss_jacs
+
+    Objects in function:
+        hh_jac = [T,2+I+J,3+J,T] array, household Jacobians
+        cols   = [3+J,T] array, column in z of each guess and period
+        dY     = [T,2+I+J,T*(3+J)] array, household Jacobians in z
+        dX_x   = [M,3] array, dX_t/dx_{t+k}
+        dX_C   = [M,I] array, dX_t/dC_{t+k}
+        F_x    = [T,3,T,3] array, firm block Jacobian in x
+        F_C    = [T,3,T,I] array, firm block Jacobian in C
+
+    Returns: jac ([T*(3+J),T*(3+J)] array)
+    '''
+    J, I, M = mp.J, mp.I, mp.M
+    nz = T*(3+J)
+    with st.timed(stats, 'tpi_ssj_hh') as info:
+        hh_jac = get_hh_ss_jac(mp, ss, T, rel_step, info)
+    cols = np.vstack((np.arange(T)*3 + np.arange(3)[:, np.newaxis],
+                      3*T + np.arange(T)*J + np.arange(J)[:, np.newaxis]))
+    dY = np.zeros(hh_jac.shape[:2] + (nz,))
+    dY[:, :, cols] = hh_jac
+    with st.timed(stats, 'tpi_ssj_firm'):
+        G, f = get_firm_ss_jacs(mp, ss, rel_step)
+        G_x, G_X = G[:, :3], G[:, 3:]
+        f_x0, f_x1, f_X, f_C = f[:, :3], f[:, 3:6], f[:, 6:6+M], f[:, 6+M:]
+        F_x = np.zeros((T, 3, T, 3))
+        F_C = np.zeros((T, 3, T, I))
+        dX_x, dX_C = f_x0, f_C
+        for k in range(T):
+            t = np.arange(T-k)
+            F_x[t, :, t+k, :] = np.dot(G_X, dX_x) + (G_x if k == 0 else 0)
+            F_C[t, :, t+k, :] = np.dot(G_X, dX_C)
+            dX_x = np.dot(f_X, dX_x) + (f_x1 if k == 0 else 0)
+            dX_C = np.dot(f_X, dX_C)
+    jac = np.zeros((nz, nz))
+    jac[:3*T, :3*T] = F_x.reshape(3*T, 3*T)
+    jac[:3*T] += np.dot(F_C.reshape(3*T, I*T), dY[:, 2:2+I].reshape(T*I, nz))
+    jac[0:3*T:3] += dY[:, 0]
+    jac[1:3*T:3] += dY[:, 1]
+    jac[3*T:] = np.eye(nz)[3*T:] - dY[:, 2+I:].reshape(T*J, nz)
+
+    return jac
+
+
+def solve_tpi(mp, ss, k_init, T=None, guesses=None, tol=1e-10, maxiter=1000,
+              jac0=None, cache=None, processes=1, method='broyden',
+              store_dir=None, chunk=None, stats=None, diag=None):
+    '''
+    Solves for the time path from initial savings to the steady state
+    with Broyden's method (see broyden_funcs.py) on the stacked paths of
+    (r, w, T_H) and bequests.  Unless a Jacobian is given (e.g. tpi['jac']
+    of the solve for a nearby policy), Broyden starts from the steady
+    state Jacobian (ssf.get_ss_jac) for the errors of each period, so the
+    first steps are per period Newton steps, and the effects of guesses
+    in one period on the errors of the others are learned by the
+    updates.  If the updated Jacobian stops giving steps that lower the
+    errors, Broyden starts again from a finite difference Jacobian of
+    the whole path (get_tpi_fd_jac), which costs T*(3+J) evaluations.
+
+    With method='newton' the solve takes Newton steps (br.solve_chord) on
+    the sequence space Jacobian at the steady state (get_tpi_ssj), or on
+    jac0 if given, which is factorized once and not updated.  The
+    Jacobian is returned, so the solves of other policy experiments
+    around the same steady state can pass it as jac0 and cost only their
+    Newton steps.
+
+    At the solution the supplies of savings and labor are allocated
+    across industries with the FOCs of firms (af.solve_factor_alloc, all
+    periods in one batch), which gives the interest and wage rates
+    implied by the path, r_new and w_new of SS_TPI_algo.tex, as a check.
+
+    Inputs:
+        mp      = ModelParams, model parameters along the path
+        ss      = dictionary, steady state of mp (see ssf.solve_ss)
+        k_init  = [S,J] array, savings at the end of period -1 (e.g. the
+                  steady state savings of the parameters before a policy
+                  change)
+        T       = integer or None, number of periods to the steady
+                  state, int(round(2.5*S)) (as in firm2.py) if None
+        guesses = [3,] vector or None, (r, w, T_H) in period 0; the
+                  initial guesses are linear from there to the steady
+                  state in period T, flat at the steady state if None
+        tol     = scalar > 0, tolerance on the max abs error
+        maxiter = integer >= 1, maximum number of evaluations of the
+                  errors
+        jac0    = [T*(3+J),T*(3+J)] array or None, Jacobian to start from
+        cache   = dictionary or None, factorizations of the output
+                  systems (see of.solve_output_path), a new one if None
+        processes = integer >= 1 or None, number of processes the
+                    household problems are spread over (see
+                    get_cohort_pool), 1 to solve them in this process
+        method  = string, 'broyden' or 'newton'
+        store_dir = string or None, directory of a path store (see
+                    path_store_funcs.py); if given the path arrays of
+                    every evaluation are memory-mapped files there, and
+                    the solution is left in it to be reopened with
+                    pst.load_path_store
+        chunk   = integer >= 1 or None, periods per chunk of the path
+                  store, see pst.open_path_store
+        stats   = OrderedDict or None, stage statistics (see
+                  stats_funcs.py)
+        diag    = dictionary or None, diagnostics channel (see
+                  diag_funcs.py)
+
+    Functions called:
+        get_ss_bq
+        ssf.get_ss_jac
+        get_tpi_ssj
+        br.solve_broyden
+        br.solve_chord
+        get_tpi_errors
+        get_tpi_fd_jac
+        get_cohort_pool
+        close_cohort_pool
+        af.solve_factor_alloc
+        pst.open_path_store
+        pst.close_path_store
+        st.add_counts
+        dg.say
+
+    Objects in function:
+        x_ss     = [3,] vector, steady state (r, w, T_H)
+        bq_ss    = [J,] vector, steady state bequests
+        x        = [T,3] array, initial guesses for the paths of
+                   (r, w, T_H)
+        jac_ss   = [3,3] array, steady state Jacobian
+        z        = [T*(3+J),] vector, stacked paths
+        hh_pool  = dictionary or None, cohort pool
+        store    = dictionary or None, path store
+        last     = dictionary, parts at the last evaluation
+
+    Returns: tpi (dictionary, parts at the solution (see get_tpi_parts),
+             the number of evaluations of the errors, n_evals, and of
+             finite difference Jacobians, n_jacs, max abs error, dist,
+             Jacobian at the solution, jac, allocations of the supplies,
+             K_m and EL_m, implied r_new and w_new, and converged)
+    '''
+    S, J = mp.S, mp.J
+    if T is None:
+        T = int(round(2.5*S))
+    x_ss = np.array([ss['r'], ss['w'], ss['T_H']])
+    bq_ss = get_ss_bq(mp, ss['r'], ss['k'])
+    x = np.tile(x_ss, (T, 1))
+    if guesses is not None:
+        guesses = np.asarray(guesses, dtype=float)
+        x += np.linspace(1, 0, T + 1)[:T, np.newaxis]*(guesses - x_ss)
+    z = np.concatenate((x.ravel(), np.tile(bq_ss, T)))
+    if method not in ('broyden', 'newton'):
+        raise ValueError('unknown TPI method %r' % (method,))
+    if jac0 is None and method == 'newton':
+        jac0 = get_tpi_ssj(mp, ss, T, stats=stats)
+    elif jac0 is None:
+        jac_ss = ssf.get_ss_jac(mp, ss['r'], ss['w'], ss['T_H'],
+                                ss['p_raw'], ss['k'], ss['n'])
+        jac0 = la.block_diag(np.kron(np.eye(T), jac_ss), np.eye(T*J))
+    solver = br.solve_chord if method == 'newton' else br.solve_broyden
+    if cache is None:
+        cache = {}
+    store = None
+    if store_dir is not None:
+        store = pst.open_path_store(store_dir, mp, T, chunk)
+    hh_pool = get_cohort_pool(mp, T, processes) if processes != 1 else None
+    last = {}
+    args = (mp, k_init, ss['X'], T, x_ss, bq_ss, last, cache, hh_pool, stats,
+            store)
+    try:
+        z, F, jac, n_evals, n_jacs, ok = solver(
+            get_tpi_errors, z, jac0, get_tpi_fd_jac, ftol=tol,
+            maxiter=maxiter, args=args)
+        if not np.array_equal(last['z'], z):
+            get_tpi_errors(z, *args)
+    finally:
+        if hh_pool is not None:
+            close_cohort_pool(hh_pool)
+    st.add_counts(stats, 'tpi', solves=1, evals=n_evals, jacs=n_jacs)
+    tpi = dict(last['parts'])
+    with st.timed(stats, 'tpi_alloc') as info:
+        (tpi['K_m'], tpi['EL_m'], tpi['r_new'], tpi['w_new'],
+         alloc_converged) = af.solve_factor_alloc(
+            mp, tpi['p_k'], tpi['r'], tpi['w'], tpi['X'], tpi['K_s'],
+            tpi['L_s'], info=info)
+    tpi['n_evals'] = n_evals
+    tpi['n_jacs'] = n_jacs
+    tpi['dist'] = np.absolute(F).max()
+    tpi['jac'] = jac
+    tpi['converged'] = tpi['converged'] and ok
+    dg.say(diag, dg.INFO, 'TPI errors evaluations', n_evals, 'max abs error',
+           tpi['dist'])
+    dg.say(diag, dg.INFO, 'TPI max abs r_new - r, w_new - w:',
+           np.absolute(tpi['r_new'] - tpi['r']).max(),
+           np.absolute(tpi['w_new'] - tpi['w']).max())
+    if not alloc_converged.all():
+        dg.say(diag, dg.INFO, 'TPI factor allocation did not converge in '
+               'periods', np.nonzero(~alloc_converged)[0])
+    if store is not None:
+        pst.close_path_store(store, dict(
+            (name, value) for name, value in tpi.items()
+            if name not in pst.PATH_NAMES and name != 'jac'))
+
+    return tpi
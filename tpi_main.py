@@ -0,0 +1,219 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+Solves the time path (TPI) of the multi-industry model with taxes (the
+model of SS_v3pt2_mktclear.py) after an unexpected, permanent change in
+parameters in period 0, from the command line or from other code.  The
+economy starts from the steady state savings of the parameters before
+the change and converges to the steady state of the parameters after it.
+
+    import ss_main, tpi_main
+    mp_init = ss_main.get_default_params()
+    mp = ss_main.set_params(mp_init, ['tau_b=0.3'])
+    ss_init, ss, tpi = tpi_main.run_tpi(mp_init, mp)
+
+From the command line:
+
+    python tpi_main.py --set NAME=VALUE [--set ...] [-T periods]
+                       [--processes N] [--solver broyden|newton]
+                       [--paths DIR] [--stats FILE] [--plots DIR] [-q]
+
+e.g. python tpi_main.py --set tau_b=0.3 -T 40 solves the transition to
+a 30% business tax rate in every industry over 40 periods.
+
+With --paths DIR the large path arrays are memory-mapped files in DIR
+(see path_store_funcs.py), and the solved path can be opened again
+without solving it:
+
+    import path_store_funcs as pst
+    tpi = pst.load_path_store(DIR)
+
+This py-file calls the following other file(s):
+            ss_main.py
+            tpi_funcs.py
+            path_store_funcs.py
+            stats_funcs.py
+            diag_funcs.py
+
+This py-file creates the following other file(s):
+            (with --paths) DIR/*.npy, DIR/summary.npz, DIR/meta.json
+            (with --stats) FILE
+            (with --plots) DIR/tpi_prices.pdf, DIR/tpi_K.pdf
+------------------------------------------------------------------------
+'''
+# Import Packages
+import os
+import sys
+import argparse
+import numpy as np
+import ss_main
+import tpi_funcs as tp
+import stats_funcs as st
+import diag_funcs as dg
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def run_tpi(mp_init, mp, T=None, processes=1, method='broyden', jac0=None,
+            store_dir=None, stats=None, diag=None):
+    '''
+    Solves the steady states before and after a change in parameters and
+    the time path between them.
+
+    Inputs:
+        mp_init   = ModelParams, model parameters before period 0
+        mp        = ModelParams, model parameters from period 0 on
+        T         = integer or None, number of periods to the steady
+                    state, see tp.solve_tpi
+        processes = integer >= 1 or None, processes for the household
+                    problems of the time path, see tp.solve_tpi
+        method    = string, 'broyden' or 'newton', see tp.solve_tpi
+        jac0      = array or None, Jacobian of the time path errors to
+                    start from (e.g. tpi['jac'] of another experiment)
+        store_dir = string or None, directory of the path store, see
+                    tp.solve_tpi
+        stats     = OrderedDict or None, stage statistics
+        diag      = dictionary or None, diagnostics channel
+
+    Functions called:
+        ss_main.run_ss
+        tp.solve_tpi
+
+    Objects in function:
+        guesses = [3,] vector, initial steady state (r, w, T_H), used as
+                  the guess for period 0
+
+    Returns: ss_init, ss, tpi (dictionaries, see ssf.solve_ss and
+             tp.solve_tpi)
+    '''
+    ss_init = ss_main.run_ss(mp_init, stats=stats, diag=diag)
+    guesses = [ss_init['r'], ss_init['w'], ss_init['T_H']]
+    ss = ss_main.run_ss(mp, guesses=guesses, stats=stats, diag=diag)
+    tpi = tp.solve_tpi(mp, ss, ss_init['k'], T, guesses, jac0=jac0,
+                       processes=processes, method=method,
+                       store_dir=store_dir, stats=stats, diag=diag)
+    dg.say(diag, dg.INFO, 'TPI r:', tpi['r'])
+    dg.say(diag, dg.INFO, 'TPI w:', tpi['w'])
+    dg.say(diag, dg.INFO, 'TPI T_H:', tpi['T_H'])
+
+    return ss_init, ss, tpi
+
+
+def plot_tpi(ss, tpi, output_dir):
+    '''
+    Plots the time paths of the interest rate and wage rate, and of
+    aggregate savings, against their steady state values.  matplotlib is
+    only imported here.
+
+    Inputs:
+        ss         = dictionary, steady state (see ssf.solve_ss)
+        tpi        = dictionary, time path (see tp.solve_tpi)
+        output_dir = string, directory the graphs are saved to
+
+    Functions called: None
+
+    Objects in function:
+        t = [T,] vector, periods
+
+    Returns: filenames (list of strings)
+    '''
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    t = np.arange(len(tpi['r']))
+    filenames = []
+    fig, ax = plt.subplots()
+    for name in ('r', 'w'):
+        ax.plot(t, tpi[name], label=name)
+        ax.axhline(ss[name], linestyle=':', color='k')
+    ax.set_xlabel('period')
+    ax.legend()
+    filenames.append(os.path.join(output_dir, 'tpi_prices.pdf'))
+    fig.savefig(filenames[-1])
+    plt.close(fig)
+    fig, ax = plt.subplots()
+    ax.plot(t, tpi['K_s'], label='K')
+    ax.axhline(ss['K_s'], linestyle=':', color='k')
+    ax.set_xlabel('period')
+    ax.legend()
+    filenames.append(os.path.join(output_dir, 'tpi_K.pdf'))
+    fig.savefig(filenames[-1])
+    plt.close(fig)
+
+    return filenames
+
+
+def main(argv=None):
+    '''
+    Runs the time path solve from the command line.
+
+    Inputs:
+        argv = list of strings or None, arguments, sys.argv[1:] if None
+
+    Functions called:
+        ss_main.get_default_params
+        ss_main.set_params
+        run_tpi
+        plot_tpi
+        st.print_stats
+        st.save_stats
+
+    Objects in function:
+        args = argparse.Namespace, parsed arguments
+
+    Returns: 0 if the solves converged, 1 if not
+    '''
+    parser = argparse.ArgumentParser(description='Solve the time path of '
+                                     'the multi-industry OLG model after a '
+                                     'change in parameters.')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='NAME=VALUE',
+                        help='change a primitive parameter in period 0')
+    parser.add_argument('-T', type=int, default=None,
+                        help='periods to the steady state')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='processes for the household problems, 0 for '
+                        'one per cpu')
+    parser.add_argument('--solver', default='broyden',
+                        choices=['broyden', 'newton'],
+                        help='newton takes Newton steps on the sequence '
+                        'space Jacobian at the steady state')
+    parser.add_argument('--paths', default=None,
+                        help='keep the path arrays in memory-mapped files in '
+                        'this directory')
+    parser.add_argument('--stats', default=None,
+                        help='save stage statistics to this .json/.csv file')
+    parser.add_argument('--plots', default=None,
+                        help='save graphs of the time path here')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='print nothing')
+    args = parser.parse_args(argv)
+
+    diag = dg.get_diag(dg.QUIET if args.quiet else dg.INFO)
+    mp_init = ss_main.get_default_params()
+    mp = ss_main.set_params(mp_init, args.set)
+    stats = st.get_stats() if args.stats is not None else None
+    ss_init, ss, tpi = run_tpi(mp_init, mp, args.T, args.processes or None,
+                               args.solver, store_dir=args.paths,
+                               stats=stats, diag=diag)
+    if stats is not None:
+        st.print_stats(stats)
+        st.save_stats(stats, args.stats)
+    if args.plots is not None:
+        plot_tpi(ss, tpi, args.plots)
+    converged = ss_init['converged'] and ss['converged'] and tpi['converged']
+    if not converged:
+        dg.say(diag, dg.INFO, 'time path solve did not converge')
+
+    return 0 if converged else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+'''
+------------------------------------------------------------------------
+Last updated 10/17/2026
+
+This file contains functions for an on-disk store of steady state
+solutions (as found by SS_v3pt2_mktclear.py), used to warm start new
+solves.
+
+Each solution is pickled to its own file in the store directory, named
+by the key of its ModelParams (see model_params.py), and holds the
+solution (r, w, T_H, k, n) together with the primitive parameters it
+was solved for, and optionally the Jacobian of the market clearing
+errors at the solution (see broyden_funcs.py).  For a new parameter
+set, the stored solution with the same key is used if there is one.
+Otherwise the solution for the nearest parameters with the same
+dimensions (S, J, I, M) is used, where the distance between two
+parameter sets is the root mean square of the relative differences of
+their primitive parameters.
+------------------------------------------------------------------------
+'''
+# Import Packages
+import os
+import glob
+import pickle
+import numpy as np
+import model_params as mpf
+
+'''
+------------------------------------------------------------------------
+    Functions
+------------------------------------------------------------------------
+'''
+
+
+def get_params_vector(mp):
+    '''
+    Generates a vector of all primitive parameters.
+
+    Inputs:
+        mp = ModelParams, model parameters
+
+    Functions called: None
+
+    Objects in function:
+        vec = [P,] vector, primitive parameters stacked in the order of
+              model_params.PARAM_FIELDS
+
+    Returns: vec
+    '''
+    vec = np.hstack([np.asarray(getattr(mp, name), dtype=float).ravel()
+                     for name in mpf.PARAM_FIELDS])
+
+    return vec
+
+
+def save_solution(store_dir, mp, r, w, T_H, k, n, jac=None):
+    '''
+    Saves a steady state solution to the store.  The file is written
+    under a temporary name first, so a store can be shared by several
+    processes.
+
+    Inputs:
+        store_dir = string, path of the store directory
+        mp        = ModelParams, model parameters
+        r         = scalar, SS interest rate
+        w         = scalar, SS wage rate
+        T_H       = scalar, SS transfers
+        k         = [S,J] array, SS savings
+        n         = [S,J] array, SS labor supply
+        jac       = [3,3] array or None, Jacobian of the SS errors in
+                    (r, w, T_H) at the solution
+
+    Functions called:
+        get_params_vector
+
+    Objects in function:
+        solution = dictionary, the solution and its parameters
+        filename = string, path of the solution file
+
+    Returns: filename
+    '''
+    if not os.path.isdir(store_dir):
+        os.makedirs(store_dir)
+    solution = dict(key=mp.key, dims=(mp.S, mp.J, mp.I, mp.M),
+                    params=get_params_vector(mp), r=float(r), w=float(w),
+                    T_H=float(T_H), k=np.array(k), n=np.array(n),
+                    jac=None if jac is None else np.array(jac))
+    filename = os.path.join(store_dir, mp.key + '.pkl')
+    tmp_name = '%s.%d.tmp' % (filename, os.getpid())
+    with open(tmp_name, 'wb') as f:
+        pickle.dump(solution, f, protocol=2)
+    os.rename(tmp_name, filename)
+
+    return filename
+
+
+def load_solution(store_dir, mp):
+    '''
+    Loads the stored solution for the given parameters, or the one for
+    the nearest parameters if they have not been solved.
+
+    Inputs:
+        store_dir = string, path of the store directory
+        mp        = ModelParams, model parameters
+
+    Functions called:
+        get_params_vector
+
+    Objects in function:
+        vec      = [P,] vector, primitive parameters of mp
+        best     = dictionary or None, nearest solution found so far
+        dist     = scalar, distance from mp to a stored solution
+        min_dist = scalar, distance from mp to best
+
+    Returns: best (None if no solution in the store has the same
+             dimensions), min_dist (0 for an exact match)
+    '''
+    filename = os.path.join(store_dir, mp.key + '.pkl')
+    if os.path.exists(filename):
+        with open(filename, 'rb') as f:
+            return pickle.load(f), 0.0
+    vec = get_params_vector(mp)
+    dims = (mp.S, mp.J, mp.I, mp.M)
+    best = None
+    min_dist = np.inf
+    for filename in glob.glob(os.path.join(store_dir, '*.pkl')):
+        try:
+            with open(filename, 'rb') as f:
+                solution = pickle.load(f)
+        except Exception:
+            continue
+        if solution['dims'] != dims or solution['params'].shape != vec.shape:
+            continue
+        rel = ((solution['params'] - vec) /
+               np.maximum(np.absolute(solution['params']) + np.absolute(vec), 1e-12))
+        dist = np.sqrt((rel**2).mean())
+        if dist < min_dist:
+            best, min_dist = solution, dist
+
+    return best, min_dist